@@ -81,7 +81,7 @@ async def _run_chat_stream(message: str, conversation_id: Optional[str] = None)
         send_queue("", EVENT_DONE)
 
 
-async def generate_sse_stream(message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[str, None]:
+async def generate_sse_stream(message: str, conversation_id: Optional[str] = None) -> AsyncGenerator[bytes, None]:
     """生成 SSE 流（实时推送）。
 
     Args:
@@ -1,7 +1,6 @@
 """工具管理 API"""
 
 import asyncio
-import json
 import time
 from typing import Any, AsyncGenerator
 
@@ -14,6 +13,7 @@ from src.modules import ToolService
 from src.core import get_app_config, get_service
 from src.modules.base import ValidException, ApiException
 from src.modules.tools.dtos import ToolDto
+from src.utils import fast_json
 from src.utils.logger import get_logger
 from src.utils.script_wrapper import wrap_javascript_code
 from src.utils.stream_writer_util import create_queue_task, send_queue
@@ -166,12 +166,12 @@ async def execute_tool(
 
     # 4. 返回最终结果
     try:
-        result_data = json.loads(result)
+        result_data = fast_json.loads(result)
         return ApiResponse.ok({
             "result": result_data.get("result", result),
             "execution_time": f"{(time.time() - start_time):.3f}s"
         })
-    except (json.JSONDecodeError, TypeError):
+    except (ValueError, TypeError):
         return ApiResponse.ok({
             "result": result,
             "execution_time": f"{(time.time() - start_time):.3f}s"
@@ -235,9 +235,9 @@ async def _execute_tool_stream(id: int, params: dict, user_info: dict = None) ->
 
             # 解析结果
             try:
-                result_data = json.loads(result)
+                result_data = fast_json.loads(result)
                 result_value = result_data.get("result", result)
-            except (json.JSONDecodeError, TypeError):
+            except (ValueError, TypeError):
                 result_value = result
 
             # 发送完成信号
@@ -279,7 +279,7 @@ async def execute_tool_stream(
     # 创建异步任务
     queue = create_queue_task(_execute_tool_stream, id, params, user_info)
 
-    async def generate_stream() -> AsyncGenerator[str, None]:
+    async def generate_stream() -> AsyncGenerator[bytes, None]:
         """从队列中读取数据并生成 SSE 事件。"""
         while True:
             chunk = await queue.get()
@@ -15,8 +15,9 @@ from src.core.session import SessionManager
 from src.core.session_context import set_session
 from src.core.message_store import IMessageStore
 from src.tools.registry import get_registry
+from src.utils import fast_json
 from src.utils.logger import get_logger
-from src.utils.tool_args_utils import fill_default_args
+from src.utils.tool_args_utils import fill_default_args, get_tool_parameters
     
 
 _logger = get_logger(__name__)
@@ -135,24 +136,31 @@ class LLMClient:
 						]
 					)
 
-					# 执行工具调用
+					# 解析工具参数
+					prepared_calls = []
 					for tool_call in tool_calls:
 						tool_name = tool_call['function']['name']
 						tool_args = json.loads(tool_call['function']['arguments'] or "{}")
 
 						# 获取工具 schema 并填充默认值
-						tool_schema = registry.get(tool_name).get_schema() if registry.get(tool_name) else None
-						if tool_schema:
-							tool_args = fill_default_args(
-								tool_schema.get("function", {}).get("parameters", {}),
-								tool_args
-							)
+						tool = registry.get(tool_name)
+						if tool:
+							tool_args = fill_default_args(get_tool_parameters(tool), tool_args)
+						prepared_calls.append((tool_call, tool_name, tool_args))
+
+					# 同一轮的多个 MCP 工具调用合并为流水线批量请求
+					batched_results = self._run_mcp_batch(registry, prepared_calls)
 
+					# 执行工具调用
+					for index, (tool_call, tool_name, tool_args) in enumerate(prepared_calls):
 						if self.show_tool_calls:
 							print_tool_call(iteration, tool_name, tool_args)
 
 						try:
-							result = registry.execute(tool_name, **tool_args)
+							if index in batched_results:
+								result = batched_results[index]
+							else:
+								result = registry.execute(tool_name, **tool_args)
 
 							# 处理技能工具
 							if tool_name == "skill":
@@ -227,3 +235,33 @@ class LLMClient:
 
 		print()
 		return final_response
+
+	def _run_mcp_batch(self, registry, prepared_calls: List[tuple]) -> Dict[int, str]:
+		"""批量执行一轮中的多个 MCP 工具调用。
+
+		共享同一 MCP 客户端的调用一次性发出再统一收集响应，避免逐个往返。
+
+		Args:
+			registry: 工具注册表
+			prepared_calls: (tool_call, tool_name, tool_args) 列表
+
+		Returns:
+			{调用序号: JSON 格式的执行结果}，少于两个 MCP 调用时为空
+		"""
+		from src.tools.mcp.adapter import MCPToolAdapter, invoke_mcp_batch
+
+		indexes = []
+		calls = []
+		for index, (_, tool_name, tool_args) in enumerate(prepared_calls):
+			tool = registry.get(tool_name)
+			if isinstance(tool, MCPToolAdapter):
+				indexes.append(index)
+				calls.append((tool, tool_args))
+		if len(calls) < 2:
+			return {}
+
+		results = invoke_mcp_batch(calls)
+		return {
+			index: fast_json.dumps(result, indent=True)
+			for index, result in zip(indexes, results)
+		}
@@ -38,11 +38,10 @@ class DatabaseModule(Module):
             scope=singleton
         )
 
-        # SQLAlchemy Session - 单例
+        # SQLAlchemy Session - 单例（scoped_session 代理，按线程分发实际 Session）
         def _get_session() -> Session:
             """获取 SQLAlchemy Session"""
-            session_local = get_session_local()
-            return session_local()
+            return get_session_local()
 
         binder.bind(
             Session,
@@ -7,7 +7,7 @@ from typing import Any, List, Optional
 from sqlalchemy import String, Text, Integer, ForeignKey, JSON, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
-from ..datasource.database import Base
+from ..datasource.database import Base, compile_to_dict
 
 
 @dataclass
@@ -25,17 +25,16 @@ class Conversation(Base):
     message_count: Mapped[int] = mapped_column(Integer, default=0)
     meta_data: Mapped[dict] = mapped_column("meta_data", JSON, default=dict)
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "userId": self.user_id,
-            "title": self.title,
-            "preview": self.preview,
-            "createTime": self.create_time.strftime("%Y-%m-%d %H:%M:%S") if self.create_time else "",
-            "updateTime": self.update_time.strftime("%Y-%m-%d %H:%M:%S") if self.update_time else "",
-            "messageCount": self.message_count,
-            "meta_data": self.meta_data or {}
-        }
+    to_dict = compile_to_dict({
+        "id": "self.id",
+        "userId": "self.user_id",
+        "title": "self.title",
+        "preview": "self.preview",
+        "createTime": "self.create_time.strftime(DATETIME_FORMAT) if self.create_time else ''",
+        "updateTime": "self.update_time.strftime(DATETIME_FORMAT) if self.update_time else ''",
+        "messageCount": "self.message_count",
+        "meta_data": "self.meta_data or {}",
+    })
 
 
 @dataclass
@@ -52,13 +51,12 @@ class Message(Base):
     tool_calls: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     tool_call_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "conversationId": self.conversation_id,
-            "role": self.role,
-            "content": self.content,
-            "timestamp": self.timestamp.strftime("%Y-%m-%d %H:%M:%S") if self.timestamp else "",
-            "tool_calls": self.tool_calls or [],
-            "tool_call_id": self.tool_call_id
-        }
+    to_dict = compile_to_dict({
+        "id": "self.id",
+        "conversationId": "self.conversation_id",
+        "role": "self.role",
+        "content": "self.content",
+        "timestamp": "self.timestamp.strftime(DATETIME_FORMAT) if self.timestamp else ''",
+        "tool_calls": "self.tool_calls or []",
+        "tool_call_id": "self.tool_call_id",
+    })
@@ -1,6 +1,6 @@
 """数据源模块"""
 
-from .database import DatabaseManager, Base, get_session_local
+from .database import DatabaseManager, Base, get_session_local, begin_session_scope, remove_session, compile_to_dict, transaction
 from sqlalchemy.orm import Session
 
-__all__ = ["DatabaseManager", "Base", "get_session_local", "Session"]
+__all__ = ["DatabaseManager", "Base", "get_session_local", "begin_session_scope", "remove_session", "compile_to_dict", "transaction", "Session"]
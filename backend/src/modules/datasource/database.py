@@ -1,10 +1,13 @@
 """数据库连接管理模块 - SQLAlchemy 2.0 版本"""
 
 import os
-from typing import TYPE_CHECKING
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import sessionmaker, scoped_session, DeclarativeBase, Mapped, mapped_column
 
 
 from sqlalchemy.orm import Session
@@ -14,10 +17,44 @@ class Base(DeclarativeBase):
     pass
 
 
+# 实体 to_dict 输出的时间格式
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def compile_to_dict(
+    fields: Dict[str, str], namespace: Optional[Dict[str, Any]] = None
+) -> Callable[[Any], dict]:
+    """在类定义时生成 to_dict 方法
+
+    将字段映射拼成单个 dict 字面量函数并编译一次，避免每次调用时重复构造。
+
+    Args:
+        fields: 输出键 -> 基于 ``self`` 的取值表达式
+        namespace: 表达式中引用的额外名称（默认可使用 ``DATETIME_FORMAT``）
+
+    Returns:
+        可直接赋值为类属性的 to_dict 函数
+    """
+    body = ", ".join(f"{key!r}: {expr}" for key, expr in fields.items())
+    source = f"def to_dict(self) -> dict:\n    return {{{body}}}\n"
+    scope: Dict[str, Any] = {"DATETIME_FORMAT": DATETIME_FORMAT, **(namespace or {})}
+    exec(compile(source, "<to_dict>", "exec"), scope)
+    return scope["to_dict"]
+
+
 # 全局引擎和 Session 工厂
 _engine = None
 _SessionLocal = None
 
+# 当前请求/后台任务的 Session 作用域标识；未开启作用域时按线程区分
+_session_scope: ContextVar[Optional[object]] = ContextVar("session_scope", default=None)
+
+
+def _current_scope() -> Any:
+    """scoped_session 的作用域函数：优先取请求/任务作用域，否则取线程 ID"""
+    scope = _session_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
 
 def _get_engine(db_path: str = "data/app.db"):
     """获取或创建数据库引擎"""
@@ -45,14 +82,75 @@ def get_engine(db_path: str = "data/app.db"):
     return _get_engine(db_path)
 
 
-def get_session_local(db_path: str = "data/app.db"):
-    """获取 Session 工厂"""
+@contextmanager
+def transaction(session: Session) -> Iterator[Session]:
+    """调用方作用域的事务
+
+    DAO 方法只做 flush，由服务层在最外层的 ``with`` 结束时统一提交一次；
+    嵌套使用时仅最外层负责 commit/rollback。
+
+    Args:
+        session: SQLAlchemy Session
+
+    Yields:
+        传入的 Session
+    """
+    depth = session.info.get("transaction_depth", 0)
+    session.info["transaction_depth"] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info["transaction_depth"] = depth
+
+
+def get_session_local(db_path: str = "data/app.db") -> scoped_session:
+    """获取请求作用域的 Session 注册表
+
+    同一请求（或后台任务）内多次调用返回同一个 Session，可复用其 identity map；
+    作用域随 contextvars 传递，请求派发到线程池执行的代码也使用同一个 Session。
+    请求开始时调用 ``begin_session_scope()``，结束时调用 ``remove_session(token)`` 释放；
+    未开启作用域的代码（如启动阶段）按线程区分。
+    """
     global _SessionLocal
     if _SessionLocal is None:
-        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_get_engine(db_path))
+        _SessionLocal = scoped_session(
+            sessionmaker(autocommit=False, autoflush=False, bind=_get_engine(db_path)),
+            scopefunc=_current_scope,
+        )
     return _SessionLocal
 
 
+def begin_session_scope() -> Token:
+    """为当前请求/后台任务开启独立的 Session 作用域
+
+    并发请求即使运行在同一事件循环线程上，也各自使用独立的 Session。
+
+    Returns:
+        传给 remove_session 以结束作用域的 token
+    """
+    return _session_scope.set(object())
+
+
+def remove_session(token: Optional[Token] = None) -> None:
+    """关闭并移除当前作用域的 Session（请求或后台任务结束时调用）
+
+    Args:
+        token: begin_session_scope 返回的 token，传入时同时结束该作用域
+    """
+    try:
+        if _SessionLocal is not None:
+            _SessionLocal.remove()
+    finally:
+        if token is not None:
+            _session_scope.reset(token)
+
+
 class DatabaseManager:
     """数据库管理器"""
 
@@ -82,8 +180,11 @@ class DatabaseManager:
         return self._session_local()
 
     def create_all_tables(self):
-        """创建所有表"""
+        """创建所有表（已存在的表补建缺失的索引）"""
         Base.metadata.create_all(bind=self._engine)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self._engine, checkfirst=True)
 
     def drop_all_tables(self):
         """删除所有表"""
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Optional, List, TYPE_CHECKING
+from typing import ContextManager, Optional, List, TYPE_CHECKING
 
 from injector import inject
 
 
 from sqlalchemy.orm import Session
 from .models import Test
+from ..datasource.database import transaction as db_transaction
 
 
 class TestDao:
@@ -18,10 +19,14 @@ class TestDao:
     def __init__(self, session: Session):
         self._session = session
 
+    def transaction(self) -> ContextManager[Session]:
+        """开启调用方作用域的事务，退出时统一提交"""
+        return db_transaction(self._session)
+
     def insert(self, test: Test) -> int:
         """插入记录，返回新记录的 ID"""
         self._session.add(test)
-        self._session.commit()
+        self._session.flush()
         return test.id
 
     def find_by_id(self, id: int) -> Optional[Test]:
@@ -41,7 +46,7 @@ class TestDao:
             return False
         orm.name = test.name
         orm.value = test.value
-        self._session.commit()
+        self._session.flush()
         return True
 
     def delete(self, id: int) -> bool:
@@ -50,5 +55,5 @@ class TestDao:
         if not orm:
             return False
         self._session.delete(orm)
-        self._session.commit()
+        self._session.flush()
         return True
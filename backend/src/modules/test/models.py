@@ -4,16 +4,20 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, TIMESTAMP, Integer
+from sqlalchemy import String, TIMESTAMP, Integer, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column
 
-from ..datasource.database import Base
+from ..datasource.database import Base, compile_to_dict
 
 
 @dataclass
 class Test(Base):
     """Test 实体 - 同时是 ORM 模型也是业务实体"""
     __tablename__ = "test"
+    __table_args__ = (
+        # find_all: ORDER BY created_at DESC
+        Index("ix_test_created_at", desc("created_at")),
+    )
 
     # 数据库字段
     id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -21,10 +25,9 @@ class Test(Base):
     value: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "value": self.value,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S") if self.created_at else None
-        }
+    to_dict = compile_to_dict({
+        "id": "self.id",
+        "name": "self.name",
+        "value": "self.value",
+        "created_at": "self.created_at.strftime(DATETIME_FORMAT) if self.created_at else None",
+    })
@@ -16,7 +16,8 @@ class TestService:
     def create(self, name: str, value: str) -> Test:
         """创建 Test 实体"""
         test = Test(name=name, value=value)
-        test.id = self.dao.insert(test)
+        with self.dao.transaction():
+            test.id = self.dao.insert(test)
         return test
 
     def get_by_id(self, id: int) -> Optional[Test]:
@@ -29,14 +30,16 @@ class TestService:
 
     def update(self, id: int, name: str, value: str) -> Optional[Test]:
         """更新 Test 实体"""
-        test = self.dao.find_by_id(id)
-        if not test:
-            return None
-        test.name = name
-        test.value = value
-        self.dao.update(test)
+        with self.dao.transaction():
+            test = self.dao.find_by_id(id)
+            if not test:
+                return None
+            test.name = name
+            test.value = value
+            self.dao.update(test)
         return test
 
     def delete(self, id: int) -> bool:
         """删除 Test 实体"""
-        return self.dao.delete(id)
+        with self.dao.transaction():
+            return self.dao.delete(id)
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Optional, List, TYPE_CHECKING
+from typing import ContextManager, Optional, List, TYPE_CHECKING
 
 from injector import inject
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from .models import Tool
-    
+from .models import TOOL_DICT_FIELDS, Tool
+from ..datasource.database import transaction as db_transaction
+
+# 按列查询时选取的字段，与 Tool.to_dict 共用同一份字段定义
+_DICT_COLUMNS = tuple(getattr(Tool, key) for key in TOOL_DICT_FIELDS)
+
+# 结果行按属性名取值，与实体一致，可直接复用生成的 to_dict
+_row_to_dict = Tool.to_dict
 
 
 class ToolDao:
@@ -18,10 +25,14 @@ class ToolDao:
     def __init__(self, session: Session):
         self._session = session
 
+    def transaction(self) -> ContextManager[Session]:
+        """开启调用方作用域的事务，退出时统一提交"""
+        return db_transaction(self._session)
+
     def create(self, tool: Tool) -> int:
         """创建工具"""
         self._session.add(tool)
-        self._session.commit()
+        self._session.flush()
         return tool.id
 
     def get_by_id(self, tool_id: int) -> Optional[Tool]:
@@ -40,6 +51,16 @@ class ToolDao:
         """获取所有启用的工具"""
         return self._session.query(Tool).filter(Tool.is_active == True).order_by(Tool.name).all()
 
+    def get_all_dicts(self) -> List[dict]:
+        """获取所有工具的字典形式（按列查询，跳过 ORM 实体构建）"""
+        stmt = select(*_DICT_COLUMNS).order_by(Tool.name)
+        return [_row_to_dict(row) for row in self._session.execute(stmt)]
+
+    def get_active_dicts(self) -> List[dict]:
+        """获取所有启用工具的字典形式（按列查询，跳过 ORM 实体构建）"""
+        stmt = select(*_DICT_COLUMNS).where(Tool.is_active == True).order_by(Tool.name)
+        return [_row_to_dict(row) for row in self._session.execute(stmt)]
+
     def update(self, tool: Tool) -> bool:
         """更新工具"""
         if not tool.id:
@@ -53,7 +74,7 @@ class ToolDao:
         orm.parameters = tool.parameters
         orm.inherit_from = tool.inherit_from
         orm.code = tool.code
-        self._session.commit()
+        self._session.flush()
         return True
 
     def delete(self, tool_id: int) -> bool:
@@ -62,9 +83,9 @@ class ToolDao:
         if not orm:
             return False
         self._session.delete(orm)
-        self._session.commit()
+        self._session.flush()
         return True
 
     def count(self) -> int:
         """获取工具总数"""
-        return self._session.query(Tool).count()
+        return self._session.execute(select(func.count()).select_from(Tool)).scalar_one()
@@ -1,15 +1,15 @@
 """工具业务实体模块"""
 
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import JSON, String, Text, Boolean, TIMESTAMP, func, ForeignKey, Integer
+from sqlalchemy import JSON, String, Text, Boolean, TIMESTAMP, func, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import TypeDecorator, TEXT
 
-from ..datasource.database import Base
+from ..datasource.database import Base, compile_to_dict
 
 
 class ToolParameterType(TypeDecorator):
@@ -21,15 +21,17 @@ class ToolParameterType(TypeDecorator):
         """写入数据库时：将 List[ToolParameter] 转换为 JSON 字符串"""
         if value and isinstance(value, list):
             if isinstance(value[0], ToolParameter):
-                return json.dumps([asdict(p) for p in value], ensure_ascii=False)
+                return json.dumps([p.to_dict() for p in value], ensure_ascii=False)
         return json.dumps(value or [], ensure_ascii=False)
 
     def process_result_value(self, value, dialect):
         """从数据库读取时：将 JSON 字符串转换回 List[ToolParameter]"""
-        if value:
-            data_list = json.loads(value)
-            return [ToolParameter.from_dict(d) for d in data_list]
-        return []
+        # 空列表是最常见的取值，直接短路，避免进入 json 解析
+        if not value or value == "[]":
+            return []
+        data_list = json.loads(value)
+        fast = ToolParameter._fast
+        return [fast(d) for d in data_list]
 
 
 @dataclass
@@ -66,6 +68,19 @@ class ToolParameter:
             hasEnum=data.get("hasEnum", False)
         )
 
+    @classmethod
+    def _fast(cls, data: dict, _get=dict.get) -> "ToolParameter":
+        """按位置参数构造，供读取数据库时的热路径使用（语义同 from_dict）"""
+        return cls(
+            data["name"],
+            data["description"],
+            data["type"],
+            _get(data, "required", False),
+            _get(data, "default"),
+            _get(data, "enum"),
+            _get(data, "hasEnum", False),
+        )
+
     @classmethod
     def from_list(cls, data_list: List[dict]) -> List["ToolParameter"]:
         """从字典列表创建 ToolParameter 列表"""
@@ -77,10 +92,29 @@ class ToolParameter:
         return [p.to_dict() for p in params]
 
 
+# Tool.to_dict 的输出字段：键即实体属性名，值为基于 ``self`` 的取值表达式。
+# DAO 按列查询时也据此选列，生成的 to_dict 可直接作用于结果行
+TOOL_DICT_FIELDS = {
+    "id": "self.id",
+    "name": "self.name",
+    "description": "self.description",
+    "is_active": "self.is_active",
+    "parameters": "ToolParameter.to_list(self.parameters or [])",
+    "inherit_from": "self.inherit_from",
+    "code": "self.code",
+    "created_at": "self.created_at.strftime(DATETIME_FORMAT) if self.created_at else None",
+    "updated_at": "self.updated_at.strftime(DATETIME_FORMAT) if self.updated_at else None",
+}
+
+
 @dataclass
 class Tool(Base):
     """工具实体 - 同时是 ORM 模型也是业务实体"""
     __tablename__ = "tools"
+    __table_args__ = (
+        # get_active: WHERE is_active = 1 ORDER BY name
+        Index("ix_tools_active_name", "is_active", "name", sqlite_where=text("is_active = 1")),
+    )
 
     # 数据库字段
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -93,16 +127,4 @@ class Tool(Base):
     created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
     updated_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
 
-
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "is_active": self.is_active,
-            "parameters": ToolParameter.to_list(self.parameters or []),
-            "inherit_from": self.inherit_from,
-            "code": self.code,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S") if self.created_at else None,
-            "updated_at": self.updated_at.strftime("%Y-%m-%d %H:%M:%S") if self.updated_at else None,
-        }
+    to_dict = compile_to_dict(TOOL_DICT_FIELDS, {"ToolParameter": ToolParameter})
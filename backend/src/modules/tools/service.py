@@ -61,7 +61,7 @@ class ToolService(IToolService):
 
     def get_list(self) -> List[ToolDto]:
         """获取所有工具"""
-        return [self.convert_dto(tool) for tool in self._dao.get_all()]
+        return [self.convert_dto(data) for data in self._dao.get_all_dicts()]
 
     def get_one(self, tool_id: int) -> Optional[ToolDto]:
         """获取单个工具"""
@@ -75,7 +75,8 @@ class ToolService(IToolService):
             raise ValidException("Tool not found", "id")
 
         tool.is_active = is_active
-        self._dao.update(tool)
+        with self._dao.transaction():
+            self._dao.update(tool)
 
         # 重新加载工具到注册表
         self.reload_tool(tool_id, flush=True)
@@ -86,32 +87,41 @@ class ToolService(IToolService):
         """批量导入工具"""
         imported = []
         errors = []
-
-        for tool_data in tools_data:
-            if not tool_data.get("name"):
-                errors.append("工具缺少名称")
-                continue
-
-            existing = self._dao.get_by_name(tool_data["name"])
-
-            if existing:
-                result = self.update(existing.id, tool_data)
-                if result:
-                    imported.append(self.convert_dto(result))
+        reload_ids = []
+
+        # 整批导入只提交一次
+        with self._dao.transaction():
+            for tool_data in tools_data:
+                if not tool_data.get("name"):
+                    errors.append("工具缺少名称")
+                    continue
+
+                existing = self._dao.get_by_name(tool_data["name"])
+
+                if existing:
+                    result = self._update_entity(existing.id, tool_data)
+                    if result:
+                        imported.append(self.convert_dto(result))
+                        reload_ids.append(result.id)
+                    else:
+                        errors.append(f"更新 '{tool_data['name']}' 失败")
                 else:
-                    errors.append(f"更新 '{tool_data['name']}' 失败")
-            else:
-                try:
-                    result = self.create_one(tool_data)
-                    imported.append(result)
-                except ValidException as e:
-                    errors.append(f"创建 '{tool_data['name']}' 失败: {e.message}")
+                    try:
+                        result = self._create_entity(tool_data)
+                        imported.append(self.convert_dto(result))
+                        reload_ids.append(result.id)
+                    except ValidException as e:
+                        errors.append(f"创建 '{tool_data['name']}' 失败: {e.message}")
+
+        # 整批提交成功后再刷新注册表，中途失败回滚时注册表保持不变
+        for tool_id in reload_ids:
+            self.reload_tool(tool_id, flush=True)
 
         return imported
 
     def export_tools(self) -> List[ToolDto]:
         """导出所有工具"""
-        return [self.convert_dto(tool) for tool in self._dao.get_all()]
+        return [self.convert_dto(data) for data in self._dao.get_all_dicts()]
 
     def get_inheritable_tools(self) -> List[ToolInheritableDto]:
         """获取可继承的工具列表
@@ -215,6 +225,16 @@ class ToolService(IToolService):
         Raises:
             ValidException: 校验失败时抛出
         """
+        with self._dao.transaction():
+            tool = self._create_entity(data)
+
+        # 重新加载工具到注册表
+        self.reload_tool(tool.id, flush=True)
+
+        return self.convert_dto(tool)
+
+    def _create_entity(self, data: dict) -> Tool:
+        """校验并写入工具实体，不提交事务、不刷新注册表"""
         # 校验必填字段
         if not data.get("name"):
             raise ValidException("工具名称不能为空", "name")
@@ -241,13 +261,8 @@ class ToolService(IToolService):
             code=data.get("code", "")
         )
 
-        tool_id = self._dao.create(tool)
-        tool.id = tool_id
-
-        # 重新加载工具到注册表
-        self.reload_tool(tool_id, flush=True)
-
-        return self.convert_dto(tool)
+        tool.id = self._dao.create(tool)
+        return tool
 
     def update(self, tool_id: int, data: dict) -> Optional[Tool]:
         """更新工具实体
@@ -262,6 +277,16 @@ class ToolService(IToolService):
         Raises:
             ValidException: 校验失败时抛出
         """
+        with self._dao.transaction():
+            tool = self._update_entity(tool_id, data)
+
+        # 重新加载工具到注册表
+        self.reload_tool(tool_id, flush=True)
+
+        return tool
+
+    def _update_entity(self, tool_id: int, data: dict) -> Tool:
+        """校验并更新工具实体，不提交事务、不刷新注册表"""
         tool = self._dao.get_by_id(tool_id)
         if not tool:
             raise ValidException("Tool not found", "id")
@@ -293,10 +318,6 @@ class ToolService(IToolService):
             tool.code = data["code"]
 
         self._dao.update(tool)
-
-        # 重新加载工具到注册表
-        self.reload_tool(tool_id, flush=True)
-
         return tool
 
     def delete_by_id(self, tool_id: int) -> bool:
@@ -315,7 +336,8 @@ class ToolService(IToolService):
         if not tool:
             raise ValidException("Tool not found", "id")
 
-        self._dao.delete(tool_id)
+        with self._dao.transaction():
+            self._dao.delete(tool_id)
 
         # 从注册表移除工具
         self.reload_tool(tool_id, flush=False)
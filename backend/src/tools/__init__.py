@@ -3,10 +3,11 @@
 提供工具注册和执行能力。
 """
 
-from src.tools.registry import ToolRegistry, get_registry, register_tool
+from src.tools.registry import ToolRegistry, get_registry, register_tool, register_tools
 
 __all__ = [
     'ToolRegistry',
     'get_registry',
     'register_tool',
+    'register_tools',
 ]
@@ -120,6 +120,9 @@ class ToolParameter:
     用于 MCP 适配器的参数描述。
     """
 
+    # 每个 MCP 工具的每个参数一个实例，使用 __slots__ 省去实例 __dict__
+    __slots__ = ("name", "type", "description", "required", "default")
+
     def __init__(
         self,
         name: str,
@@ -9,6 +9,8 @@ from src.tools.builtins.read_file_tool import ReadFileTool
 from src.tools.builtins.skill_tool import SkillTool
 from src.tools.builtins.bash_tool import BashTool
 from src.tools.quickjs.quickjs_tool import QuickJSTool
+# 线程池隔离执行、带超时的 QuickJS 工具，作为面向模型的内置 quickjs 工具注册
+from src.tools.quickjs.quickjs_tool_thread import QuickJSTool as ThreadedQuickJSTool
 from src.tools.builtins.http_tool import HttpTool
 from src.tools.builtins.js_dynamic_tool import DynamicTool
 from src.tools.builtins.ask_user_tool import AskUserTool
@@ -20,6 +22,7 @@ __all__ = [
     'SkillTool',
     'BashTool',
     'QuickJSTool',
+    'ThreadedQuickJSTool',
     'HttpTool',
     'DynamicTool',
     'AskUserTool'
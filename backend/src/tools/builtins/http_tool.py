@@ -3,11 +3,97 @@
 发送 HTTP 请求并返回响应结果。
 """
 
+import asyncio
+import atexit
+import re
+import threading
+import weakref
 import httpx
-from typing import Any, Dict, Optional
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit, parse_qs, urlunsplit
 
 from src.tools.base import BaseTool
+from src.utils import fast_json
+from src.utils.logger import get_logger
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+except ImportError:
+    h2 = None
+
+logger = get_logger(__name__)
+
+# 合法的 HTTP 方法（已是大写时直接命中，免去 upper() 分配新字符串）
+_METHODS = {m: m for m in ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS")}
+
+# JSON 文本可能的起始字符（前导空白后），不匹配时无需尝试解析
+_JSON_PREFIX = re.compile(r"\s*[\[{\"\-0-9tfn]")
+
+# 进程级共享的同步客户端：所有 HttpTool 实例复用同一连接池，
+# 对同一主机的重复请求可跳过 TCP/TLS 握手。
+# 按是否启用 HTTP/2 分别缓存；支持 h2 的主机可在一条连接上多路复用并发请求
+_SHARED_CLIENTS: Dict[bool, httpx.Client] = {}
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def _get_shared_client(http2: bool = True) -> httpx.Client:
+    """获取或创建进程级共享的 HTTP 客户端。
+
+    Args:
+        http2: 是否启用 HTTP/2（未安装 h2 时自动退回 HTTP/1.1）
+    """
+    http2 = http2 and h2 is not None
+    client = _SHARED_CLIENTS.get(http2)
+    if client is None:
+        with _SHARED_CLIENT_LOCK:
+            client = _SHARED_CLIENTS.get(http2)
+            if client is None:
+                client = httpx.Client(
+                    http2=http2,
+                    limits=httpx.Limits(
+                        max_connections=200,
+                        max_keepalive_connections=100,
+                        keepalive_expiry=30.0,
+                    ),
+                    timeout=httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0),
+                )
+                atexit.register(client.close)
+                _SHARED_CLIENTS[http2] = client
+    return client
+
+
+# 进程级共享的异步客户端：连接池绑定创建它的事件循环，按循环分别缓存（循环回收后自动移除），
+# 每个循环内与同步客户端一样按是否启用 HTTP/2 区分
+_SHARED_ACLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_async_client(http2: bool = True) -> httpx.AsyncClient:
+    """获取或创建当前事件循环下进程级共享的异步 HTTP 客户端。
+
+    Args:
+        http2: 是否启用 HTTP/2（未安装 h2 时自动退回 HTTP/1.1）
+    """
+    http2 = http2 and h2 is not None
+    loop = asyncio.get_running_loop()
+    clients = _SHARED_ACLIENTS.get(loop)
+    client = clients.get(http2) if clients is not None else None
+    if client is None:
+        with _SHARED_CLIENT_LOCK:
+            clients = _SHARED_ACLIENTS.setdefault(loop, {})
+            client = clients.get(http2)
+            if client is None:
+                client = clients[http2] = httpx.AsyncClient(
+                    http2=http2,
+                    limits=httpx.Limits(
+                        max_connections=200,
+                        max_keepalive_connections=50,
+                        keepalive_expiry=30.0,
+                    ),
+                    timeout=httpx.Timeout(30.0),
+                )
+    return client
 
 
 class HttpTool(BaseTool):
@@ -19,13 +105,14 @@ class HttpTool(BaseTool):
             name="http",
             description="Send an HTTP request and return the response",
         )
-        self._client: Optional[httpx.Client] = None
 
-    def _get_client(self) -> httpx.Client:
-        """获取或创建 HTTP 客户端。"""
-        if self._client is None:
-            self._client = httpx.Client(timeout=30.0)
-        return self._client
+    def _get_client(self, http2: bool = True) -> httpx.Client:
+        """获取进程级共享的 HTTP 客户端。"""
+        return _get_shared_client(http2)
+
+    def _get_async_client(self, http2: bool = True) -> httpx.AsyncClient:
+        """获取当前事件循环下进程级共享的异步 HTTP 客户端。"""
+        return _get_shared_async_client(http2)
 
     def get_parameters(self) -> Dict[str, Any]:
         """获取参数定义。"""
@@ -69,13 +156,19 @@ class HttpTool(BaseTool):
                     "description": "Whether to follow redirects (default: true)",
                     "default": True,
                 },
+                "http2": {
+                    "type": "boolean",
+                    "description": "Whether to allow HTTP/2 when the server supports it (default: true)",
+                    "default": True,
+                },
             },
             "required": ["method", "url"],
         }
 
-    def invoke(self, **kwargs) -> Dict[str, Any]:
-        """发送 HTTP 请求。"""
-        method = kwargs.get("method", "GET").upper()
+    def _prepare_request(self, kwargs: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """解析参数，返回 (method, url, 请求关键字参数)。"""
+        raw_method = kwargs.get("method", "GET")
+        method = _METHODS.get(raw_method) or raw_method.upper()
         url = kwargs.get("url", "")
         headers = kwargs.get("headers", {})
         params = kwargs.get("params", {})
@@ -87,73 +180,122 @@ class HttpTool(BaseTool):
         if not url:
             raise ValueError("URL cannot be empty")
 
-        # 合并 URL 中的查询参数和 params
-        # 解决 GET 请求时 URL 参数和 params 参数同时存在时，URL 参数失效的问题
-        parsed_url = urlparse(url)
-        url_query_params = parse_qs(parsed_url.query)
-
-        # 合并参数：URL 参数优先，params 作为补充
-        merged_params = dict(url_query_params)
-        for key, value in params.items():
-            if key in merged_params:
-                # 如果参数已存在，合并为列表
-                if isinstance(merged_params[key], list):
-                    if isinstance(value, list):
-                        merged_params[key].extend(value)
+        # 未传 params 时直接使用原始 URL，交给 httpx 处理查询串，跳过解析/重建
+        merged_params = None
+        if params:
+            # 合并 URL 中的查询参数和 params
+            # 解决 GET 请求时 URL 参数和 params 参数同时存在时，URL 参数失效的问题
+            parsed_url = urlsplit(url)
+            url_query_params = parse_qs(parsed_url.query)
+
+            # 合并参数：URL 参数优先，params 作为补充
+            merged_params = dict(url_query_params)
+            for key, value in params.items():
+                if key in merged_params:
+                    # 如果参数已存在，合并为列表
+                    if isinstance(merged_params[key], list):
+                        if isinstance(value, list):
+                            merged_params[key].extend(value)
+                        else:
+                            merged_params[key].append(value)
                     else:
-                        merged_params[key].append(value)
+                        existing = merged_params[key]
+                        merged_params[key] = [existing] if isinstance(existing, str) else existing
+                        if isinstance(value, list):
+                            merged_params[key].extend(value)
+                        else:
+                            merged_params[key].append(value)
                 else:
-                    existing = merged_params[key]
-                    merged_params[key] = [existing] if isinstance(existing, str) else existing
-                    if isinstance(value, list):
-                        merged_params[key].extend(value)
-                    else:
-                        merged_params[key].append(value)
-            else:
-                merged_params[key] = value
+                    merged_params[key] = value
 
-        # 重新构建 URL（清除原有查询参数）
-        new_query = urlencode(merged_params, doseq=True)
-        url = urlunparse((
-            parsed_url.scheme,
-            parsed_url.netloc,
-            parsed_url.path,
-            parsed_url.params,
-            new_query,
-            parsed_url.fragment
-        ))
+            # 去掉 URL 中原有的查询串，合并后的参数只通过 params 交给 httpx 编码一次
+            url = urlunsplit((
+                parsed_url.scheme,
+                parsed_url.netloc,
+                parsed_url.path,
+                "",
+                parsed_url.fragment
+            ))
 
-        print(f"HTTP({method} {url})")
+        logger.debug("HTTP(%s %s)", method, url)
 
-        client = self._get_client()
+        return method, url, {
+            "headers": headers if headers else None,
+            "params": merged_params if merged_params else None,
+            "json": json_data,
+            "data": form_data if form_data else None,
+            "content": content,
+            "follow_redirects": follow_redirects,
+        }
 
-        try:
-            response = client.request(
-                method=method,
-                url=url,
-                headers=headers if headers else None,
-                params=merged_params if merged_params else None,
-                json=json_data,
-                data=form_data if form_data else None,
-                content=content,
-                follow_redirects=follow_redirects,
-            )
-
-            # 尝试解析 JSON 响应
+    @staticmethod
+    def _headers_to_dict(headers: httpx.Headers) -> Dict[str, str]:
+        """将响应头转换为字典。
+
+        与 dict(headers) 结果一致（键小写，重复头以 ", " 合并），但只遍历一次头列表；
+        dict(headers) 会对每个键重新扫描全部头，多 Set-Cookie/CDN 头时开销明显。
+        """
+        result: Dict[str, str] = {}
+        for key, value in headers.multi_items():
+            if key in result:
+                result[key] = f"{result[key]}, {value}"
+            else:
+                result[key] = value
+        return result
+
+    @staticmethod
+    def _build_result(method: str, response: httpx.Response) -> Dict[str, Any]:
+        """将响应转换为工具结果。
+
+        响应体只解码一次，JSON 从解码后的文本解析；明显不是 JSON 的正文（如 HTML）跳过解析。
+        """
+        text = response.content.decode(response.encoding or "utf-8", errors="replace")
+
+        # 尝试解析 JSON 响应
+        response_json = None
+        if _JSON_PREFIX.match(text):
             try:
-                response_json = response.json()
-            except Exception:
+                response_json = fast_json.loads(text)
+            except ValueError:
                 response_json = None
 
-            return {
-                "success": response.is_success,
-                "status_code": response.status_code,
-                "method": method,
-                "url": str(response.url),
-                "headers": dict(response.headers),
-                "content": response.text,
-                "json": response_json,
-            }
+        return {
+            "success": response.is_success,
+            "status_code": response.status_code,
+            "method": method,
+            "url": str(response.url),
+            "headers": HttpTool._headers_to_dict(response.headers),
+            "content": text,
+            "json": response_json,
+        }
+
+    def invoke(self, **kwargs) -> Dict[str, Any]:
+        """发送 HTTP 请求。"""
+        method, url, request_kwargs = self._prepare_request(kwargs)
+        client = self._get_client(kwargs.get("http2", True))
+
+        try:
+            response = client.request(method=method, url=url, **request_kwargs)
+            return self._build_result(method, response)
+
+        except httpx.TimeoutException:
+            raise ValueError(f"Request timed out: {url}")
+        except httpx.ConnectError as e:
+            raise ValueError(f"Connection failed: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Request failed: {str(e)}")
+
+    async def ainvoke(self, **kwargs) -> Dict[str, Any]:
+        """异步发送 HTTP 请求。
+
+        同一事件循环内所有实例共享 AsyncClient，并发调用复用 keep-alive 连接，不占用线程池。
+        """
+        method, url, request_kwargs = self._prepare_request(kwargs)
+        client = self._get_async_client(kwargs.get("http2", True))
+
+        try:
+            response = await client.request(method=method, url=url, **request_kwargs)
+            return self._build_result(method, response)
 
         except httpx.TimeoutException:
             raise ValueError(f"Request timed out: {url}")
@@ -163,10 +305,19 @@ class HttpTool(BaseTool):
             raise ValueError(f"Request failed: {str(e)}")
 
     def close(self):
-        """关闭 HTTP 客户端。"""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """释放实例持有的客户端。
+
+        客户端均为进程级共享：同步客户端随进程退出关闭（atexit），
+        异步客户端需在事件循环中关闭，见 aclose()。
+        """
+
+    async def aclose(self):
+        """关闭当前事件循环下共享的异步 HTTP 客户端，下次调用时重建。"""
+        with _SHARED_CLIENT_LOCK:
+            clients = _SHARED_ACLIENTS.pop(asyncio.get_running_loop(), None)
+        if clients:
+            for client in clients.values():
+                await client.aclose()
 
     def __repr__(self) -> str:
         return f"HttpTool(name={self.name})"
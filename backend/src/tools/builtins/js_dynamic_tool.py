@@ -1,14 +1,73 @@
 
 """动态工具类 - 从数据库加载的工具"""
 
-from typing import Any, Dict, Optional
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import copy_context
+from typing import Any, Dict, Iterator, List, Optional
 
 from src.tools.base import BaseTool
-from src.modules.tools.models import Tool
-from src.tools.quickjs.quickjs_tool import QuickJSTool
-from src.utils.script_wrapper import wrap_javascript_code
+from src.modules.tools.models import Tool, ToolParameter
+from src.tools.quickjs.quickjs_tool import QuickJSTool, has_return
+from src.utils.script_wrapper import build_script_context, wrap_script
 from src.core.session_context import get_session
 
+# 每个线程维护一组已完成初始化的 QuickJSTool 池，摊销 JS 运行时的创建开销。
+# QuickJS 上下文与创建它的线程栈绑定，不能跨线程使用，因此池按线程划分。
+# 池再按脚本划分：归还时只能删除脚本新增的全局变量，脚本对已有全局变量或内置对象
+# 的修改（如重新赋值 JSON、改写 console.log 或内置原型）会保留在实例中，
+# 只允许同一脚本的后续执行复用该实例，避免影响其他工具
+_thread_local = threading.local()
+
+# 每个脚本最多保留的空闲实例数（同一工具经 callTool 递归调用时会同时借出多个）
+_POOL_MAX_IDLE = 2
+# 每个线程最多保留空闲实例的脚本数，超过后淘汰最久未使用的脚本的实例
+_POOL_MAX_SCRIPTS = 16
+# 单个实例的最大复用次数，超过后丢弃重建，避免上下文内存持续增长
+_POOL_MAX_USES = 500
+
+
+@contextmanager
+def _quickjs_tool(script: str) -> Iterator[QuickJSTool]:
+    """从当前线程中该脚本的池借出执行用的 QuickJSTool，用完归还。
+
+    含 return 的脚本会被包装为立即执行函数，不会在全局作用域留下声明，
+    可复用池中的实例，归还前清理脚本新增的全局变量；其余脚本仍使用新实例。
+    实例只在同一脚本的执行之间复用，不同脚本互不影响。
+
+    Args:
+        script: 包装后的 JavaScript 脚本
+    """
+    if not has_return(script):
+        yield QuickJSTool()
+        return
+
+    pools = getattr(_thread_local, "pools", None)
+    if pools is None:
+        pools = _thread_local.pools = OrderedDict()
+    idle = pools.get(script)
+    tool, uses = idle.pop() if idle else (QuickJSTool(), 0)
+    reusable = False
+    try:
+        yield tool
+        reusable = True
+    finally:
+        uses += 1
+        if reusable and uses < _POOL_MAX_USES:
+            tool.reset_globals()
+            # 借出期间其他调用可能已建立或淘汰了该脚本的池，归还时重新获取
+            idle = pools.get(script)
+            if idle is None:
+                idle = pools[script] = []
+                if len(pools) > _POOL_MAX_SCRIPTS:
+                    pools.popitem(last=False)
+            else:
+                pools.move_to_end(script)
+            if len(idle) < _POOL_MAX_IDLE:
+                idle.append((tool, uses))
+
 
 class DynamicTool(BaseTool):
     """动态工具 - 包装数据库中的 Tool 实体"""
@@ -20,11 +79,21 @@ class DynamicTool(BaseTool):
             tool: 数据库中的 Tool 实体
         """
         super().__init__(tool.name, tool.description)
-        self._tool = tool
+        # 只在初始化时读取实体字段，不持有 ORM 对象：
+        # 请求结束后 Session 提交/关闭会使实体过期或游离，之后再读取属性会报错。
+        # 工具更新时会重新注册新实例，这里拷贝的字段在实例生命周期内不变
+        self._inherit_from: Optional[str] = tool.inherit_from
+        self._parameters: Dict[str, Any] = self._build_parameters(tool.parameters)
+        # 包装后的脚本与调用参数无关，初始化时生成一次
+        self._script = wrap_script(tool.code, tool.inherit_from)
 
     def get_parameters(self) -> Dict[str, Any]:
         """获取参数定义"""
-        params = self._tool.parameters
+        return self._parameters
+
+    @staticmethod
+    def _build_parameters(params: Optional[List[ToolParameter]]) -> Dict[str, Any]:
+        """将工具实体的参数列表转换为 JSON Schema"""
 
         if not params:
             # 如果没有自定义参数，返回空对象
@@ -59,7 +128,7 @@ class DynamicTool(BaseTool):
     def invoke(self, **kwargs: Any) -> Dict[str, Any]:
         """执行工具。
 
-        使用 wrap_javascript_code 包装代码，然后调用 quickjs 工具执行。
+        使用预先包装的脚本，绑定本次参数后调用 quickjs 工具执行。
 
         Args:
             **kwargs: 工具参数
@@ -73,20 +142,14 @@ class DynamicTool(BaseTool):
         if session:
             metadata = session._metadata
 
-        print(f"sssssssss==={self.name} ==== {metadata}")
-
-        # 包装 JavaScript 脚本，获取 context 和 script
-        context, script = wrap_javascript_code(
-            self._tool.code,
-            kwargs,
-            metadata=metadata,
-            inherit_from=self._tool.inherit_from
-        )
-        # 创建新的 QuickJSTool 实例，避免线程安全问题
-        tool = QuickJSTool()
+        context = build_script_context(kwargs, metadata, self._inherit_from)
+        return self._run_script(context, self._script)
 
-        # 将 context 传给 quickjs 工具，内部会自动暴露和释放
-        result = tool.invoke(code=script, tool_name=self._tool.name, context=context)
+    def _run_script(self, context: Dict[str, Any], script: str) -> Any:
+        """借用当前线程池中的 QuickJSTool 执行脚本并返回结果。"""
+        with _quickjs_tool(script) as tool:
+            # 将 context 传给 quickjs 工具，内部会自动暴露和释放
+            result = tool.invoke(code=script, tool_name=self.name, context=context)
 
         # 直接返回结果
         return result["result"]
@@ -106,18 +169,10 @@ class DynamicTool(BaseTool):
         if session:
             metadata = session._metadata
 
-        # 包装 JavaScript 脚本，获取 context 和 script
-        context, script = wrap_javascript_code(
-            self._tool.code,
-            kwargs,
-            metadata=metadata,
-            inherit_from=self._tool.inherit_from
-        )
+        context = build_script_context(kwargs, metadata, self._inherit_from)
+        script = self._script
 
-        # 创建新的 QuickJSTool 实例，避免线程安全问题
-        tool = QuickJSTool()
-        # 将 context 传给 quickjs 工具，内部会自动暴露和释放
-        result = await tool.ainvoke(code=script, tool_name=self._tool.name, context=context)
-
-        # 直接返回结果
-        return result["result"]
+        # 在线程池中执行，QuickJSTool 的获取与使用都在同一工作线程内
+        loop = asyncio.get_running_loop()
+        ctx = copy_context()
+        return await loop.run_in_executor(None, lambda: ctx.run(self._run_script, context, script))
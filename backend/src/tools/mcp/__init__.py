@@ -2,7 +2,12 @@
 
 from src.tools.mcp.config import load_mcp_servers, connect_mode
 from src.tools.mcp.client import MCPClient, MCPClientConfig
-from src.tools.mcp.adapter import MCPToolAdapter, register_mcp_tools
+from src.tools.mcp.adapter import (
+    MCPToolAdapter,
+    invoke_mcp_batch,
+    register_mcp_tools,
+    register_mcp_tools_async,
+)
 from src.tools.mcp.loader import register_mcp_servers, format_mcp_tools_prompt
 
 __all__ = [
@@ -11,7 +16,9 @@ __all__ = [
     "MCPClient",
     "MCPClientConfig",
     "MCPToolAdapter",
+    "invoke_mcp_batch",
     "register_mcp_tools",
+    "register_mcp_tools_async",
     "register_mcp_servers",
     "format_mcp_tools_prompt",
 ]
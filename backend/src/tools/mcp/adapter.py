@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from typing import Any
 
@@ -11,6 +12,10 @@ import re
 from src.tools.base import BaseTool, ToolParameter, ErrorCode
 from src.tools.mcp.protocol import to_protocol_result, to_protocol_error, to_protocol_invalid_param
 
+# 工具名清洗：非法字符替换为下划线，再折叠连续下划线
+_SAFE_NAME = re.compile(r"[^a-zA-Z0-9_-]")
+_COLLAPSE_US = re.compile(r"_+")
+
 
 class MCPToolAdapter(BaseTool):
     """Wrap an MCP tool and expose it as a BaseTool."""
@@ -32,6 +37,15 @@ class MCPToolAdapter(BaseTool):
         # 初始化参数列表
         self._init_parameters()
 
+        # 预计算参数校验所需的 schema 信息，避免每次调用时重复读取
+        schema = self._schema if isinstance(self._schema, dict) else {}
+        properties = schema.get("properties")
+        self._prop_keys: frozenset[str] | None = (
+            frozenset(properties.keys()) if isinstance(properties, dict) else None
+        )
+        self._required: tuple[str, ...] = tuple(schema.get("required") or [])
+        self._allow_unknown: bool = schema.get("additionalProperties", True) is not False
+
     def _init_parameters(self) -> None:
         """初始化参数列表。"""
         schema = self._schema if isinstance(self._schema, dict) else {}
@@ -39,23 +53,19 @@ class MCPToolAdapter(BaseTool):
         if not isinstance(properties, dict):
             return
         required = set(schema.get("required") or [])
-        for name, spec in properties.items():
-            if isinstance(spec, dict):
-                type_name = spec.get("type") or "any"
-                description = (spec.get("description") or "").strip()
-                default = spec.get("default")
-            else:
-                type_name = "any"
-                description = ""
-                default = None
-            param = ToolParameter(
+        # 一次性构建列表，循环内不再经由 self 查找属性
+        self._parameters = [
+            ToolParameter(
                 name=name,
-                type=type_name,
-                description=description,
+                type=spec.get("type") or "any",
+                description=(spec.get("description") or "").strip(),
                 required=name in required,
-                default=default,
+                default=spec.get("default"),
             )
-            self._parameters.append(param)
+            if isinstance(spec, dict)
+            else ToolParameter(name=name, type="any", description="", required=name in required)
+            for name, spec in properties.items()
+        ]
 
     def get_parameters(self) -> dict[str, Any]:
         """获取参数定义（JSON Schema 格式）。"""
@@ -64,7 +74,19 @@ class MCPToolAdapter(BaseTool):
 
     def invoke(self, **kwargs: Any) -> dict[str, Any]:
         """执行工具逻辑（同步）。"""
-        start_time = time.monotonic()
+        start_time = time.monotonic_ns()
+        error = self._check_params(kwargs, start_time)
+        if error is not None:
+            return error
+
+        try:
+            result = self._mcp_client.call_tool_sync(self._remote_name, kwargs)
+        except Exception as exc:
+            return self._wrap_result(exc, kwargs, start_time)
+        return self._wrap_result(result, kwargs, start_time)
+
+    def _check_params(self, kwargs: dict[str, Any], start_time: int) -> dict[str, Any] | None:
+        """校验参数，不通过时返回错误结果。"""
         try:
             invalid = self._validate_params(kwargs)
             if invalid:
@@ -78,9 +100,13 @@ class MCPToolAdapter(BaseTool):
                 message, kwargs, self._remote_name, start_time, ErrorCode.MCP_PARSE_ERROR
             )
             return {"error": error_result}
+        return None
 
+    def _wrap_result(self, result: Any, kwargs: dict[str, Any], start_time: int) -> dict[str, Any]:
+        """将 call_tool 的返回值（或抛出的异常）转换为工具结果。"""
         try:
-            result = self._mcp_client.call_tool_sync(self._remote_name, kwargs)
+            if isinstance(result, BaseException):
+                raise result
         except TimeoutError as exc:
             message = str(exc) or "MCP tool call timeout"
             error_result = to_protocol_error(
@@ -111,17 +137,13 @@ class MCPToolAdapter(BaseTool):
             return {"error": error_result}
 
     def _validate_params(self, parameters: dict[str, Any]) -> str:
-        schema = self._schema if isinstance(self._schema, dict) else {}
-        properties = schema.get("properties")
-        required = schema.get("required") or []
-        if not isinstance(properties, dict):
+        prop_keys = self._prop_keys
+        if prop_keys is None:
             return ""
-        missing = [name for name in required if name not in parameters]
-        additional = schema.get("additionalProperties", True)
-        allow_unknown = additional is not False
+        missing = [name for name in self._required if name not in parameters]
         unknown = []
-        if not allow_unknown:
-            unknown = [name for name in parameters.keys() if name not in properties]
+        if not self._allow_unknown:
+            unknown = [name for name in parameters if name not in prop_keys]
         parts = []
         if missing:
             parts.append(f"missing required params: {', '.join(missing)}")
@@ -130,25 +152,99 @@ class MCPToolAdapter(BaseTool):
         return "; ".join(parts)
 
 
+def invoke_mcp_batch(calls: list[tuple[MCPToolAdapter, dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Invoke several MCP tools, pipelining the calls that share a client.
+
+    Calls are grouped by MCP client; each group with more than one call is
+    sent through call_tools_batch_sync in a single round. Results are returned
+    in the same order as ``calls`` and match what MCPToolAdapter.invoke returns.
+    """
+    start_time = time.monotonic_ns()
+    results: list[dict[str, Any] | None] = [None] * len(calls)
+    groups: dict[int, list[int]] = {}
+    for index, (adapter, kwargs) in enumerate(calls):
+        error = adapter._check_params(kwargs, start_time)
+        if error is not None:
+            results[index] = error
+        else:
+            groups.setdefault(id(adapter._mcp_client), []).append(index)
+
+    for indexes in groups.values():
+        if len(indexes) == 1:
+            adapter, kwargs = calls[indexes[0]]
+            results[indexes[0]] = adapter.invoke(**kwargs)
+            continue
+        client = calls[indexes[0]][0]._mcp_client
+        pairs = [(calls[i][0]._remote_name, calls[i][1]) for i in indexes]
+        try:
+            raw_results = client.call_tools_batch_sync(pairs)
+        except Exception as exc:
+            raw_results = [exc] * len(indexes)
+        for i, raw in zip(indexes, raw_results):
+            adapter, kwargs = calls[i]
+            results[i] = adapter._wrap_result(raw, kwargs, start_time)
+    return results
+
+
 def register_mcp_tools(tool_registry, mcp_client, namespace: str | None = None) -> list[dict[str, object | None]]:
     """Discover tools from MCP server and register them to ToolRegistry."""
+    tools = mcp_client.list_tools_sync()
+    return _register_listed_tools(tool_registry, mcp_client, tools, namespace)
+
+
+async def register_mcp_tools_async(
+    tool_registry, clients: list[tuple[str | None, Any]]
+) -> list[dict[str, object | None]]:
+    """Discover tools from several MCP servers concurrently, then register them.
+
+    Args:
+        tool_registry: target ToolRegistry
+        clients: (namespace, MCPClient) pairs
+
+    Each client's session is bound to that client's own loop, so list_tools is
+    submitted there and the resulting futures are awaited together.
+    Servers that fail to list are logged and skipped.
+    """
+    logger = logging.getLogger(__name__)
+    results = await asyncio.gather(
+        *(asyncio.wrap_future(client.submit(client.list_tools())) for _, client in clients),
+        return_exceptions=True,
+    )
+    registered: list[dict[str, object | None]] = []
+    for (namespace, client), tools in zip(clients, results):
+        if isinstance(tools, BaseException):
+            logger.warning("MCP tool registration failed for %s: %s", namespace, tools)
+            continue
+        try:
+            registered.extend(_register_listed_tools(tool_registry, client, tools, namespace))
+        except Exception as exc:
+            logger.warning("MCP tool registration failed for %s: %s", namespace, exc)
+    return registered
+
+
+def _register_listed_tools(
+    tool_registry, mcp_client, tools: Any, namespace: str | None = None
+) -> list[dict[str, object | None]]:
+    """Register the tools returned by list_tools to ToolRegistry."""
     logger = logging.getLogger(__name__)
-    safe_name_pattern = re.compile(r"[^a-zA-Z0-9_-]")
 
     def sanitize_tool_name(name: str) -> str:
-        sanitized = safe_name_pattern.sub("_", name)
-        sanitized = re.sub(r"_+", "_", sanitized).strip("_")
+        sanitized = _SAFE_NAME.sub("_", name)
+        sanitized = _COLLAPSE_US.sub("_", sanitized).strip("_")
         return sanitized or "tool"
 
+    # 本批新分配的名称；已注册的名称直接查注册表，不触发数据库等延迟加载
+    taken: set[str] = set()
+
     def ensure_unique(base_name: str) -> str:
         candidate = base_name
         counter = 2
-        while tool_registry.get(candidate):
+        while candidate in taken or tool_registry.has_name(candidate):
             candidate = f"{base_name}_{counter}"
             counter += 1
+        taken.add(candidate)
         return candidate
 
-    tools = mcp_client.list_tools_sync()
     registered: list[dict[str, object | None]] = []
     for tool in tools.tools:
         remote_name = getattr(tool, "name", None) or getattr(tool, "tool_name", None)
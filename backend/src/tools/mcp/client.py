@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import os
+import threading
 from dataclasses import dataclass
 from typing import Any, Optional
 
@@ -30,6 +32,8 @@ class MCPClient:
         self._conn = None
         self._session: Optional[ClientSession] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
 
     async def connect(self) -> ClientSession:
         if self._session:
@@ -101,6 +105,32 @@ class MCPClient:
             session = await self.connect()
             return await session.call_tool(name, arguments)
 
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Pipeline several tool calls over the session and gather the responses.
+
+        All requests are written before any response is awaited, so K calls cost
+        roughly one round-trip. Failures are returned in place as exceptions.
+        Like call_tool, calls that hit a closed session are retried once after
+        reconnecting; calls that already completed are not re-sent.
+        """
+        session = await self.connect()
+        results = await self._gather_calls(session, calls)
+        closed = [i for i, result in enumerate(results) if isinstance(result, anyio.ClosedResourceError)]
+        if closed:
+            await self.close()
+            session = await self.connect()
+            retried = await self._gather_calls(session, [calls[i] for i in closed])
+            for i, result in zip(closed, retried):
+                results[i] = result
+        return results
+
+    @staticmethod
+    async def _gather_calls(session: ClientSession, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        return await asyncio.gather(
+            *(session.call_tool(name, arguments) for name, arguments in calls),
+            return_exceptions=True,
+        )
+
     async def list_resources(self) -> Any:
         session = await self.connect()
         try:
@@ -137,14 +167,33 @@ class MCPClient:
             session = await self.connect()
             return await session.get_prompt(name, arguments=arguments)
 
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client's persistent loop on a daemon thread if needed.
+
+        The MCP session (and its anyio task groups) lives on this one loop for
+        the client's whole lifetime; sync callers from any thread hand work to it.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, daemon=True, name="MCPClient-loop"
+                )
+                thread.start()
+                self._loop = loop
+                self._loop_thread = thread
+            return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the client's loop and return its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
     def _run_sync(self, coro):
         try:
             asyncio.get_running_loop()
         except RuntimeError:
-            if self._loop is None or self._loop.is_closed():
-                self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-            return self._loop.run_until_complete(coro)
+            return self.submit(coro).result()
+        coro.close()
         raise RuntimeError("MCPClient sync methods cannot run inside an active event loop.")
 
     def connect_sync(self) -> ClientSession:
@@ -153,11 +202,26 @@ class MCPClient:
     def call_tool_sync(self, name: str, arguments: dict[str, Any]) -> Any:
         return self._run_sync(self.call_tool(name, arguments))
 
+    def call_tools_batch_sync(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        return self._run_sync(self.call_tools_batch(calls))
+
     def list_tools_sync(self) -> Any:
         return self._run_sync(self.list_tools())
 
     def close_sync(self) -> None:
-        result = self._run_sync(self.close())
-        if self._loop and not self._loop.is_closed():
-            self._loop.close()
-        return result
+        try:
+            return self._run_sync(self.close())
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        """Stop the client's loop thread and close the loop."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
+        if loop and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            if thread:
+                thread.join()
+            loop.close()
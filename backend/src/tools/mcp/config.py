@@ -2,15 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import os
 import re
-from pathlib import Path
 from typing import Any
 
 import json5
 
 from src.config.dotenv_loader import expand_env_in_dict
+from src.utils import fast_json
 
 
 DEFAULT_CONFIG_FILES = (
@@ -19,28 +18,59 @@ DEFAULT_CONFIG_FILES = (
     "mcp.json",
 )
 
+# 解析结果缓存（未替换环境变量的原始数据）：
+# 文件按路径缓存 (st_mtime_ns, data)，环境变量按原始字符串缓存
+_FILE_CACHE: dict[str, tuple[int, Any]] = {}
+_ENV_CACHE: tuple[str, Any] | None = None
+
 
 def _load_from_env() -> dict[str, Any] | None:
+    global _ENV_CACHE
     raw = os.environ.get("MCP_SERVERS")
     if not raw:
         return None
-    try:
-        data = json.loads(raw)
-        # 替换环境变量
-        return expand_env_in_dict(data)
-    except json.JSONDecodeError:
-        return None
+    if _ENV_CACHE is not None and _ENV_CACHE[0] == raw:
+        data = _ENV_CACHE[1]
+    else:
+        try:
+            data = fast_json.loads(raw)
+        except ValueError:
+            return None
+        _ENV_CACHE = (raw, data)
+    # 替换环境变量（每次重新替换，环境变量可能变化）
+    return expand_env_in_dict(data)
 
 
 def _load_from_files(project_root: str) -> dict[str, Any] | None:
-    root = Path(project_root)
+    # 一次读取目录，只对实际存在的候选文件做 stat
+    try:
+        with os.scandir(project_root) as it:
+            entries = {e.name: e for e in it if e.name in DEFAULT_CONFIG_FILES}
+    except OSError:
+        return None
     for name in DEFAULT_CONFIG_FILES:
-        path = root / name
-        if not path.exists():
+        entry = entries.get(name)
+        if entry is None:
+            continue
+        path = entry.path
+        try:
+            if not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime_ns
+        except OSError:
             continue
+        cached = _FILE_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            data = cached[1]
+        else:
+            try:
+                # 使用 json5 解析，支持注释
+                with open(path, encoding="utf-8") as f:
+                    data = json5.loads(f.read())
+            except Exception:
+                continue
+            _FILE_CACHE[path] = (mtime, data)
         try:
-            # 使用 json5 解析，支持注释
-            data = json5.loads(path.read_text(encoding="utf-8"))
             # 替换环境变量
             return expand_env_in_dict(data)
         except Exception:
@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import os
 from pathlib import Path
 from typing import Any
 
 from src.tools.mcp.client import MCPClient, MCPClientConfig
-from src.tools.mcp.adapter import register_mcp_tools
+from src.tools.mcp.adapter import register_mcp_tools_async
 from src.tools.mcp.config import load_mcp_servers, connect_mode
 
 logger = logging.getLogger(__name__)
 
 
-def _default_uv_env(project_root: str, env: dict[str, str] | None) -> dict[str, str]:
-    merged = dict(env or {})
+@functools.lru_cache(maxsize=None)
+def _ensure_uv_dirs(project_root: str) -> tuple[Path, Path, Path]:
+    """Create the uv/npm cache directories once per process and return them."""
     root = Path(project_root)
     cache_dir = root / ".uv_cache"
     tool_dir = root / ".uv_tools"
@@ -24,6 +27,12 @@ def _default_uv_env(project_root: str, env: dict[str, str] | None) -> dict[str,
     cache_dir.mkdir(parents=True, exist_ok=True)
     tool_dir.mkdir(parents=True, exist_ok=True)
     npm_cache.mkdir(parents=True, exist_ok=True)
+    return cache_dir, tool_dir, npm_cache
+
+
+def _default_uv_env(project_root: str, env: dict[str, str] | None) -> dict[str, str]:
+    merged = dict(env or {})
+    cache_dir, tool_dir, npm_cache = _ensure_uv_dirs(project_root)
 
     merged.setdefault("UV_CACHE_DIR", str(cache_dir))
     merged.setdefault("XDG_CACHE_HOME", str(cache_dir))
@@ -39,7 +48,40 @@ def _default_uv_env(project_root: str, env: dict[str, str] | None) -> dict[str,
     return merged
 
 
+def _freeze_spec(spec: dict[str, Any]) -> tuple:
+    """Turn a server spec into a hashable key; args/env become tuples."""
+    items = []
+    for key, value in spec.items():
+        if isinstance(value, dict):
+            value = tuple(sorted(value.items()))
+        elif isinstance(value, list):
+            value = tuple(value)
+        items.append((key, value))
+    return tuple(sorted(items))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_client_config_cached(project_root: str, frozen_spec: tuple) -> MCPClientConfig:
+    spec = {key: value for key, value in frozen_spec}
+    if isinstance(spec.get("env"), tuple):
+        spec["env"] = dict(spec["env"])
+    return _build_client_config_uncached(project_root, spec)
+
+
 def _build_client_config(project_root: str, spec: dict[str, Any]) -> MCPClientConfig:
+    """Build the client config, reusing the result for an identical spec.
+
+    Specs holding unhashable values (e.g. nested objects) skip the cache.
+    """
+    try:
+        frozen = _freeze_spec(spec)
+        hash(frozen)
+    except TypeError:
+        return _build_client_config_uncached(project_root, spec)
+    return _build_client_config_cached(project_root, frozen)
+
+
+def _build_client_config_uncached(project_root: str, spec: dict[str, Any]) -> MCPClientConfig:
     transport = spec.get("transport")
     url = spec.get("url") or spec.get("endpoint")
     command = spec.get("command")
@@ -60,6 +102,20 @@ def _build_client_config(project_root: str, spec: dict[str, Any]) -> MCPClientCo
     return MCPClientConfig(transport="stdio", command=command, args=expanded_args, env=env)
 
 
+def _format_param(name: str, spec: object, required: set[str]) -> str:
+    if not isinstance(spec, dict):
+        return str(name)
+    type_name = spec.get("type")
+    default = spec.get("default")
+    desc = (spec.get("description") or "").strip()
+    required_flag = " required" if name in required else ""
+    type_label = f": {type_name}" if type_name else ""
+    default_label = f", default={default}" if default is not None else ""
+    if desc:
+        return f"{name}{type_label}{default_label}{required_flag} - {desc}"
+    return f"{name}{type_label}{default_label}{required_flag}"
+
+
 def _format_schema(schema: object | None) -> str:
     if not isinstance(schema, dict):
         return ""
@@ -67,22 +123,7 @@ def _format_schema(schema: object | None) -> str:
     required = set(schema.get("required") or [])
     if not isinstance(properties, dict) or not properties:
         return ""
-    parts = []
-    for name, spec in properties.items():
-        if not isinstance(spec, dict):
-            parts.append(str(name))
-            continue
-        type_name = spec.get("type")
-        default = spec.get("default")
-        desc = (spec.get("description") or "").strip()
-        required_flag = " required" if name in required else ""
-        type_label = f": {type_name}" if type_name else ""
-        default_label = f", default={default}" if default is not None else ""
-        if desc:
-            parts.append(f"{name}{type_label}{default_label}{required_flag} - {desc}")
-        else:
-            parts.append(f"{name}{type_label}{default_label}{required_flag}")
-    return "; ".join(parts)
+    return "; ".join(_format_param(name, spec, required) for name, spec in properties.items())
 
 
 def format_mcp_tools_prompt(tools_meta: list[dict[str, object | None]]) -> str:
@@ -102,31 +143,41 @@ def format_mcp_tools_prompt(tools_meta: list[dict[str, object | None]]) -> str:
     return "\n".join(lines)
 
 
-def register_mcp_servers(tool_registry, project_root: str) -> tuple[list[MCPClient], list[dict[str, object | None]]]:
+def register_mcp_servers(
+    tool_registry, project_root: str
+) -> tuple[list[MCPClient], list[dict[str, object | None]], str]:
+    """Create MCP clients and, in startup mode, register their tools.
+
+    Returns:
+        (clients, registered tool metadata, tools prompt); the prompt is
+        formatted once here so callers never rebuild it per request.
+    """
     servers = load_mcp_servers(project_root)
     mode = connect_mode()
     if not servers or mode == "disabled":
-        return [], []
+        return [], [], ""
 
     clients: list[MCPClient] = []
-    registered_tools: list[dict[str, object | None]] = []
+    named_clients: list[tuple[str, MCPClient]] = []
 
     for server_name, spec in servers.items():
         if not isinstance(spec, dict):
             continue
-        config = _build_client_config(project_root, spec)
+        # 单个服务器配置有误时记录警告并跳过，与 list_tools 失败的处理一致
+        try:
+            config = _build_client_config(project_root, spec)
+        except ValueError as exc:
+            logger.warning("Invalid MCP server config for %s: %s", server_name, exc)
+            continue
         client = MCPClient(config)
         clients.append(client)
+        named_clients.append((server_name, client))
 
-        if mode != "startup":
-            continue
+    if mode != "startup" or not named_clients:
+        return clients, [], ""
 
-        try:
-            logger.info(f"begin register mcp: {server_name}")
-            tools_meta = register_mcp_tools(tool_registry, client, namespace=server_name)
-            registered_tools.extend(tools_meta)
-        except Exception as exc:
-            logger.warning("MCP tool registration failed for %s: %s", server_name, exc)
-            continue
+    # 所有服务器的 list_tools 并发进行，再统一注册
+    logger.info("begin register mcp: %s", ", ".join(name for name, _ in named_clients))
+    registered_tools = asyncio.run(register_mcp_tools_async(tool_registry, named_clients))
 
-    return clients, registered_tools
+    return clients, registered_tools, format_mcp_tools_prompt(registered_tools)
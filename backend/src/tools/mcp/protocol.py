@@ -2,61 +2,81 @@
 
 from __future__ import annotations
 
-import json
 import time
-from typing import Any
+from typing import Any, Callable
 
+from src.utils import fast_json
 from ..base import ToolStatus, ErrorCode
 
 
+_ERROR_TYPE_MAP: dict[ErrorCode, str] = {
+    ErrorCode.MCP_PARAM_ERROR: "param_error",
+    ErrorCode.MCP_INVALID_PARAM: "param_error",
+    ErrorCode.MCP_PARSE_ERROR: "parse_error",
+    ErrorCode.MCP_NETWORK_ERROR: "network_error",
+    ErrorCode.MCP_TIMEOUT: "network_error",
+}
+
+
 def _error_type_mapping(code: ErrorCode) -> str:
-    if code in (ErrorCode.MCP_PARAM_ERROR, ErrorCode.INVALID_PARAM):
-        return "param_error"
-    if code in (ErrorCode.MCP_PARSE_ERROR,):
-        return "parse_error"
-    if code in (ErrorCode.MCP_NETWORK_ERROR, ErrorCode.MCP_TIMEOUT):
-        return "network_error"
-    return "execution_error"
+    return _ERROR_TYPE_MAP.get(code, "execution_error")
+
+
+# 按内容项类型缓存字段读取方式：dict 走 dict.get，其余对象走 getattr（缺失返回 None）。
+# 同一结果中的内容项类型通常相同，每项只需一次字典查找即可确定读取方式
+_FIELD_GETTERS: dict[type, Callable[[Any, str], Any]] = {}
+_MISSING = object()
+
 
+def _get_attr(item: Any, name: str) -> Any:
+    return getattr(item, name, None)
 
-def _extract_text_blocks(result: Any) -> list[str]:
+
+def _getter_for(item: Any) -> Callable[[Any, str], Any]:
+    cls = type(item)
+    getter = _FIELD_GETTERS.get(cls)
+    if getter is None:
+        getter = dict.get if issubclass(cls, dict) else _get_attr
+        _FIELD_GETTERS[cls] = getter
+    return getter
+
+
+def _extract_content(result: Any) -> tuple[list[str], list[str]]:
+    """Walk result.content once, collecting text blocks and non-text summaries.
+
+    Summaries are only used when there is no text at all, so they stop being
+    collected as soon as the first text block is found.
+    """
     texts: list[str] = []
+    summaries: list[str] = []
     contents = getattr(result, "content", None) or []
     for item in contents:
-        text = None
-        if hasattr(item, "text"):
-            text = getattr(item, "text")
-        elif isinstance(item, dict):
-            text = item.get("text")
+        get = _getter_for(item)
+        text = get(item, "text")
         if text:
             texts.append(str(text))
             continue
-        resource = None
-        if hasattr(item, "resource"):
-            resource = getattr(item, "resource")
-        elif isinstance(item, dict):
-            resource = item.get("resource")
+        resource = get(item, "resource")
         if resource is not None:
-            res_text = None
-            if hasattr(resource, "text"):
-                res_text = getattr(resource, "text")
-            elif isinstance(resource, dict):
-                res_text = resource.get("text")
+            res_text = _getter_for(resource)(resource, "text")
             if res_text:
                 texts.append(str(res_text))
-    return texts
+                continue
+        if not texts:
+            summary = _describe_content_item(item)
+            if summary:
+                summaries.append(summary)
+    return texts, summaries
 
 
 def _describe_content_item(item: Any) -> str | None:
-    mime_type = None
-    data = None
-    if hasattr(item, "mimeType"):
-        mime_type = getattr(item, "mimeType")
-        data = getattr(item, "data", None)
-    elif isinstance(item, dict):
-        mime_type = item.get("mimeType") or item.get("mime_type")
-        data = item.get("data")
+    get = _getter_for(item)
+    is_dict = get is dict.get
+    mime_type = get(item, "mimeType")
+    if not mime_type and is_dict:
+        mime_type = item.get("mime_type")
     if mime_type:
+        data = get(item, "data")
         size = None
         try:
             size = len(data) if data is not None else None
@@ -66,83 +86,71 @@ def _describe_content_item(item: Any) -> str | None:
             return f"[binary content {mime_type}, {size} bytes]"
         return f"[binary content {mime_type}]"
 
-    resource = None
-    if hasattr(item, "resource"):
-        resource = getattr(item, "resource")
-    elif isinstance(item, dict):
-        resource = item.get("resource")
+    resource = get(item, "resource")
     if resource is not None:
-        uri = None
-        if hasattr(resource, "uri"):
-            uri = getattr(resource, "uri")
-        elif isinstance(resource, dict):
-            uri = resource.get("uri")
+        uri = _getter_for(resource)(resource, "uri")
         if uri:
             return f"[resource {uri}]"
         return "[resource content]"
 
-    if isinstance(item, dict):
+    if is_dict:
         kind = item.get("type")
         if kind:
             return f"[{kind} content]"
     return None
 
 
-def _summarize_non_text(result: Any) -> list[str]:
-    contents = getattr(result, "content", None) or []
-    summaries: list[str] = []
-    for item in contents:
-        summary = _describe_content_item(item)
-        if summary:
-            summaries.append(summary)
-    return summaries
+def _elapsed_ms(start_time: int | float) -> int:
+    """Milliseconds since start_time.
+
+    start_time is normally time.monotonic_ns(); a float from time.monotonic()
+    is still accepted for older callers.
+    """
+    if isinstance(start_time, int):
+        return (time.monotonic_ns() - start_time) // 1_000_000
+    return int((time.monotonic() - start_time) * 1000)
+
+
+def _context(params_input: dict[str, Any], tool_name: str) -> dict[str, Any]:
+    return {"cwd": ".", "params_input": params_input, "mcp_tool": tool_name}
 
 
 def _get_structured_content(result: Any) -> Any:
-    if hasattr(result, "structuredContent"):
-        return getattr(result, "structuredContent")
-    if hasattr(result, "structured_content"):
-        return getattr(result, "structured_content")
     if isinstance(result, dict):
         return result.get("structuredContent") or result.get("structured_content")
-    return None
+    value = getattr(result, "structuredContent", _MISSING)
+    if value is _MISSING:
+        value = getattr(result, "structured_content", None)
+    return value
 
 
 def to_protocol_success(
     result: Any,
     params_input: dict[str, Any],
     tool_name: str,
-    start_time: float,
+    start_time: int | float,
+    pretty: bool = False,
 ) -> str:
     structured = _get_structured_content(result)
-    text_blocks = _extract_text_blocks(result)
-    if text_blocks:
-        text = "\n".join(text_blocks)
-    else:
-        summaries = _summarize_non_text(result)
-        text = "\n".join(summaries) if summaries else ""
+    text_blocks, summaries = _extract_content(result)
+    text = "\n".join(text_blocks) if text_blocks else "\n".join(summaries)
 
     data = {
         "structured": structured,
         "text": text,
     }
 
-    time_ms = int((time.monotonic() - start_time) * 1000)
+    time_ms = _elapsed_ms(start_time)
 
-    return json.dumps(
+    return fast_json.dumps(
         {
             "status": ToolStatus.SUCCESS.value,
+            # 文本只放在 data.text 中，避免大结果在输出里出现两份
             "data": data,
-            "text": text,
             "stats": {"time_ms": time_ms},
-            "context": {
-                "cwd": ".",
-                "params_input": params_input,
-                "mcp_tool": tool_name,
-            },
+            "context": _context(params_input, tool_name),
         },
-        ensure_ascii=False,
-        indent=2,
+        indent=pretty,
     )
 
 
@@ -150,15 +158,16 @@ def to_protocol_error(
     message: str,
     params_input: dict[str, Any],
     tool_name: str,
-    start_time: float,
+    start_time: int | float,
     error_code: ErrorCode = ErrorCode.MCP_EXECUTION_ERROR,
+    pretty: bool = False,
 ) -> str:
     if not message:
         message = "MCP execution error"
-    time_ms = int((time.monotonic() - start_time) * 1000)
+    time_ms = _elapsed_ms(start_time)
     if not isinstance(error_code, ErrorCode):
         error_code = ErrorCode.MCP_EXECUTION_ERROR
-    return json.dumps(
+    return fast_json.dumps(
         {
             "status": ToolStatus.ERROR.value,
             "data": {},
@@ -169,14 +178,9 @@ def to_protocol_error(
                 "type": _error_type_mapping(error_code),
             },
             "stats": {"time_ms": time_ms},
-            "context": {
-                "cwd": ".",
-                "params_input": params_input,
-                "mcp_tool": tool_name,
-            },
+            "context": _context(params_input, tool_name),
         },
-        ensure_ascii=False,
-        indent=2,
+        indent=pretty,
     )
 
 
@@ -184,7 +188,7 @@ def to_protocol_invalid_param(
     message: str,
     params_input: dict[str, Any],
     tool_name: str,
-    start_time: float,
+    start_time: int | float,
 ) -> str:
     if not message:
         message = "Invalid parameters"
@@ -201,18 +205,14 @@ def to_protocol_result(
     result: Any,
     params_input: dict[str, Any],
     tool_name: str,
-    start_time: float,
+    start_time: int | float,
 ) -> str:
-    is_error = False
-    if hasattr(result, "isError"):
-        is_error = bool(getattr(result, "isError"))
-    elif isinstance(result, dict):
-        is_error = bool(result.get("isError"))
+    is_error = bool(_getter_for(result)(result, "isError"))
 
     if not is_error:
         return to_protocol_success(result, params_input, tool_name, start_time)
 
-    text_blocks = _extract_text_blocks(result)
+    text_blocks, _ = _extract_content(result)
     message = "\n".join(text_blocks) if text_blocks else "MCP tool returned error"
     return to_protocol_error(
         message,
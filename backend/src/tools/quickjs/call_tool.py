@@ -3,11 +3,9 @@
 提供 callTool 函数，允许从 JavaScript 调用系统注册的工具。
 """
 
-import json
-from typing import Any, Dict
-
 from src.tools.registry import get_registry
-from src.utils.tool_args_utils import fill_default_args
+from src.utils import fast_json
+from src.utils.tool_args_utils import fill_default_args, get_tool_parameters
 
 
 def apply(ctx):
@@ -16,7 +14,7 @@ def apply(ctx):
     Args:
         ctx: QuickJS 上下文
     """
-    def _call_tool(tool_name: str, args_json: str) -> Dict[str, Any]:
+    def _call_tool(tool_name: str, args_json: str) -> str:
         """从 JavaScript 调用系统工具。
 
         Args:
@@ -24,54 +22,50 @@ def apply(ctx):
             args_json: 工具参数的 JSON 字符串
 
         Returns:
-            JSON 格式的工具执行结果
-
-        Raises:
-            ValueError: 工具不存在或参数错误
+            JSON 格式的工具执行结果（错误时为包含 error 字段的 JSON）
         """
         registry = get_registry()
 
         # 检查工具是否存在
         tool = registry.get(tool_name)
-        
+
         if tool is None:
             available = registry.list_all()
             # 返回包含详细错误信息的 JSON
-            return {
+            return fast_json.dumps({
                 "error": "ToolNotFound",
                 "tool": tool_name,
                 "message": f"Tool '{tool_name}' not found",
                 "available": available
-            }
+            })
 
         # 解析 JSON 字符串
         try:
-            args = json.loads(args_json) if args_json else {}
+            args = fast_json.loads(args_json) if args_json else {}
 
-        except json.JSONDecodeError as e:
-            return {
+        except ValueError as e:
+            return fast_json.dumps({
                 "error": "InvalidArgs",
                 "tool": tool_name,
                 "message": f"Invalid JSON arguments: {str(e)}"
-            }
+            })
 
         # 获取工具 schema 并填充默认值
-        tool_schema = tool.get_parameters() 
-        args = fill_default_args(tool_schema, args)
+        args = fill_default_args(get_tool_parameters(tool), args)
 
         # 执行工具
         try:
             result = tool.invoke(**args)
-            return result
+            return fast_json.dumps(result)
         except Exception as e:
-            return {
+            return fast_json.dumps({
                 "error": "ToolError",
                 "tool": tool_name,
                 "message": str(e)
-            }
+            })
 
-    # 注册函数（用 lambda 包装，返回 JSON 字符串）
-    ctx.add_callable("_callTool", lambda name, args: json.dumps(_call_tool(name, args), ensure_ascii=False))
+    # 注册函数（直接返回 JSON 字符串，由 JS 端解析一次）
+    ctx.add_callable("_callTool", _call_tool)
 
     # 定义 JS 辅助函数（自动 stringify 并 parse 结果）
     ctx.eval("""
@@ -4,7 +4,18 @@
 实现双向数据绑定。
 """
 
-from typing import Any, Dict, List, Optional
+import itertools
+import threading
+import weakref
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import quickjs  # pyright: ignore[reportImplicitRelativeImport]
+
+from src.utils import fast_json
+
+# 无需转换的基本类型（按精确类型判断）
+SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
 
 
 class DictProxy:
@@ -14,6 +25,10 @@ class DictProxy:
     从而实现 JS 对 Python dict 的修改能够同步回原始对象。
     """
 
+    # 嵌套结构会产生大量实例，使用 __slots__ 省去每个实例的 __dict__；
+    # 子代理缓存使用弱引用，因此保留 __weakref__
+    __slots__ = ("_data", "_obj_id", "_children_cache", "__weakref__")
+
     def __init__(self, data: dict, obj_id: str = None):
         """初始化代理。
 
@@ -23,8 +38,12 @@ class DictProxy:
         """
         self._data = data
         self._obj_id = obj_id or f"dict_{id(data)}"
-        # 缓存子代理，避免重复创建
-        self._children_cache: dict = {}
+        # 缓存子代理，避免重复创建（id(子 dict/list) -> 代理）。
+        # 只弱引用代理：代理不再被使用时条目自动移除，不会长期持有访问过的子对象；
+        # 代理存活期间其包装的对象也存活，id 不会被复用
+        self._children_cache: "weakref.WeakValueDictionary[int, Union[DictProxy, LazyListProxy]]" = (
+            weakref.WeakValueDictionary()
+        )
 
     def get(self, key: str) -> Any:
         """获取属性值。
@@ -35,15 +54,7 @@ class DictProxy:
         Returns:
             属性值，如果是 dict 会递归包装为 DictProxy
         """
-        value = self._data.get(key)
-        # 使用 id(value) 作为缓存键，确保同一对象返回相同代理
-        cache_key = id(value) if isinstance(value, (dict, list)) else key
-        if cache_key in self._children_cache:
-            return self._children_cache[cache_key]
-        result = self._wrap_value(value)
-        if cache_key != key:
-            self._children_cache[cache_key] = result
-        return result
+        return self._wrap_value(self._data.get(key))
 
     def set(self, key: str, value: Any) -> None:
         """设置属性值。
@@ -107,16 +118,31 @@ class DictProxy:
             value: Python 值
 
         Returns:
-            包装后的值，dict 会转为 DictProxy
+            包装后的值，dict 会转为 DictProxy，list 会转为按需包装元素的 LazyListProxy
         """
-        if isinstance(value, dict):
-            # 使用唯一 ID 生成子代理 ID，避免键名冲突
-            child_id = f"{self._obj_id}.child_{id(value)}"
-            return DictProxy(value, child_id)
-        if isinstance(value, list):
-            return [self._wrap_value(item) for item in value]
+        if isinstance(value, (dict, list)):
+            return self._child_proxy(value)
         return value
 
+    def _child_proxy(self, value: Union[dict, list]) -> Union["DictProxy", "LazyListProxy"]:
+        """获取子 dict/list 的代理，同一对象始终返回同一代理。
+
+        Args:
+            value: 子 dict 或 list
+
+        Returns:
+            dict 对应 DictProxy，list 对应 LazyListProxy
+        """
+        proxy = self._children_cache.get(id(value))
+        if proxy is None or proxy._data is not value:
+            if isinstance(value, dict):
+                # 使用唯一 ID 生成子代理 ID，避免键名冲突
+                proxy = DictProxy(value, f"{self._obj_id}.child_{id(value)}")
+            else:
+                proxy = LazyListProxy(value, self)
+            self._children_cache[id(value)] = proxy
+        return proxy
+
     def _unwrap_value(self, value: Any) -> Any:
         """将 JS 传入的值转换为 Python 对象。
 
@@ -126,6 +152,13 @@ class DictProxy:
         Returns:
             转换后的 Python 对象
         """
+        # JS 写入的多为基本类型，直接返回
+        if type(value) in SCALAR_TYPES:
+            return value
+        if isinstance(value, quickjs.Object):
+            # JS 对象/数组（含嵌套代理）经 JSON 转为 Python 值；函数等无法序列化的值记为 None
+            text = value.json()
+            return fast_json.loads(text) if text is not None else None
         if isinstance(value, DictProxy):
             return value.to_dict()
         if isinstance(value, dict):
@@ -140,13 +173,73 @@ class DictProxy:
         return value
 
 
+class LazyListProxy(Sequence):
+    """list 的只读代理，访问元素时才包装。
+
+    大列表只读取少数元素时，无需为每个元素预先创建代理。
+    """
+
+    __slots__ = ("_data", "_owner", "__weakref__")
+
+    def __init__(self, data: list, owner: DictProxy):
+        """初始化代理。
+
+        Args:
+            data: 要代理的 Python list
+            owner: 所属的 DictProxy，元素通过它包装（复用其子代理缓存）
+        """
+        self._data = data
+        self._owner = owner
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._owner._wrap_value(item) for item in self._data[index]]
+        return self._owner._wrap_value(self._data[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        wrap = self._owner._wrap_value
+        for item in self._data:
+            yield wrap(item)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyListProxy):
+            return self._data == other._data
+        if isinstance(other, list):
+            return self._data == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def to_list(self) -> list:
+        """返回原始 list 引用。"""
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"LazyListProxy({self._data!r})"
+
+
 class DictProxyManager:
-    """管理多个 DictProxy 实例的生命周期。"""
+    """管理多个 DictProxy 实例的生命周期。
+
+    写操作（create/release）加锁；读操作（get/get_by_dict）不加锁，
+    依赖 dict 单次查找在 GIL 下的原子性。锁内只做映射更新，
+    代理构造与 ID 分配都在锁外完成，缩短持锁时间。
+    """
+
+    __slots__ = ("_proxies", "_reverse_ref", "_lock", "_next_id")
 
     def __init__(self):
         """初始化管理器。"""
         self._proxies: Dict[str, DictProxy] = {}
-        self._reverse_ref: Dict[int, str] = {}  # id(py_dict) -> obj_id
+        # id(py_dict) -> 代理，反查时只需一次查找
+        self._reverse_ref: Dict[int, DictProxy] = {}
+        self._lock = threading.Lock()
+        # 未命名代理的自增编号；按当前数量编号在释放后会与仍存活的 ID 重复。
+        # itertools.count 的 next() 在 GIL 下是原子的，无需加锁
+        self._next_id = itertools.count()
 
     def create(self, py_dict: dict, name: str = None) -> str:
         """创建新的代理。
@@ -158,12 +251,48 @@ class DictProxyManager:
         Returns:
             代理的 obj_id
         """
-        obj_id = name or f"dict_{len(self._proxies)}"
+        obj_id = name or f"dict_{next(self._next_id)}"
         proxy = DictProxy(py_dict, obj_id)
-        self._proxies[obj_id] = proxy
-        self._reverse_ref[id(py_dict)] = obj_id
+        with self._lock:
+            self._proxies[obj_id] = proxy
+            self._reverse_ref[id(py_dict)] = proxy
         return obj_id
 
+    def register(self, proxy: DictProxy) -> str:
+        """登记已有的代理实例（如嵌套访问时产生的子代理），不复制其数据。
+
+        重复登记同一实例不产生副作用；obj_id 已被占用时保留原有代理。
+
+        Args:
+            proxy: 要登记的 DictProxy
+
+        Returns:
+            代理的 obj_id
+        """
+        obj_id = proxy.obj_id
+        if obj_id not in self._proxies:
+            with self._lock:
+                if obj_id not in self._proxies:
+                    self._proxies[obj_id] = proxy
+                    self._reverse_ref.setdefault(id(proxy.to_dict()), proxy)
+        return obj_id
+
+    def register_many(self, proxies: Iterable[DictProxy]) -> None:
+        """批量登记已有的代理实例，只加一次锁。
+
+        与 register 相同，已登记的 obj_id 保留原有代理。
+
+        Args:
+            proxies: 要登记的 DictProxy 序列
+        """
+        new_proxies = [proxy for proxy in proxies if proxy.obj_id not in self._proxies]
+        if not new_proxies:
+            return
+        with self._lock:
+            for proxy in new_proxies:
+                if self._proxies.setdefault(proxy.obj_id, proxy) is proxy:
+                    self._reverse_ref.setdefault(id(proxy.to_dict()), proxy)
+
     def get(self, obj_id: str) -> Optional[DictProxy]:
         """获取代理实例。
 
@@ -184,8 +313,11 @@ class DictProxyManager:
         Returns:
             DictProxy 实例，不存在返回 None
         """
-        obj_id = self._reverse_ref.get(id(py_dict))
-        return self._proxies.get(obj_id) if obj_id else None
+        proxy = self._reverse_ref.get(id(py_dict))
+        # 原 dict 被回收后 id 可能被复用，需确认仍是同一对象
+        if proxy is not None and proxy.to_dict() is py_dict:
+            return proxy
+        return None
 
     def release(self, obj_id: str) -> bool:
         """释放代理。
@@ -196,20 +328,24 @@ class DictProxyManager:
         Returns:
             是否成功释放
         """
-        if obj_id in self._proxies:
-            proxy = self._proxies[obj_id]
-            # 移除反向引用
+        with self._lock:
+            proxy = self._proxies.pop(obj_id, None)
+            if proxy is None:
+                return False
+            # 移除反向引用（仅当仍指向该代理时）
             dict_id = id(proxy.to_dict())
-            if dict_id in self._reverse_ref:
+            if self._reverse_ref.get(dict_id) is proxy:
                 del self._reverse_ref[dict_id]
-            del self._proxies[obj_id]
             return True
-        return False
 
     def clear(self) -> None:
-        """清空所有代理。"""
-        self._proxies.clear()
-        self._reverse_ref.clear()
+        """清空所有代理。
+
+        以新 dict 整体替换，并发读取者看到的要么是旧映射，要么是空映射。
+        """
+        with self._lock:
+            self._proxies = {}
+            self._reverse_ref = {}
 
     def list_ids(self) -> List[str]:
         """列出所有代理 ID。"""
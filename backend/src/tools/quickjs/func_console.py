@@ -4,10 +4,26 @@
 支持通过 stream_writer_util 实时推送日志到前端。
 """
 
+import inspect
 import time
+from typing import Any, Callable, Dict
 
+import quickjs  # pyright: ignore[reportImplicitRelativeImport]
+
+from src.utils import fast_json
 from src.utils.stream_writer_util import send_queue, task_context
 
+# 不同版本的 quickjs 绑定中 Object.json 可能是属性或方法，导入时判断一次，
+# 避免每个结果都检查 callable
+if isinstance(inspect.getattr_static(quickjs.Object, "json", None), property):
+    def object_json(value: "quickjs.Object") -> str:
+        """获取 quickjs.Object 的 JSON 字符串。"""
+        return value.json
+else:
+    def object_json(value: "quickjs.Object") -> str:
+        """获取 quickjs.Object 的 JSON 字符串。"""
+        return value.json()
+
 
 def apply(ctx, tool_name: str = None):
     """应用控制台函数注册到 QuickJS 上下文。
@@ -17,30 +33,40 @@ def apply(ctx, tool_name: str = None):
         console_output_ref: 控制台输出列表的引用
         tool_name: 工具名称（用于日志推送），如果为 None 则从 ctx.globals 获取
     """
-    # 从 context 中获取 tool_name，避免线程安全问题
-    if tool_name is None:
+    def _current_tool_name() -> str:
+        """获取当前执行的工具名称。
+
+        未显式指定时，在每次输出时从 context 的 _tool_name 读取，
+        因此同一 Context 只需注册一次即可在多次执行间复用。
+        """
+        if tool_name is not None:
+            return tool_name
         try:
-            tool_name = ctx.get("_tool_name")
-            if tool_name is None:
-                tool_name = "quickjs"
+            name = ctx.get("_tool_name")
+            return name if name is not None else "quickjs"
         except Exception:
-            tool_name = "quickjs"
+            return "quickjs"
+
     def _send_console_log(level: str, *args):
-        """发送控制台日志到流和本地列表。"""
-        # 转换参数为字符串
-        output = " ".join(_js_value_to_string(arg) for arg in args)
-        timestamp = time.time()
+        """发送控制台日志到流和本地列表。
+
+        Context 会跨任务、跨线程复用，因此每次输出时读取当前任务的 stream_writer；
+        没有 writer 时直接返回，不再转换参数。
+        """
+        context = task_context.get()
+        if not context or context.get("stream_writer") is None:
+            return
 
         # 通过 stream_writer 推送到前端（SSE）
         try:
-            context = task_context.get()
-            if context and context.get("stream_writer") is not None:
-                send_queue({
-                    "type": level,
-                    "tool_name": tool_name,
-                    "message": output,
-                    "timestamp": timestamp
-                }, "console")
+            # 转换参数为字符串
+            output = " ".join(_js_value_to_string(arg) for arg in args)
+            send_queue({
+                "type": level,
+                "tool_name": _current_tool_name(),
+                "message": output,
+                "timestamp": time.time()
+            }, "console")
         except Exception:
             # 如果推送失败，静默处理，不影响 JS 执行
             pass
@@ -100,36 +126,49 @@ def apply(ctx, tool_name: str = None):
     """)
 
 
-def _js_value_to_string(value):
-    """将 JS 值转换为字符串。"""
-    import quickjs
-    import json
+def _object_to_string(value) -> str:
+    """将 quickjs.Object（含 Proxy）转换为格式化的 JSON 字符串。"""
+    try:
+        # 尝试调用 toJSON 方法将 Proxy 转换为普通对象
+        try:
+            to_json = value.get("toJSON")
+            if to_json:
+                json_obj = to_json()
+                return fast_json.dumps(json_obj, indent=True)
+        except Exception:
+            pass
+
+        # 格式化为 JSON 字符串
+        return fast_json.dumps(fast_json.loads(object_json(value)), indent=True)
+    except Exception:
+        return f"[Object]"
 
-    if value is None:
-        return "null"
-    elif isinstance(value, bool):
+
+# 按精确类型分派（bool 需单独处理，不能落入 int）
+_HANDLERS: Dict[type, Callable[[Any], str]] = {
+    type(None): lambda _: "null",
+    bool: lambda v: "true" if v else "false",
+    int: str,
+    float: str,
+    str: lambda v: v,
+    quickjs.Object: _object_to_string,
+}
+
+
+def _fallback(value) -> str:
+    """未精确命中类型表时的转换（子类及其他类型）。"""
+    if isinstance(value, bool):
         return str(value).lower()
     elif isinstance(value, (int, float)):
         return str(value)
     elif isinstance(value, str):
         return value
     elif isinstance(value, quickjs.Object):
-        try:
-            # 尝试调用 toJSON 方法将 Proxy 转换为普通对象
-            try:
-                to_json = value.get("toJSON")
-                if to_json:
-                    json_obj = to_json()
-                    return json.dumps(json_obj, ensure_ascii=False, indent=2)
-            except Exception:
-                pass
-
-            json_str = value.json
-            if callable(json_str):
-                json_str = json_str()
-            # 格式化为 JSON 字符串
-            return json.dumps(json.loads(json_str), ensure_ascii=False, indent=2)
-        except Exception:
-            return f"[Object]"
+        return _object_to_string(value)
     else:
         return str(value)
+
+
+def _js_value_to_string(value):
+    """将 JS 值转换为字符串。"""
+    return _HANDLERS.get(type(value), _fallback)(value)
@@ -2,16 +2,223 @@
 
 执行 JavaScript 代码并返回结果。
 """
-import json
+import asyncio
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import cached_property, lru_cache
 from typing import Any, Dict, List, Optional
 
 import quickjs  # pyright: ignore[reportImplicitRelativeImport]
 
 from src.tools.base import BaseTool
+from src.utils import fast_json
 from src.tools.quickjs.func_console import apply as apply_console
 from src.tools.quickjs.call_tool import apply as apply_call_tool
 from src.tools.quickjs.sse_push import apply as apply_sse_push
-from src.tools.quickjs.dict_proxy import DictProxy, DictProxyManager
+from src.tools.quickjs.dict_proxy import SCALAR_TYPES, DictProxy, DictProxyManager, LazyListProxy
+
+# 路径不存在
+_MISSING = object()
+
+# 暴露到 JS 的变量名必须是合法标识符
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# 只读 context 直接复制到 JS 的元素数上限（键数 + 列表元素数）
+_SHALLOW_CONTEXT_MAX_ITEMS = 64
+
+
+def _is_shallow_json(data: dict) -> bool:
+    """判断 dict 是否为小而扁平的 JSON 数据：值只含基本类型或基本类型列表。"""
+    size = len(data)
+    for value in data.values():
+        if type(value) in SCALAR_TYPES:
+            continue
+        if type(value) is not list:
+            return False
+        size += len(value)
+        if any(type(item) not in SCALAR_TYPES for item in value):
+            return False
+    return size <= _SHALLOW_CONTEXT_MAX_ITEMS
+
+# JS 端 dict 代理工厂：每个代理只记录根对象 ID 与键路径。
+# 读取走根 dict 的 JSON 快照（首次读取时经 _dictSnapshot 回调取得，之后在 JS 内缓存），
+# 写入/删除经回调同步到 Python 并就地更新快照；_dictGen 变化（每次执行前递增）时快照失效
+_DICT_PROXY_JS = """
+var _dictGen = 0;
+var _dictCaches = {};
+
+function _dictIsObject(value) {
+    return value !== null && typeof value === 'object' && !Array.isArray(value);
+}
+
+function _dictHasOwn(node, prop) {
+    return _dictIsObject(node) && Object.prototype.hasOwnProperty.call(node, prop);
+}
+
+function _dictNode(rootId, path) {
+    var entry = _dictCaches[rootId];
+    if (!entry || entry.gen !== _dictGen) {
+        entry = _dictCaches[rootId] = {gen: _dictGen, data: JSON.parse(_dictSnapshot(rootId))};
+    }
+    var node = entry.data;
+    for (var i = 0; i < path.length; i++) {
+        if (node === null || typeof node !== 'object') return undefined;
+        node = node[path[i]];
+    }
+    return node;
+}
+
+function _makeDictProxy(rootId, path) {
+    path = path || [];
+    var pathJson = JSON.stringify(path);
+    // get 与 getOwnPropertyDescriptor 共用的取值逻辑
+    var readProp = function(prop) {
+        if (prop === '__objId__') return rootId;
+        if (prop === '_isProxy') return true;
+        if (typeof prop === 'symbol') return undefined;
+        var node = _dictNode(rootId, path);
+        if (!_dictHasOwn(node, prop)) return null;
+        var value = node[prop];
+        var childPath = path.concat([prop]);
+        if (Array.isArray(value)) {
+            return value.map(function(item, index) {
+                if (_dictIsObject(item)) {
+                    return _makeDictProxy(rootId, childPath.concat([index]));
+                }
+                // 嵌套数组返回副本，修改不会影响快照
+                return Array.isArray(item) ? JSON.parse(JSON.stringify(item)) : item;
+            });
+        }
+        if (_dictIsObject(value)) {
+            return _makeDictProxy(rootId, childPath);
+        }
+        return value;
+    };
+    return new Proxy({}, {
+        get: function(target, prop) {
+            return readProp(prop);
+        },
+        set: function(target, prop, value) {
+            _dictSet(rootId, pathJson, prop, value);
+            var node = _dictNode(rootId, path);
+            if (_dictIsObject(node) && (value === null || typeof value !== 'object')) {
+                node[prop] = value;
+            } else {
+                // 对象值由 Python 端转换，下次读取时重新取快照
+                delete _dictCaches[rootId];
+            }
+            return true;
+        },
+        has: function(target, prop) {
+            return _dictHasOwn(_dictNode(rootId, path), prop);
+        },
+        deleteProperty: function(target, prop) {
+            var deleted = _dictDelete(rootId, pathJson, prop);
+            if (deleted) {
+                var node = _dictNode(rootId, path);
+                if (_dictIsObject(node)) delete node[prop];
+            }
+            return deleted;
+        },
+        ownKeys: function(target) {
+            var node = _dictNode(rootId, path);
+            return _dictIsObject(node) ? Object.keys(node) : [];
+        },
+        getOwnPropertyDescriptor: function(target, prop) {
+            return {
+                enumerable: true,
+                configurable: true,
+                value: readProp(prop)
+            };
+        }
+    });
+}
+
+function _exposeDict(name, rootId, gen) {
+    _dictGen = gen;
+    globalThis[name] = _makeDictProxy(rootId);
+}
+
+// 每次执行前调用：一次回调同时使旧快照失效并写入当前工具名
+function _beginInvoke(gen, toolName) {
+    _dictGen = gen;
+    globalThis._tool_name = toolName;
+}
+
+function _releaseGlobal(name) {
+    delete globalThis[name];
+}
+
+function _setGlobalJson(name, json) {
+    globalThis[name] = JSON.parse(json);
+}
+"""
+
+# 清理用户脚本新增的全局变量：引导脚本执行完后记录当时已有的全局属性，
+# 之后只删除不在其中、且可删除的属性
+_SCRUB_GLOBALS_JS = """
+var _scrubGlobals = (function() {
+    var base = new Set(Object.getOwnPropertyNames(globalThis));
+    base.add('_scrubGlobals');
+    return function() {
+        Object.getOwnPropertyNames(globalThis).forEach(function(key) {
+            if (!base.has(key)) {
+                try { delete globalThis[key]; } catch (e) {}
+            }
+        });
+    };
+})();
+"""
+
+# 结果值的 Python 类型 -> JS 类型名（按精确类型查表，bool 不会落入 int）
+_PY_TYPE_TO_JS: Dict[type, str] = {
+    bool: "boolean",
+    int: "number",
+    float: "number",
+    str: "string",
+    type(None): "null",
+    list: "array",
+    dict: "object",
+}
+
+# 完整单词 return，避免 returnValue 之类的标识符触发不必要的函数包装；
+# 字符串字面量与注释优先匹配，其中出现的 return 不算
+_RETURN_RE = re.compile(
+    r"'(?:\\.|[^'\\\n])*'"
+    r'|"(?:\\.|[^"\\\n])*"'
+    r"|`(?:\\.|[^`\\])*`"
+    r"|//[^\n]*"
+    r"|/\*.*?\*/"
+    r"|\breturn\b",
+    re.DOTALL,
+)
+
+
+@lru_cache(maxsize=1024)
+def has_return(code: str) -> bool:
+    """代码中是否出现 return 关键字（此类代码会被包装为立即执行函数）。
+
+    字符串与注释中的 return 会被跳过。
+    """
+    return any(match.group() == "return" for match in _RETURN_RE.finditer(code))
+
+
+@lru_cache(maxsize=1024)
+def _wrap_code_cached(code: str) -> str:
+    """包装代码以支持 return 语句，按代码字符串缓存结果。"""
+    if has_return(code):
+        # 判断是否已经是 IIFE 包装：以 ( 开头且以 )() 结尾
+        stripped = code.strip()
+        if stripped.startswith('(') and stripped.endswith(')()'):
+            return code
+        # 包装在立即执行函数中
+        return f'(function(){{\n{code}\n}})()'
+    return code
+
+# 每个 Context 最多缓存的已编译脚本数
+_COMPILED_CACHE_SIZE = 256
 
 
 class QuickJSTool(BaseTool):
@@ -24,8 +231,36 @@ class QuickJSTool(BaseTool):
             description="Execute JavaScript code and return the result",
         )
         self._context: quickjs.Context | None = None
-        self._proxy_manager: DictProxyManager = DictProxyManager()
         self._dict_proxy_setup: bool = False
+        # JS 端暴露 dict 的函数句柄，expose_dict 直接调用，无需再解析脚本
+        self._expose_dict_js: Optional[quickjs.Object] = None
+        # 执行前准备的函数句柄，invoke 每次只需一次调用
+        self._begin_invoke: Optional[quickjs.Object] = None
+        # 删除全局变量的函数句柄，release_dict 直接调用
+        self._release_global: Optional[quickjs.Object] = None
+        # 以 JSON 设置全局变量的函数句柄，只读 context 走此路径
+        self._set_global_json: Optional[quickjs.Object] = None
+        # dict 快照版本号，变化后 JS 端缓存的快照失效
+        self._dict_gen: int = 0
+        # JS 全局变量 "context" 是否仍留有上次执行的值（延迟到不带 context 的执行时才删除）
+        self._context_installed: bool = False
+        # 包装后代码 -> 已编译的 JS 函数（LRU），重复执行同一脚本时跳过解析
+        self._compiled: "OrderedDict[str, quickjs.Object]" = OrderedDict()
+        self._console_setup: bool = False
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        """ainvoke 专用的单线程执行器。
+
+        QuickJS Context 与创建它的线程栈绑定，换线程执行会误报栈溢出，
+        因此异步调用始终在同一个工作线程中创建并使用 Context。
+        """
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="quickjs_")
+
+    @cached_property
+    def _proxy_manager(self) -> DictProxyManager:
+        """dict 代理管理器，首次暴露 dict 时才创建。"""
+        return DictProxyManager()
 
     def _get_context(self) -> quickjs.Context:
         """获取或创建 JS 上下文。"""
@@ -37,88 +272,61 @@ class QuickJSTool(BaseTool):
         return self._context
 
     def _setup_dict_proxy(self) -> None:
-        """设置 dict 代理的回调函数。"""
+        """设置 dict 代理的回调函数与 JS 端代理工厂。"""
         ctx = self._context
         if ctx is None:
             return
 
-        # 注册 dict 操作回调
-        ctx.add_callable("_dictGet", self._js_dict_get)
+        # 注册 dict 操作回调：读取取整体快照，写入/删除按根对象 ID + 键路径访问
+        ctx.add_callable("_dictSnapshot", self._js_dict_snapshot)
         ctx.add_callable("_dictSet", self._js_dict_set)
-        ctx.add_callable("_dictHas", self._js_dict_has)
-        ctx.add_callable("_dictKeys", self._js_dict_keys)
         ctx.add_callable("_dictDelete", self._js_dict_delete)
-        ctx.add_callable("_createNestedProxy", self._js_create_nested_proxy)
+        ctx.eval(_DICT_PROXY_JS)
+        self._expose_dict_js = ctx.get("_exposeDict")
+        self._begin_invoke = ctx.get("_beginInvoke")
+        self._release_global = ctx.get("_releaseGlobal")
+        self._set_global_json = ctx.get("_setGlobalJson")
 
         self._dict_proxy_setup = True
 
-    def _js_dict_get(self, obj_id: str, key: str) -> Any:
-        """JS 端 getter 回调。"""
+    def _resolve_path(self, obj_id: str, path_json: str) -> Any:
+        """从根 dict 出发按键路径取值，路径无效时返回 _MISSING。"""
         proxy = self._proxy_manager.get(obj_id)
         if not proxy:
-            return None
-        value = proxy.get(key)
-        # 如果返回的是 DictProxy，需要将其注册到 manager 中
-        if isinstance(value, DictProxy):
-            # 直接使用原有的 DictProxy 对象注册到 manager
-            if not self._proxy_manager.get(value.obj_id):
-                self._proxy_manager._proxies[value.obj_id] = value
-            # 返回特殊标记格式
-            return f"__PROXY:{value.obj_id}__"
-        if isinstance(value, list):
-            # 列表中的嵌套 dict 需要特殊处理
-            # 注意：由于 quickjs add_callable 无法直接返回 JS 数组，
-            # 我们返回 JSON 字符串，JS 端需要解析
-            import json as pyjson
-            result = []
-            for item in value:
-                if isinstance(item, DictProxy):
-                    # 直接使用原有的 DictProxy 对象
-                    if not self._proxy_manager.get(item.obj_id):
-                        self._proxy_manager._proxies[item.obj_id] = item
-                    result.append({"__proxy": item.obj_id})
-                else:
-                    result.append(item)
-            return pyjson.dumps(result)
-        return value
+            return _MISSING
+        node: Any = proxy.to_dict()
+        for key in fast_json.loads(path_json):
+            if isinstance(node, dict):
+                node = node.get(key, _MISSING)
+            elif isinstance(node, list) and isinstance(key, int) and 0 <= key < len(node):
+                node = node[key]
+            else:
+                return _MISSING
+            if node is _MISSING:
+                return _MISSING
+        return node
+
+    def _js_dict_snapshot(self, obj_id: str) -> str:
+        """JS 端快照回调：将根 dict 整体序列化为 JSON，JS 端解析后缓存用于读取。"""
+        proxy = self._proxy_manager.get(obj_id)
+        if not proxy:
+            return "null"
+        return fast_json.dumps(proxy.to_dict())
 
-    def _js_dict_set(self, obj_id: str, key: str, value: Any) -> None:
+    def _js_dict_set(self, obj_id: str, path_json: str, key: str, value: Any) -> None:
         """JS 端 setter 回调。"""
-        proxy = self._proxy_manager.get(obj_id)
-        if proxy:
-            proxy.set(key, value)
+        target = self._resolve_path(obj_id, path_json)
+        if isinstance(target, dict):
+            target[key] = self._proxy_manager.get(obj_id)._unwrap_value(value)
         return None
 
-    def _js_dict_has(self, obj_id: str, key: str) -> str:
-        """JS 端 has 检查回调。
-
-        返回字符串 "true"/"false" 以便 JS 端正确处理
-        """
-        proxy = self._proxy_manager.get(obj_id)
-        return "true" if (proxy.has(key) if proxy else False) else "false"
-
-    def _js_dict_keys(self, obj_id: str) -> str:
-        """JS 端 keys 获取回调。
-
-        返回 JSON 字符串，JS 端需要 JSON.parse 解析
-        """
-        import json as pyjson
-        proxy = self._proxy_manager.get(obj_id)
-        keys = proxy.keys() if proxy else []
-        return pyjson.dumps(keys)
-
-    def _js_dict_delete(self, obj_id: str, key: str) -> bool:
+    def _js_dict_delete(self, obj_id: str, path_json: str, key: str) -> bool:
         """JS 端 delete 操作回调。"""
-        proxy = self._proxy_manager.get(obj_id)
-        return proxy.delete(key) if proxy else False
-
-    def _js_create_nested_proxy(self, obj_id: str) -> Any:
-        """创建嵌套代理的回调。"""
-        proxy = self._proxy_manager.get(obj_id)
-        if not proxy:
-            return None
-        # 返回代理 ID，JS 端会创建 Proxy 包装
-        return {"__proxy_id": obj_id}
+        target = self._resolve_path(obj_id, path_json)
+        if isinstance(target, dict) and key in target:
+            del target[key]
+            return True
+        return False
 
     def _to_js_value(self, value: Any) -> Any:
         """Python 值转换为 JS 可用值。
@@ -129,9 +337,20 @@ class QuickJSTool(BaseTool):
         Returns:
             转换后的值，dict 会转为包含 __proxy_id 的对象
         """
+        value_type = type(value)
+        # 基本类型与普通 list 无需遍历：DictProxy 写入时会解包代理，
+        # 其包装的数据中不会出现 DictProxy，只有 LazyListProxy 的元素需要转换
+        if value_type in SCALAR_TYPES or value_type is list:
+            return value
         if isinstance(value, DictProxy):
             # 返回代理 ID，JS 端会通过 Proxy 拦截
             return {"__proxy_id": value.obj_id}
+        if isinstance(value, LazyListProxy):
+            data = value.to_list()
+            # 元素不含 dict/list 时不会被包装，直接返回原始列表（quickjs 不会修改传入的值）
+            if not any(isinstance(item, (dict, list)) for item in data):
+                return data
+            return [self._to_js_value(item) for item in value]
         if isinstance(value, list):
             return [self._to_js_value(item) for item in value]
         return value
@@ -139,6 +358,9 @@ class QuickJSTool(BaseTool):
     def expose_dict(self, py_dict: dict, name: str = None) -> str:
         """暴露 Python dict 到 JS 环境。
 
+        JS 端只为根 dict 登记一个代理；访问嵌套属性时按键路径回调 Python 取值，
+        不会为嵌套 dict 创建 Python 代理对象。
+
         Args:
             py_dict: 要暴露的 Python 字典
             name: 可选的变量名
@@ -146,6 +368,9 @@ class QuickJSTool(BaseTool):
         Returns:
             JS 环境中的变量名
 
+        Raises:
+            ValueError: 变量名不是合法的 JS 标识符
+
         Example:
             >>> tool = QuickJSTool()
             >>> data = {"name": "Alice", "age": 30}
@@ -153,70 +378,18 @@ class QuickJSTool(BaseTool):
             >>> tool.eval("userData.name = 'Bob'")
             >>> print(data["name"])  # 输出: "Bob"
         """
-        ctx = self._get_context()
+        if name is not None and not _IDENTIFIER_RE.match(name):
+            raise ValueError(f"Invalid variable name: {name!r}")
+        self._get_context()
         obj_id = self._proxy_manager.create(py_dict, name)
 
-        # 在 JS 中创建 Proxy 对象
-        proxy_code = f"""
-        (function() {{
-            const objId = '{obj_id}';
-            const createProxy = function(nestedObjId) {{
-                return new Proxy({{}}, {{
-                    get: function(target, prop) {{
-                        if (prop === '__objId__') return nestedObjId;
-                        if (prop === '_isProxy') return true;
-                        let result = _dictGet(nestedObjId, prop);
-                        // 检查是否返回的是 JSON 字符串（数组情况）
-                        if (typeof result === 'string' && result.startsWith('[')) {{
-                            try {{
-                                const arr = JSON.parse(result);
-                                return arr.map(function(item) {{
-                                    if (item && item.__proxy) {{
-                                        return createProxy(item.__proxy);
-                                    }}
-                                    return item;
-                                }});
-                            }} catch(e) {{ return result; }}
-                        }}
-                        // 检查是否是嵌套代理标记
-                        if (typeof result === 'string' && result.startsWith('__PROXY:')) {{
-                            const nestedId = result.slice(8, -2);
-                            return createProxy(nestedId);
-                        }}
-                        return result;
-                    }},
-                    set: function(target, prop, value) {{
-                        _dictSet(nestedObjId, prop, value);
-                        return true;
-                    }},
-                    has: function(target, prop) {{
-                        return _dictHas(nestedObjId, prop) === 'true';
-                    }},
-                    deleteProperty: function(target, prop) {{
-                        return _dictDelete(nestedObjId, prop);
-                    }},
-                    ownKeys: function(target) {{
-                        return JSON.parse(_dictKeys(nestedObjId));
-                    }},
-                    getOwnPropertyDescriptor: function(target, prop) {{
-                        return {{
-                            enumerable: true,
-                            configurable: true,
-                            value: this.get(target, prop)
-                        }};
-                    }}
-                }});
-            }};
-            const proxy = createProxy(objId);
-            return proxy;
-        }})()
-        """
-
-        js_proxy = ctx.eval(proxy_code)
-
         # 使用固定变量名
         var_name = name or f"exposed_dict_{obj_id}"
-        ctx.set(var_name, js_proxy)
+
+        # 一次调用创建 Proxy 并赋给全局变量；
+        # 同名对象可能刚被释放后重新暴露，同时递增版本号使旧快照失效
+        self._dict_gen += 1
+        self._expose_dict_js(var_name, obj_id, self._dict_gen)
 
         return var_name
 
@@ -233,9 +406,8 @@ class QuickJSTool(BaseTool):
             >>> tool.release_dict("userData")
         """
         if self._proxy_manager.release(name):
-            ctx = self._get_context()
-            # 使用 eval 删除全局变量
-            ctx.eval(f"delete globalThis.{name}")
+            self._get_context()
+            self._release_global(name)
             return True
         return False
 
@@ -257,28 +429,39 @@ class QuickJSTool(BaseTool):
         return proxy.to_dict() if proxy else None
 
     def _register_console_functions(self) -> None:
-        """注册 console 和工具调用函数。"""
+        """注册 console 和工具调用函数。
+
+        回调在调用时才读取 _tool_name 等执行状态，每个 Context 只需注册一次，
+        之后复用该 Context 时不再重复解析引导脚本。
+        """
+        if self._console_setup:
+            return
         ctx = self._get_context()
         apply_console(ctx)
         apply_call_tool(ctx)
         apply_sse_push(ctx)
+        ctx.eval(_SCRUB_GLOBALS_JS)
+        self._console_setup = True
+
+    def reset_globals(self) -> None:
+        """删除脚本执行时新增的全局变量，实例归还复用前调用。
+
+        顶层 let/const/function 声明无法删除，因此只有不留下这类声明的脚本
+        （如立即执行函数）才适合在复用的实例中执行。
+        脚本对已有全局变量或内置对象的修改不会还原，复用实例时应只执行同一脚本。
+        """
+        if self._console_setup:
+            self._get_context().eval("_scrubGlobals()")
 
     def _get_js_type(self, value: Any) -> str:
         """获取 JavaScript 结果类型。"""
-        if isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, (int, float)):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif value is None:
-            return "null"
-        elif isinstance(value, list):
-            return "array"
-        elif isinstance(value, dict):
+        value_type = type(value)
+        js_type = _PY_TYPE_TO_JS.get(value_type)
+        if js_type is not None:
+            return js_type
+        if isinstance(value, quickjs.Object):
             return "object"
-        else:
-            return type(value).__name__
+        return value_type.__name__
 
     def get_parameters(self) -> Dict[str, Any]:
         """获取参数定义。"""
@@ -293,17 +476,26 @@ class QuickJSTool(BaseTool):
             "required": ["code"],
         }
 
+    def _compile(self, ctx: quickjs.Context, wrapped_code: str) -> quickjs.Object:
+        """获取执行包装后代码的 JS 函数，按代码字符串缓存。
+
+        绑定库没有字节码编译接口，因此将代码编译为一个返回 JSON 结果的函数并保留其句柄，
+        之后直接调用该函数，不再重新解析源码。函数不挂在全局对象上，清理全局变量时不受影响。
+        """
+        compiled = self._compiled
+        fn = compiled.get(wrapped_code)
+        if fn is not None:
+            compiled.move_to_end(wrapped_code)
+            return fn
+        fn = ctx.eval(f"(function() {{ return JSON.stringify({wrapped_code}); }})")
+        compiled[wrapped_code] = fn
+        if len(compiled) > _COMPILED_CACHE_SIZE:
+            compiled.popitem(last=False)
+        return fn
+
     def _wrap_code(self, code: str) -> str:
         """包装代码以支持 return 语句。"""
-        stripped = code.strip()
-        if 'return' in code:
-            # 判断是否已经是 IIFE 包装：以 ( 开头且以 )() 结尾
-            is_iife = stripped.startswith('(') and stripped.rstrip().endswith(')()')
-            if is_iife:
-                return code
-            # 包装在立即执行函数中
-            return f'(function(){{\n{code}\n}})()'
-        return code
+        return _wrap_code_cached(code)
 
     def invoke(self, **kwargs) -> Dict[str, Any]:
         """执行 JavaScript 代码。
@@ -313,6 +505,8 @@ class QuickJSTool(BaseTool):
                 - code: JavaScript 代码 (必需)
                 - tool_name: 工具名称
                 - context: 可选的 context 字典，会通过 expose_dict 注册为 "context" 变量
+                - readonly_context: 为 True 且 context 小而扁平时，直接复制到 JS
+                  而不创建代理，省去每次属性访问的回调；脚本对 context 的修改不会写回
 
         Returns:
             包含 code, result, result_type 的字典
@@ -320,35 +514,46 @@ class QuickJSTool(BaseTool):
         code = kwargs.get('code')
         tool_name = kwargs.get('tool_name', self.name)
         context = kwargs.get('context')  # 可选的 context 字典
+        readonly_context = kwargs.get('readonly_context', False)
         if not code:
             raise ValueError("JavaScript code is required")
 
-        # 清空之前的 console 输出并重新注册函数（引用新列表）
-        # 将 tool_name 存储到 context globals 中，避免线程安全问题
         ctx = self._get_context()
-        ctx.set("_tool_name", tool_name)
         self._register_console_functions()
 
         # 如果提供了 context，使用 expose_dict 注册到 JS 环境
+        # 上次执行留下的 "context" 全局变量不立即删除：带 context 的执行直接覆盖，
+        # 只有不带 context 时才需要删除，省去每次执行结束时的一次 JS 调用
         context_var_name = None
         if context:
-            context_var_name = self.expose_dict(context, "context")
+            if readonly_context and _is_shallow_json(context):
+                self._set_global_json("context", fast_json.dumps(context))
+            else:
+                context_var_name = self.expose_dict(context, "context")
+            self._context_installed = True
+        elif self._context_installed:
+            self._release_global("context")
+            self._context_installed = False
 
         # 包装代码以支持 return 语句
         wrapped_code = self._wrap_code(code)
 
         try:
-            ctx = self._get_context()
-            value = ctx.eval(f"JSON.stringify({wrapped_code})")
+            # 一次调用使 dict 快照失效（两次执行之间 Python 端可能修改了已暴露的 dict），
+            # 并将 tool_name 存储到 context globals 中，避免线程安全问题
+            # （console 等函数每个 Context 只注册一次，输出时读取当前的 _tool_name）
+            self._dict_gen += 1
+            self._begin_invoke(self._dict_gen, tool_name)
+            value = self._compile(ctx, wrapped_code)()
             try:
-                value =  json.loads(value)
-            except (json.JSONDecodeError, TypeError):
+                value = fast_json.loads(value)
+            except (ValueError, TypeError):
                 pass
 
             result_type = self._get_js_type(value)
 
             response: Dict[str, Any] = {
-                "code": wrapped_code if code != wrapped_code else code,
+                "code": wrapped_code,
                 "result": value,
                 "result_type": result_type,
             }
@@ -362,15 +567,15 @@ class QuickJSTool(BaseTool):
         except Exception as e:
             raise ValueError(f"JavaScript execution failed: {str(e)}")
         finally:
-            # 执行结束后释放 context
+            # 执行结束后释放 context 的代理（JS 全局变量延迟删除，见上）
             if context_var_name:
-                self.release_dict(context_var_name)
+                self._proxy_manager.release(context_var_name)
 
     async def ainvoke(self, **kwargs) -> Dict[str, Any]:
         """异步执行 JavaScript 代码。
 
-        默认实现调用 execute 方法（已在线程池中运行）。
-        子类可以重写此方法以支持真正的异步执行。
+        在实例专属的单线程执行器中调用 invoke，保证 Context 始终在同一线程使用。
+        同一实例不要混用 ainvoke 与其他线程上的同步 invoke。
 
         Args:
             **kwargs: 工具参数，支持 code 和 name
@@ -381,8 +586,10 @@ class QuickJSTool(BaseTool):
         Raises:
             ValueError: 代码为空或执行失败
         """
-        # 使用默认的 BaseTool.ainvoke，它会在线程池中调用 execute
-        return await super().ainvoke(**kwargs)
+        # 使用 copy_context 确保 ContextVar 跨线程传递
+        loop = asyncio.get_running_loop()
+        ctx = copy_context()
+        return await loop.run_in_executor(self._executor, lambda: ctx.run(self.invoke, **kwargs))
 
     def __repr__(self) -> str:
         return f"QuickJSTool(name={self.name})"
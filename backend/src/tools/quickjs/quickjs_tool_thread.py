@@ -4,20 +4,134 @@
 """
 
 import asyncio
-import json
-import json as pyjson
+import itertools
 import threading
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Optional, Tuple
 from functools import partial
 
 import quickjs  # pyright: ignore[reportImplicitRelativeImport]
 
 from src.tools.base import BaseTool
-from src.tools.quickjs.func_console import apply as apply_console
+from src.utils import fast_json
+from src.tools.quickjs.func_console import apply as apply_console, object_json
 from src.tools.quickjs.call_tool import apply as apply_call_tool
 from src.tools.quickjs.sse_push import apply as apply_sse_push
-from src.tools.quickjs.dict_proxy import DictProxy, DictProxyManager
+from src.tools.quickjs.dict_proxy import SCALAR_TYPES, DictProxy, DictProxyManager, LazyListProxy
+from src.tools.quickjs.quickjs_tool import has_return
+
+# _dictGet 返回的容器标记：以控制字符 \x01 开头，JS 端只需比较首字符编码，
+# 不会与普通字符串值（包括以 "[" 开头的字符串）冲突
+# （回调无法直接返回 JS 对象；也不能用 NUL，字符串跨边界时会在 NUL 处截断）
+_PROXY_MARKER = "\x01proxy:"
+_LIST_MARKER = "\x01list:"
+# 含嵌套 dict 的列表，JS 端解析时需要把 {__proxy: id} 元素换成 Proxy
+_PROXY_LIST_MARKER = "\x01plist:"
+# _dictKeys 返回的键分隔符：每个键前加一个，JS 端 split 后去掉首项即可，无需 JSON 解析
+_KEY_SEPARATOR = "\x1f"
+
+# 结果值的 Python 类型 -> JS 类型名（按精确类型查表，bool 不会落入 int）
+_PY_TYPE_TO_JS: Dict[type, str] = {
+    bool: "boolean",
+    int: "number",
+    float: "number",
+    str: "string",
+    type(None): "null",
+    list: "array",
+    dict: "object",
+}
+
+# 全局变量辅助函数：以 JSON 快照设置 / 删除全局变量，变量名作为参数传入，无需拼接脚本。
+# 快照中的对象与 Proxy 一样提供 $snapshot()（不可枚举，直接返回对象本身），
+# 同一脚本在写回与只读两种方式下都能运行
+_GLOBAL_HELPERS_JS = """
+function __selfSnapshot() {
+    return this;
+}
+
+function __attachSnapshot(key, value) {
+    if (value !== null && typeof value === 'object' && !Array.isArray(value)) {
+        Object.defineProperty(value, '$snapshot', {value: __selfSnapshot, writable: true, configurable: true});
+    }
+    return value;
+}
+
+function __setGlobalJson(name, json) {
+    globalThis[name] = JSON.parse(json, __attachSnapshot);
+}
+
+function __releaseGlobal(name) {
+    delete globalThis[name];
+}
+"""
+
+# JS 端 Proxy 工厂：每个线程的 Context 只解析一次，之后按 objId 直接调用
+_CREATE_PROXY_JS = """
+function __createProxy(nestedObjId) {
+    // 整体快照：一次回调取回整个 dict（写操作不会同步回 Python）
+    const snapshot = function() {
+        return JSON.parse(_dictGetAll(nestedObjId));
+    };
+    // get 与 getOwnPropertyDescriptor 共用，每次取值只回调 Python 一次
+    const readProp = function(prop) {
+        if (prop === '__objId__') return nestedObjId;
+        if (prop === '_isProxy') return true;
+        // $snapshot() 供读取密集的脚本一次取回整个 dict；
+        // toJSON 让 JSON.stringify 走同一路径，无需逐键回调
+        if (prop === '$snapshot' || prop === 'toJSON') return snapshot;
+        let result = _dictGet(nestedObjId, prop);
+        // 容器标记以 \x01 开头，普通字符串只需一次首字符比较
+        if (typeof result === 'string' && result.charCodeAt(0) === 1) {
+            // 嵌套代理标记
+            if (result.startsWith('\\u0001proxy:')) {
+                return __createProxy(result.slice(7));
+            }
+            // 数组：JSON 字符串，不含 dict 时解析结果即为最终值
+            if (result.startsWith('\\u0001list:')) {
+                return JSON.parse(result.slice(6));
+            }
+            // 含 dict 的数组：解析时把 {__proxy: id} 元素换成 Proxy
+            if (result.startsWith('\\u0001plist:')) {
+                return JSON.parse(result.slice(7), function(key, item) {
+                    if (item && item.__proxy) {
+                        return __createProxy(item.__proxy);
+                    }
+                    return item;
+                });
+            }
+        }
+        return result;
+    };
+    return new Proxy({}, {
+        get: function(target, prop) {
+            return readProp(prop);
+        },
+        set: function(target, prop, value) {
+            _dictSet(nestedObjId, prop, value);
+            return true;
+        },
+        has: function(target, prop) {
+            return _dictHas(nestedObjId, prop);
+        },
+        deleteProperty: function(target, prop) {
+            return _dictDelete(nestedObjId, prop);
+        },
+        ownKeys: function(target) {
+            const keys = _dictKeys(nestedObjId);
+            // 以 "[" 开头说明键中含分隔符，回退为 JSON
+            return keys.charCodeAt(0) === 91 ? JSON.parse(keys) : keys.split('\\u001f').slice(1);
+        },
+        getOwnPropertyDescriptor: function(target, prop) {
+            return {
+                enumerable: true,
+                configurable: true,
+                value: readProp(prop)
+            };
+        }
+    });
+}
+"""
 
 
 class QuickJSTool(BaseTool):
@@ -29,6 +143,14 @@ class QuickJSTool(BaseTool):
 
     # 线程池大小，可根据需要调整
     MAX_WORKERS = 4
+    # 单个 Context 最多执行的次数，超过后丢弃重建，避免 JS 端状态无限累积
+    CONTEXT_MAX_USES = 500
+    # Context 内存占用（字节）超过该值时丢弃重建
+    CONTEXT_MAX_MEMORY = 64 * 1024 * 1024
+    # 每执行多少次检查一次内存占用
+    MEMORY_CHECK_INTERVAL = 50
+    # 同步 invoke 等待执行结果的默认超时（秒）
+    DEFAULT_TIMEOUT = 30
 
     def __init__(self):
         """初始化 QuickJS 工具。"""
@@ -40,54 +162,100 @@ class QuickJSTool(BaseTool):
         self._thread_local = threading.local()
         # 全局代理管理器（线程共享）
         self._proxy_manager: DictProxyManager = DictProxyManager()
+        # expose_dict 登记的全局变量（变量名 -> 安装函数），执行前同步到当前线程的 Context；
+        # 版本号变化时才需要重新同步
+        self._exposed_globals: Dict[str, Callable[[quickjs.Context], None]] = {}
+        self._exposed_versions = itertools.count(1)
+        self._exposed_version = 0
         # 独立线程池执行 eval
         self._executor = ThreadPoolExecutor(
             max_workers=self.MAX_WORKERS,
-            thread_name_prefix="quickjs_eval_"
+            thread_name_prefix="quickjs_eval_",
+            initializer=self._mark_worker_thread,
         )
 
+    def _mark_worker_thread(self) -> None:
+        """线程池工作线程初始化：标记为工作线程。"""
+        self._thread_local.is_worker = True
+
     def _get_context(self) -> quickjs.Context:
         """获取当前线程的 Context（线程隔离）。
 
-        每个线程首次调用时创建独立的 Context。
-        """
-        if not hasattr(self._thread_local, 'context'):
-            # 创建新 Context
-            self._thread_local.context = quickjs.Context()
-            self._thread_local.console_setup = False
-            # 标记该线程的 Context 需要注册回调
-            self._thread_local.callbacks_registered = False
-
-        return self._thread_local.context
-
-    def _ensure_callbacks_registered(self, ctx: quickjs.Context) -> None:
-        """确保回调已注册到 Context。
-
-        每个线程的 Context 只需要注册一次回调。
+        每个线程首次调用时创建独立的 Context，并一次性完成所有注册
+        （dict 代理回调、console 与工具调用函数），之后无需再检查各项注册状态。
         """
         thread_local = self._thread_local
-
-        if not getattr(thread_local, 'callbacks_registered', False):
-            # 注册 dict proxy 回调
+        ctx = getattr(thread_local, 'context', None)
+        if ctx is None:
+            ctx = quickjs.Context()
             self._register_dict_proxy_callbacks(ctx)
-            thread_local.callbacks_registered = True
+            apply_console(ctx)
+            apply_call_tool(ctx)
+            apply_sse_push(ctx)
+            thread_local.context = ctx
+            thread_local.tool_name = None
+            thread_local.uses = 0
+            thread_local.installed_globals = set()
+            # JS 全局变量 "context" 是否仍留有上次执行的值
+            thread_local.context_installed = False
+            thread_local.exposed_version = 0
+        return ctx
+
+    def _sync_exposed_globals(self, ctx: quickjs.Context) -> None:
+        """将 expose_dict 登记的全局变量同步到当前线程的 Context。
+
+        Context 按线程隔离且会被回收重建，暴露时不直接写入某个 Context，
+        而是在执行前由各线程按登记表补装或删除。
+        """
+        thread_local = self._thread_local
+        version = self._exposed_version
+        if thread_local.exposed_version == version:
+            return
+        exposed = dict(self._exposed_globals)
+        for name in thread_local.installed_globals - exposed.keys():
+            thread_local.release_global(name)
+        for install in exposed.values():
+            install(ctx)
+        thread_local.installed_globals = set(exposed)
+        thread_local.exposed_version = version
 
     def _register_dict_proxy_callbacks(self, ctx: quickjs.Context) -> None:
-        """注册 dict 代理的回调函数到指定 Context。"""
+        """注册 dict 代理的回调函数到指定 Context。
+
+        每次属性读取都会触发 _dictGet/_dictHas，这两个回调使用闭包直接访问
+        管理器的映射与代理包装的 dict，省去绑定方法与 get/has 方法调用链；
+        只有非基本类型的值才交给 _js_dict_get 包装。
+        """
+        manager = self._proxy_manager
+        js_dict_get = self._js_dict_get
+
+        def dict_get(obj_id: str, key: str) -> Any:
+            # clear() 会整体替换 _proxies，因此每次从管理器读取
+            proxy = manager._proxies.get(obj_id)
+            if proxy is None:
+                return None
+            value = proxy._data.get(key)
+            if type(value) in SCALAR_TYPES:
+                return value
+            return js_dict_get(obj_id, key)
+
+        def dict_has(obj_id: str, key: str) -> bool:
+            proxy = manager._proxies.get(obj_id)
+            return proxy is not None and key in proxy._data
+
         # 注册 dict 操作回调
-        ctx.add_callable("_dictGet", self._js_dict_get)
+        ctx.add_callable("_dictGet", dict_get)
         ctx.add_callable("_dictSet", self._js_dict_set)
-        ctx.add_callable("_dictHas", self._js_dict_has)
+        ctx.add_callable("_dictHas", dict_has)
+        ctx.add_callable("_dictGetAll", self._js_dict_get_all)
         ctx.add_callable("_dictKeys", self._js_dict_keys)
         ctx.add_callable("_dictDelete", self._js_dict_delete)
-        ctx.add_callable("_createNestedProxy", self._js_create_nested_proxy)
-
-    def _setup_dict_proxy(self) -> None:
-        """设置 dict 代理的回调函数（兼容旧接口）。"""
-        ctx = self._get_context()
-        if ctx is None:
-            return
-        self._ensure_callbacks_registered(ctx)
+        ctx.eval(_CREATE_PROXY_JS)
+        ctx.eval(_GLOBAL_HELPERS_JS)
+        thread_local = self._thread_local
+        thread_local.create_proxy = ctx.get("__createProxy")
+        thread_local.set_global_json = ctx.get("__setGlobalJson")
+        thread_local.release_global = ctx.get("__releaseGlobal")
 
     def _js_dict_get(self, obj_id: str, key: str) -> Any:
         """JS 端 getter 回调。"""
@@ -97,26 +265,30 @@ class QuickJSTool(BaseTool):
         value = proxy.get(key)
         # 如果返回的是 DictProxy，需要将其注册到 manager 中
         if isinstance(value, DictProxy):
-            # 直接使用原有的 DictProxy 对象注册到 manager
-            if not self._proxy_manager.get(value.obj_id):
-                self._proxy_manager._proxies[value.obj_id] = value
-            # 返回特殊标记格式
-            return f"__PROXY:{value.obj_id}__"
-        if isinstance(value, list):
+            # 直接登记原有的 DictProxy 对象，不复制数据
+            self._proxy_manager.register(value)
+            # 返回嵌套代理标记
+            return _PROXY_MARKER + value.obj_id
+        if isinstance(value, LazyListProxy):
             # 列表中的嵌套 dict 需要特殊处理
             # 注意：由于 quickjs add_callable 无法直接返回 JS 数组，
-            # 我们返回 JSON 字符串，JS 端需要解析
-            import json as pyjson
+            # 我们返回带标记的 JSON 字符串，JS 端需要解析
             result = []
+            nested = []
             for item in value:
                 if isinstance(item, DictProxy):
-                    # 直接使用原有的 DictProxy 对象
-                    if not self._proxy_manager.get(item.obj_id):
-                        self._proxy_manager._proxies[item.obj_id] = item
+                    nested.append(item)
                     result.append({"__proxy": item.obj_id})
+                elif isinstance(item, LazyListProxy):
+                    # 嵌套列表按原始数据序列化
+                    result.append(item.to_list())
                 else:
                     result.append(item)
-            return pyjson.dumps(result)
+            # 直接登记原有的 DictProxy 对象，不复制数据；整个列表只加一次锁
+            self._proxy_manager.register_many(nested)
+            # 不含 dict 的列表 JS 端解析后直接使用，无需再逐项检查
+            marker = _PROXY_LIST_MARKER if nested else _LIST_MARKER
+            return marker + fast_json.dumps(result)
         return value
 
     def _js_dict_set(self, obj_id: str, key: str, value: Any) -> None:
@@ -126,117 +298,50 @@ class QuickJSTool(BaseTool):
             proxy.set(key, value)
         return None
 
-    def _js_dict_has(self, obj_id: str, key: str) -> str:
-        """JS 端 has 检查回调。
-
-        返回字符串 "true"/"false" 以便 JS 端正确处理
-        """
+    def _js_dict_get_all(self, obj_id: str) -> str:
+        """JS 端整体快照回调：将 dict 整体序列化为 JSON。"""
         proxy = self._proxy_manager.get(obj_id)
-        return "true" if (proxy.has(key) if proxy else False) else "false"
+        if not proxy:
+            return "null"
+        return fast_json.dumps(proxy.to_dict())
 
     def _js_dict_keys(self, obj_id: str) -> str:
         """JS 端 keys 获取回调。
 
-        返回 JSON 字符串，JS 端需要 JSON.parse 解析
+        回调无法直接返回 JS 数组，返回每个键前带 _KEY_SEPARATOR 的字符串，JS 端 split 即可；
+        键中本身含分隔符时回退为 JSON 数组字符串
         """
-        import json as pyjson
         proxy = self._proxy_manager.get(obj_id)
-        keys = proxy.keys() if proxy else []
-        return pyjson.dumps(keys)
+        if not proxy:
+            return ""
+        keys = [str(key) for key in proxy.keys()]
+        joined = "".join(_KEY_SEPARATOR + key for key in keys)
+        if joined.count(_KEY_SEPARATOR) != len(keys):
+            return fast_json.dumps(keys)
+        return joined
 
     def _js_dict_delete(self, obj_id: str, key: str) -> bool:
         """JS 端 delete 操作回调。"""
         proxy = self._proxy_manager.get(obj_id)
         return proxy.delete(key) if proxy else False
 
-    def _js_create_nested_proxy(self, obj_id: str) -> Any:
-        """创建嵌套代理的回调。"""
-        proxy = self._proxy_manager.get(obj_id)
-        if not proxy:
-            return None
-        # 返回代理 ID，JS 端会创建 Proxy 包装
-        return {"__proxy_id": obj_id}
-
-    def _to_js_value(self, value: Any) -> Any:
-        """Python 值转换为 JS 可用值。
-
-        Args:
-            value: Python 值
-
-        Returns:
-            转换后的值，dict 会转为包含 __proxy_id 的对象
-        """
-        if isinstance(value, DictProxy):
-            # 返回代理 ID，JS 端会通过 Proxy 拦截
-            return {"__proxy_id": value.obj_id}
-        if isinstance(value, list):
-            return [self._to_js_value(item) for item in value]
-        return value
-
     def _create_js_proxy(self, ctx: quickjs.Context, obj_id: str) -> Any:
-        """在指定 Context 中创建 JS Proxy 对象。"""
-        proxy_code = f"""
-        (function() {{
-            const objId = '{obj_id}';
-            const createProxy = function(nestedObjId) {{
-                return new Proxy({{}}, {{
-                    get: function(target, prop) {{
-                        if (prop === '__objId__') return nestedObjId;
-                        if (prop === '_isProxy') return true;
-                        let result = _dictGet(nestedObjId, prop);
-                        // 检查是否返回的是 JSON 字符串（数组情况）
-                        if (typeof result === 'string' && result.startsWith('[')) {{
-                            try {{
-                                const arr = JSON.parse(result);
-                                return arr.map(function(item) {{
-                                    if (item && item.__proxy) {{
-                                        return createProxy(item.__proxy);
-                                    }}
-                                    return item;
-                                }});
-                            }} catch(e) {{ return result; }}
-                        }}
-                        // 检查是否是嵌套代理标记
-                        if (typeof result === 'string' && result.startsWith('__PROXY:')) {{
-                            const nestedId = result.slice(8, -2);
-                            return createProxy(nestedId);
-                        }}
-                        return result;
-                    }},
-                    set: function(target, prop, value) {{
-                        _dictSet(nestedObjId, prop, value);
-                        return true;
-                    }},
-                    has: function(target, prop) {{
-                        return _dictHas(nestedObjId, prop) === 'true';
-                    }},
-                    deleteProperty: function(target, prop) {{
-                        return _dictDelete(nestedObjId, prop);
-                    }},
-                    ownKeys: function(target) {{
-                        return JSON.parse(_dictKeys(nestedObjId));
-                    }},
-                    getOwnPropertyDescriptor: function(target, prop) {{
-                        return {{
-                            enumerable: true,
-                            configurable: true,
-                            value: this.get(target, prop)
-                        }};
-                    }}
-                }});
-            }};
-            const proxy = createProxy(objId);
-            return proxy;
-        }})()
+        """在指定 Context 中创建 JS Proxy 对象。
+
+        调用该 Context 注册回调时已编译的工厂函数，不再为每个 dict 拼接并解析脚本。
         """
-        return ctx.eval(proxy_code)
+        return self._thread_local.create_proxy(obj_id)
 
-    def expose_dict(self, py_dict: dict, name: str = None) -> str:
+    def expose_dict(self, py_dict: dict, name: str = None, writeback: bool = True) -> str:
         """暴露 Python dict 到 JS 环境。
 
+        writeback 为 False 时只把 dict 的 JSON 快照复制到 JS：读取不再回调 Python，
+        但 JS 端的修改不会写回。变量在下次执行时安装到执行线程的 Context。
+
         Args:
             py_dict: 要暴露的 Python 字典
             name: 可选的变量名
+            writeback: 是否需要把 JS 端的修改同步回 Python dict
 
         Returns:
             JS 环境中的变量名
@@ -248,19 +353,22 @@ class QuickJSTool(BaseTool):
             >>> tool.eval("userData.name = 'Bob'")
             >>> print(data["name"])  # 输出: "Bob"
         """
-        ctx = self._get_context()
-        # 确保回调已注册
-        self._ensure_callbacks_registered(ctx)
+        if not writeback:
+            var_name = name or f"exposed_dict_{id(py_dict)}"
+            json_text = fast_json.dumps(py_dict, default=str)
 
-        obj_id = self._proxy_manager.create(py_dict, name)
-
-        # 在 JS 中创建 Proxy 对象
-        js_proxy = self._create_js_proxy(ctx, obj_id)
+            def install(ctx: quickjs.Context) -> None:
+                self._thread_local.set_global_json(var_name, json_text)
+        else:
+            obj_id = self._proxy_manager.create(py_dict, name)
+            # 使用固定变量名
+            var_name = name or f"exposed_dict_{obj_id}"
 
-        # 使用固定变量名
-        var_name = name or f"exposed_dict_{obj_id}"
-        ctx.set(var_name, js_proxy)
+            def install(ctx: quickjs.Context) -> None:
+                ctx.set(var_name, self._create_js_proxy(ctx, obj_id))
 
+        self._exposed_globals[var_name] = install
+        self._exposed_version = next(self._exposed_versions)
         return var_name
 
     def release_dict(self, name: str) -> bool:
@@ -275,12 +383,11 @@ class QuickJSTool(BaseTool):
         Example:
             >>> tool.release_dict("userData")
         """
-        if self._proxy_manager.release(name):
-            ctx = self._get_context()
-            # 使用 eval 删除全局变量
-            ctx.eval(f"delete globalThis.{name}")
-            return True
-        return False
+        released = self._proxy_manager.release(name)
+        if self._exposed_globals.pop(name, None) is None:
+            return released
+        self._exposed_version = next(self._exposed_versions)
+        return True
 
     def get_dict(self, name: str) -> Optional[dict]:
         """获取暴露后 dict 的原始引用。
@@ -299,56 +406,19 @@ class QuickJSTool(BaseTool):
         proxy = self._proxy_manager.get(name)
         return proxy.to_dict() if proxy else None
 
-    def _register_console_functions(self) -> None:
-        """注册 console 和工具调用函数到当前线程的 Context。"""
-        ctx = self._get_context()
-        thread_local = self._thread_local
-
-        if not getattr(thread_local, 'console_setup', False):
-            apply_console(ctx)
-            apply_call_tool(ctx)
-            apply_sse_push(ctx)
-            thread_local.console_setup = True
-
     def _get_js_type(self, value: Any) -> str:
-        """获取 JavaScript 结果类型。"""
-        # quickjs.Object 类型需要通过 class_id 判断
-        if isinstance(value, quickjs.Object):
-            # 尝试转换为 Python 对象
-            try:
-                py_value = value.json
-                if callable(py_value):
-                    py_value = py_value()
-                if isinstance(py_value, list):
-                    return "array"
-                if isinstance(py_value, dict):
-                    return "object"
-            except Exception:
-                pass
-            # 通过 JS 的 instanceof 判断
-            try:
-                ctx = self._get_context()
-                is_array = ctx.eval(f"{value.js_id} instanceof Array")
-                if is_array:
-                    return "array"
-            except Exception:
-                pass
-            return "object"
+        """获取 JavaScript 结果类型。
 
-        if isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, (int, float)):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif value is None:
-            return "null"
-        elif isinstance(value, list):
-            return "array"
-        elif isinstance(value, dict):
+        value 应为 _materialize_result 转换后的值；仍是 quickjs.Object 说明无法转为 JSON，
+        按 object 处理，不再额外执行 instanceof 脚本。
+        """
+        value_type = type(value)
+        js_type = _PY_TYPE_TO_JS.get(value_type)
+        if js_type is not None:
+            return js_type
+        if isinstance(value, quickjs.Object):
             return "object"
-        else:
-            return type(value).__name__
+        return value_type.__name__
 
     def get_parameters(self) -> Dict[str, Any]:
         """获取参数定义。"""
@@ -366,7 +436,7 @@ class QuickJSTool(BaseTool):
     def _wrap_code(self, code: str) -> str:
         """包装代码以支持 return 语句。"""
         stripped = code.strip()
-        if 'return' in code:
+        if has_return(code):
             # 判断是否已经是 IIFE 包装：以 ( 开头且以 )() 结尾
             is_iife = stripped.startswith('(') and stripped.rstrip().endswith(')()')
             if is_iife:
@@ -375,76 +445,57 @@ class QuickJSTool(BaseTool):
             return f'(function(){{\n{code}\n}})()'
         return code
 
-    def _eval_in_thread(self, wrapped_code: str) -> Any:
-        """在线程池中执行 eval。
-
-        这是真正在独立线程中执行的逻辑。
-        确保所有异常都在线程内捕获，不会泄漏到主线程。
-        """
-        ctx = self._get_context()
-        # 确保回调已注册
-        self._ensure_callbacks_registered(ctx)
-
-        try:
-            result = ctx.eval(wrapped_code)
-            return result
-        except Exception:
-            # 重新抛出，由调用方处理
-            raise
-
     def invoke(self, **kwargs) -> Dict[str, Any]:
         """执行 JavaScript 代码（同步版本）。
 
-        实际执行在线程池中进行，确保隔离。
+        提交到线程池执行并阻塞等待结果，多个同步调用方可并发执行脚本；
+        已在线程池工作线程中（如脚本经 callTool 嵌套调用）时直接执行，避免占满线程池后互相等待。
+        事件循环中应使用 ainvoke。
 
         Args:
             **kwargs: 支持以下参数:
                 - code: JavaScript 代码 (必需)
                 - tool_name: 工具名称
                 - context: 可选的 context 字典
+                - writeback: 是否把脚本对 context 的修改写回 Python，默认 True；
+                  为 False 时只复制快照到 JS，属性读取不再回调 Python
+                - timeout: 等待结果的超时时间（秒），默认 DEFAULT_TIMEOUT
 
         Returns:
             包含 code, result, result_type 的字典
+
+        Raises:
+            ValueError: 代码为空或执行失败
+            TimeoutError: 等待超时（脚本仍会在工作线程中执行完毕）
         """
         code = kwargs.get('code')
         tool_name = kwargs.get('tool_name', self.name)
         context = kwargs.get('context')
+        writeback = kwargs.get('writeback', True)
         if not code:
             raise ValueError("JavaScript code is required")
 
         wrapped_code = self._wrap_code(code)
-
-        # 同步调用 _execute_in_thread（它会在线程池的线程中执行）
-        from concurrent.futures import Future
-        loop = None
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            pass
-
-        if loop:
-            # 在已有事件循环中，使用线程池
-            future = loop.run_in_executor(
-                self._executor,
-                partial(
-                    self._execute_in_thread,
-                    code=wrapped_code,
-                    original_code=code,
-                    tool_name=tool_name,
-                    context=context
-                )
-            )
-            # 注意：这里不能 await，因为 invoke 是同步方法
-            # 所以需要用不同的方式
-
-        # 简化：直接调用（在当前线程执行，但有 ThreadLocal 隔离）
-        return self._execute_in_thread(
+        execute = partial(
+            self._execute_in_thread,
             code=wrapped_code,
             original_code=code,
             tool_name=tool_name,
-            context=context
+            context=context,
+            writeback=writeback
         )
+
         # _execute_in_thread 已经处理了所有异常和清理
+        if getattr(self._thread_local, 'is_worker', False):
+            return execute()
+
+        # 使用 copy_context 确保 ContextVar（如 task_context）跨线程传递
+        timeout = kwargs.get('timeout', self.DEFAULT_TIMEOUT)
+        future = self._executor.submit(copy_context().run, execute)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"JavaScript execution timed out after {timeout}s")
 
     async def ainvoke(self, **kwargs) -> Dict[str, Any]:
         """异步执行 JavaScript 代码。
@@ -457,6 +508,7 @@ class QuickJSTool(BaseTool):
                 - code: JavaScript 代码 (必需)
                 - tool_name: 工具名称
                 - context: 可选的 context 字典
+                - writeback: 是否把脚本对 context 的修改写回 Python，默认 True
                 - timeout: 超时时间（秒），默认 30 秒
 
         Returns:
@@ -469,6 +521,7 @@ class QuickJSTool(BaseTool):
         code = kwargs.get('code')
         tool_name = kwargs.get('tool_name', self.name)
         context = kwargs.get('context')
+        writeback = kwargs.get('writeback', True)
         if not code:
             raise ValueError("JavaScript code is required")
 
@@ -485,7 +538,8 @@ class QuickJSTool(BaseTool):
                     code=wrapped_code,
                     original_code=code,
                     tool_name=tool_name,
-                    context=context
+                    context=context,
+                    writeback=writeback
                 )
             )
             return result
@@ -497,7 +551,8 @@ class QuickJSTool(BaseTool):
         code: str,
         original_code: str,
         tool_name: str,
-        context: Optional[dict] = None
+        context: Optional[dict] = None,
+        writeback: bool = True
     ) -> Dict[str, Any]:
         """在线程池中执行完整的 JS 操作流程。
 
@@ -505,57 +560,37 @@ class QuickJSTool(BaseTool):
         """
         # 获取当前线程的 Context（ThreadLocal 隔离）
         ctx = self._get_context()
+        self._sync_exposed_globals(ctx)
 
-        # 设置工具名称
-        ctx.set("_tool_name", tool_name)
-
-        # 注册 console 函数
+        # 设置工具名称（与上次相同时跳过）
         thread_local = self._thread_local
-        if not getattr(thread_local, 'console_setup', False):
-            apply_console(ctx)
-            apply_call_tool(ctx)
-            apply_sse_push(ctx)
-            thread_local.console_setup = True
-
-        # 确保 dict proxy 回调已注册
-        self._ensure_callbacks_registered(ctx)
-
-        # 如果提供了 context，使用 expose_dict 注册到 JS 环境
-        # 使用唯一的变量名来避免并发冲突，但最终在 JS 中使用 "context" 这个名称
-        context_var_name = None
+        if thread_local.tool_name != tool_name:
+            ctx.set("_tool_name", tool_name)
+            thread_local.tool_name = tool_name
+
+        # 如果提供了 context，注册为 JS 全局变量 "context"；上次执行留下的值直接覆盖，
+        # 只有不带 context 时才删除，省去每次执行结束时的一次 JS 调用
+        context_obj_id = None
+        if not context:
+            if thread_local.context_installed:
+                thread_local.release_global("context")
+                thread_local.context_installed = False
+        elif not writeback:
+            # 调用方声明无需写回时只复制快照，属性读取不再回调 Python
+            thread_local.set_global_json("context", fast_json.dumps(context, default=str))
+        else:
+            # 代理使用唯一的 obj_id 避免线程间冲突（管理器为线程共享），
+            # JS 端直接赋给 "context"，无需再执行重命名脚本
+            context_obj_id = self._proxy_manager.create(context)
+            ctx.set("context", self._create_js_proxy(ctx, context_obj_id))
         if context:
-            # 不指定名称，让它生成唯一的 obj_id
-            unique_var_name = self.expose_dict(context)
-            # 将变量重命名为 "context"
-            ctx.eval(f"var context = {unique_var_name}")
-            context_var_name = unique_var_name
+            thread_local.context_installed = True
 
         try:
             # 执行 eval
             result = ctx.eval(code)
 
-            # 获取结果值
-            if hasattr(result, 'value'):
-                value = result.value
-            else:
-                value = result
-
-            # 尝试转换为 Python 对象便于序列化
-            if isinstance(value, quickjs.Object):
-                try:
-                    json_val = value.json
-                    if callable(json_val):
-                        json_val = json_val()
-                    # 解析 JSON 字符串为 Python 对象
-                    if isinstance(json_val, str):
-                        import json as pyjson
-                        value = pyjson.loads(json_val)
-                    else:
-                        value = json_val
-                except Exception:
-                    pass
-
-            result_type = self._get_js_type(value)
+            value, result_type = self._materialize_result(result)
 
             return {
                 "code": code if code != original_code else original_code,
@@ -570,29 +605,42 @@ class QuickJSTool(BaseTool):
         except Exception as e:
             raise ValueError(f"JavaScript execution failed: {str(e)}")
         finally:
-            # 执行结束后释放 context
-            if context_var_name:
-                self.release_dict(context_var_name)
+            # 执行结束后释放 context 的代理（JS 全局变量延迟删除，见上）
+            if context_obj_id:
+                self._proxy_manager.release(context_obj_id)
+            self._recycle_context_if_needed()
 
-    def _safe_eval(self, wrapped_code: str) -> Any:
-        """在线程池中安全执行 eval。
+    def _recycle_context_if_needed(self) -> None:
+        """执行次数或内存占用超限时丢弃当前线程的 Context，下次执行时重建。
 
-        确保所有异常都在线程内捕获，不会泄漏到主线程。
+        Context 与线程绑定，不能在线程间复用，因此按线程各自计数回收。
         """
-        ctx = self._get_context()
-        # 确保回调已注册
-        self._ensure_callbacks_registered(ctx)
+        thread_local = self._thread_local
+        thread_local.uses += 1
+        uses = thread_local.uses
+        if uses < self.CONTEXT_MAX_USES:
+            if uses % self.MEMORY_CHECK_INTERVAL:
+                return
+            if thread_local.context.memory()["malloc_size"] < self.CONTEXT_MAX_MEMORY:
+                return
+        del thread_local.context
 
-        try:
-            result = ctx.eval(wrapped_code)
-            return result
-        except quickjs.JSException as e:
-            # 转换为 ValueError，避免跨线程传播
-            raise ValueError(f"JavaScript error: {str(e)}")
-        except SyntaxError as e:
-            raise ValueError(f"JavaScript syntax error: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"JavaScript execution failed: {str(e)}")
+    def _materialize_result(self, result: Any) -> Tuple[Any, str]:
+        """将 eval 结果转换为 Python 值并确定其 JS 类型。
+
+        quickjs.Object 只序列化、解析一次，类型由解析后的 Python 值推断。
+
+        Returns:
+            (Python 值, JS 类型名)
+        """
+        value = result.value if hasattr(result, 'value') else result
+        if isinstance(value, quickjs.Object):
+            try:
+                # 解析 JSON 字符串为 Python 对象
+                value = fast_json.loads(object_json(value))
+            except Exception:
+                pass
+        return value, self._get_js_type(value)
 
     def __repr__(self) -> str:
         return f"QuickJSTool(name={self.name})"
@@ -3,11 +3,19 @@
 提供 ssePush 函数，允许从 JavaScript 推送内容到 SSE 流。
 """
 
-import json
-
+from src.utils import fast_json
 from src.utils.stream_writer_util import send_queue, task_context
 
 
+def _has_stream_writer() -> bool:
+    """当前任务是否有可用的 stream_writer。
+
+    Context 会跨任务复用，writer 必须每次从 task_context 读取，不能缓存。
+    """
+    context = task_context.get()
+    return bool(context) and context.get("stream_writer") is not None
+
+
 def apply(ctx, tool_name: str = None):
     """应用 SSE 推送函数到 QuickJS 上下文。
 
@@ -35,19 +43,40 @@ def apply(ctx, tool_name: str = None):
             bool: 是否成功推送
         """
         try:
-            context = task_context.get()
-            if context and context.get("stream_writer") is not None:
-                # 如果 data 是对象，转换为 JSON 字符串
-                if not isinstance(data, str):
-                    data = json.dumps(data, ensure_ascii=False)
-                send_queue(data, event)
-                return True
-            return False
+            if not _has_stream_writer():
+                return False
+            # 对象已在 JS 端序列化，这里只剩数字、布尔等基本类型需要转换
+            if not isinstance(data, str):
+                data = fast_json.dumps(data)
+            send_queue(data, event)
+            return True
         except Exception:
             return False
 
+    def _sse_push_batch(event: str, items_json: str) -> int:
+        """批量推送内容到 SSE 流，整批只检查一次 stream_writer。
+
+        Args:
+            event: 事件名称
+            items_json: JSON 数组字符串，元素为字符串或基本类型
+
+        Returns:
+            int: 成功推送的条数
+        """
+        try:
+            if not _has_stream_writer():
+                return 0
+            count = 0
+            for data in fast_json.loads(items_json):
+                send_queue(data if isinstance(data, str) else fast_json.dumps(data), event)
+                count += 1
+            return count
+        except Exception:
+            return 0
+
     # 使用 add_callable 注册 Python 函数
     ctx.add_callable("_ssePush", _sse_push)
+    ctx.add_callable("_ssePushBatch", _sse_push_batch)
 
     # 在 JS 中定义 ssePush 函数，调用注册的 Python 函数
     ctx.eval("""
@@ -59,6 +88,13 @@ def apply(ctx, tool_name: str = None):
             return _ssePush(event, data);
         }
 
+        // 批量推送：一次回调推送多条数据，返回成功推送的条数
+        function ssePushBatch(event, items) {
+            return _ssePushBatch(event, JSON.stringify(items.map(function(data) {
+                return (typeof data === 'object' && data !== null) ? JSON.stringify(data) : data;
+            })));
+        }
+
         // 便捷方法：推送内容到指定事件
         function pushContent(content) {
             return ssePush("content", content);
@@ -4,10 +4,11 @@
 """
 
 import asyncio
-import json
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.tools.base import BaseTool
+from src.utils import fast_json
 
 
 class ToolRegistry:
@@ -19,19 +20,92 @@ class ToolRegistry:
     def __init__(self):
         """初始化工具注册表。"""
         self._tools: Dict[str, BaseTool] = {}
+        # 延迟加载函数（如从数据库加载动态工具），首次查找工具时执行一次
+        self._pending_loaders: List[Callable[[], None]] = []
+        # 全部加载函数执行完成后置位，查找工具的快速路径只检查该标志
+        self._loaders_done = True
+        self._loading = False
+        # 加载函数内可能再次查找工具（如 remove），同一线程需可重入
+        self._loader_lock = threading.RLock()
+        # MCP 工具在后台线程注册，可能与延迟加载函数并发，注册时的检查与写入需加锁
+        self._register_lock = threading.Lock()
+
+    def add_loader(self, loader: Callable[[], None]) -> None:
+        """登记延迟加载函数，首次查找工具时才执行。
+
+        Args:
+            loader: 无参函数，通常在其中调用 register 注册工具
+        """
+        with self._loader_lock:
+            self._pending_loaders.append(loader)
+            self._loaders_done = False
+
+    def _run_loaders(self) -> None:
+        """执行尚未执行的延迟加载函数。
+
+        加载函数执行完才从待执行列表移除，并发调用方会等待其完成，
+        不会在工具尚未注册时提前返回。
+        """
+        if self._loaders_done:
+            return
+        with self._loader_lock:
+            # 加载函数内再次查找工具时直接返回，避免递归执行自身
+            if self._loading:
+                return
+            self._loading = True
+            try:
+                while self._pending_loaders:
+                    try:
+                        self._pending_loaders[0]()
+                    finally:
+                        # 执行失败的加载函数同样移除，不在每次查找时重试
+                        self._pending_loaders.pop(0)
+                self._loaders_done = True
+            finally:
+                self._loading = False
 
     def register(self, tool: BaseTool) -> None:
         """注册工具。
 
+        重复注册同一实例不产生副作用。
+
         Args:
             tool: 工具实例
 
         Raises:
-            ValueError: 如果工具名称已存在
+            ValueError: 如果工具名称已被其他实例占用
         """
-        if tool.name in self._tools:
-            raise ValueError(f"Tool '{tool.name}' already registered")
-        self._tools[tool.name] = tool
+        with self._register_lock:
+            existing = self._tools.get(tool.name)
+            if existing is tool:
+                return
+            if existing is not None:
+                raise ValueError(f"Tool '{tool.name}' already registered")
+            self._tools[tool.name] = tool
+
+    def register_many(self, tools: Iterable[BaseTool]) -> Tuple[List[BaseTool], List[BaseTool]]:
+        """批量注册工具，只加一次锁。
+
+        与 register 相同，重复注册同一实例不产生副作用；名称已被其他实例占用的工具跳过而不抛出异常。
+
+        Args:
+            tools: 工具实例序列
+
+        Returns:
+            (新注册的工具列表, 因名称冲突跳过的工具列表)
+        """
+        added: List[BaseTool] = []
+        skipped: List[BaseTool] = []
+        with self._register_lock:
+            registered = self._tools
+            for tool in tools:
+                existing = registered.get(tool.name)
+                if existing is None:
+                    registered[tool.name] = tool
+                    added.append(tool)
+                elif existing is not tool:
+                    skipped.append(tool)
+        return added, skipped
 
     def get(self, name: str) -> Optional[BaseTool]:
         """根据名称获取工具。
@@ -42,6 +116,7 @@ class ToolRegistry:
         Returns:
             工具实例，不存在返回 None
         """
+        self._run_loaders()
         return self._tools.get(name)
 
     def list_all(self) -> List[str]:
@@ -50,8 +125,22 @@ class ToolRegistry:
         Returns:
             工具名称列表
         """
+        self._run_loaders()
         return list(self._tools.keys())
 
+    def has_name(self, name: str) -> bool:
+        """判断名称是否已被占用，不触发延迟加载函数。
+
+        供加载或注册过程中（如后台线程注册 MCP 工具时）做名称冲突检查。
+
+        Args:
+            name: 工具名称
+
+        Returns:
+            名称是否已注册
+        """
+        return name in self._tools
+
     def remove(self, name: str) -> bool:
         """从注册表中移除工具。
 
@@ -61,6 +150,7 @@ class ToolRegistry:
         Returns:
             是否成功移除（工具不存在返回 False）
         """
+        self._run_loaders()
         if name in self._tools:
             del self._tools[name]
             return True
@@ -88,7 +178,7 @@ class ToolRegistry:
                 raise ValueError(f"Arguments must be dict, got {type(kwargs)}")
 
             result = tool.invoke(**kwargs)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return fast_json.dumps(result, indent=True)
         except Exception as e:
             raise ValueError(f"Tool execution failed: {str(e)}")
 
@@ -115,12 +205,13 @@ class ToolRegistry:
 
             # 调用工具的异步方法
             result = await tool.ainvoke(**kwargs)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return fast_json.dumps(result, indent=True)
         except Exception as e:
             raise ValueError(f"Tool execution failed: {str(e)}")
 
     def get_all_schemas(self) -> List[Dict[str, Any]]:
         """获取所有工具的 schema。"""
+        self._run_loaders()
         return [tool.get_schema() for tool in self._tools.values()]
 
 
@@ -138,6 +229,18 @@ def register_tool(tool: BaseTool) -> None:
     _registry.register(tool)
 
 
+def register_tools(tools: Iterable[BaseTool]) -> Tuple[List[BaseTool], List[BaseTool]]:
+    """向全局注册表批量注册工具。
+
+    Args:
+        tools: 工具实例序列
+
+    Returns:
+        (新注册的工具列表, 因名称冲突跳过的工具列表)
+    """
+    return _registry.register_many(tools)
+
+
 def remove_tool(name: str) -> bool:
     """从全局注册表移除工具。
 
@@ -1,19 +1,19 @@
 """工具注册初始化。
 
-在模块导入时注册内置工具和 MCP 工具。
+在模块导入时注册内置工具和 MCP 工具；动态工具在首次查找工具时才从数据库加载。
 """
 
 import os
 import asyncio
 import threading
-from src.tools.registry import register_tool
+from src.tools.registry import get_registry, register_tools
 from src.tools.builtins import (
     DateTimeTool,
     CalculatorTool,
     ReadFileTool,
     SkillTool,
     BashTool,
-    QuickJSTool,
+    ThreadedQuickJSTool,
     HttpTool,
     DynamicTool,
     AskUserTool
@@ -30,21 +30,31 @@ SYSTEM_TOOL_CLASSES = [
     ReadFileTool,
     SkillTool,
     BashTool,
-    QuickJSTool,
+    ThreadedQuickJSTool,
     HttpTool,
     AskUserTool
 ]
 
-# 从系统工具类中提取名称集合（供 API 校验使用）
-SYSTEM_TOOL_NAMES = {cls().name for cls in SYSTEM_TOOL_CLASSES}
+# 系统工具实例：只创建一次，注册与名称提取共用
+_SYSTEM_TOOLS = [cls() for cls in SYSTEM_TOOL_CLASSES]
+
+# 从系统工具中提取名称集合（供 API 校验使用）；导入后不再变化，使用不可变集合
+SYSTEM_TOOL_NAMES = frozenset(tool.name for tool in _SYSTEM_TOOLS)
+
+# MCP 工具提示词（注册完成时生成一次）
+_mcp_tools_prompt: str = ""
+
+
+def get_mcp_tools_prompt() -> str:
+    """获取已注册 MCP 工具的提示词文本。"""
+    return _mcp_tools_prompt
+
 
 def _register_builtins() -> None:
     """注册所有内置工具。"""
-    for tool_cls in SYSTEM_TOOL_CLASSES:
-        try:
-            register_tool(tool_cls())
-        except ValueError as e:
-            logger.warning(f"[WARN] Failed to register builtin tool: {e}")
+    _, skipped = register_tools(_SYSTEM_TOOLS)
+    for tool in skipped:
+        logger.warning(f"[WARN] Failed to register builtin tool: Tool '{tool.name}' already registered")
 
 
 def _register_dynamic_tools() -> None:
@@ -62,15 +72,11 @@ def _register_dynamic_tools() -> None:
         if not active_tools:
             return
 
-        # 逐个注册动态工具
-        for tool in active_tools:
-            dynamic_tool = DynamicTool(tool)
-            try:
-                register_tool(dynamic_tool)
-                logger.info(f"Registered dynamic tool: {tool.name}")
-            except ValueError as e:
-                # 工具已存在则跳过（可能内置工具已注册）
-                logger.warning(f"Skip dynamic tool '{tool.name}': {e}")
+        # 批量注册动态工具；名称已存在（可能内置工具已注册）的跳过
+        added, skipped = register_tools(DynamicTool(tool) for tool in active_tools)
+        logger.info(f"Registered {len(added)} dynamic tools (skipped {len(skipped)})")
+        if skipped:
+            logger.warning(f"Skip dynamic tools already registered: {', '.join(tool.name for tool in skipped)}")
 
     except Exception as e:
         # 数据库未初始化或连接失败，静默跳过
@@ -83,14 +89,14 @@ def _register_mcp_tools() -> None:
     使用并发方式注册所有 MCP 服务器的工具。
     """
     try:
-        # 获取全局注册表
-        from src.tools.registry import get_registry
-
         # 获取项目根目录
         project_root = os.environ.get("PROJECT_ROOT", os.getcwd())
 
         # 注册 MCP 服务器工具（并发方式）
-        clients, registered_tools = register_mcp_servers(get_registry(), project_root)
+        global _mcp_tools_prompt
+        clients, registered_tools, _mcp_tools_prompt = register_mcp_servers(
+            get_registry(), project_root
+        )
 
         if registered_tools:
             logger.info(f"[INFO] Registered {len(registered_tools)} MCP tools")
@@ -124,9 +130,9 @@ def _run_mcp_registration():
     logger.info("[INFO] MCP tools registration started in background thread")
 
 
-# 模块导入时自动注册
+# 模块导入时自动注册；动态工具需要查询数据库，推迟到首次查找工具时加载
 _register_builtins()
-_register_dynamic_tools()
+get_registry().add_loader(_register_dynamic_tools)
 
 # 注册 MCP 工具（异步多线程方式）
 _run_mcp_registration()
@@ -8,6 +8,7 @@ from src.utils.frontmatter import parse_frontmatter
 from src.utils.stream_writer_util import (
     send_queue,
     create_queue_task,
+    StreamPipe,
     MyStreamWriter,
     task_context,
 )
@@ -18,6 +19,7 @@ __all__ = [
     'parse_frontmatter',
     'send_queue',
     'create_queue_task',
+    'StreamPipe',
     'MyStreamWriter',
     'task_context',
 ]
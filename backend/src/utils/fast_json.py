@@ -0,0 +1,81 @@
+"""JSON 加速模块。
+
+优先使用 orjson（C 实现），未安装时回退到标准库 json，调用方无需关心差异。
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """解析 JSON 文本。
+
+    Args:
+        data: JSON 字符串或 UTF-8 字节串
+
+    Returns:
+        解析后的 Python 对象
+
+    Raises:
+        ValueError: JSON 格式无效（json.JSONDecodeError 与 orjson.JSONDecodeError 均为其子类）
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """序列化为 JSON 文本。
+
+    非 ASCII 字符原样输出；缩进输出与 json.dumps(..., indent=2) 一致，紧凑输出不含多余空格。
+    orjson 无法处理的对象（如超过 64 位的整数）回退到标准库。
+
+    Args:
+        obj: 待序列化的对象
+        indent: 是否使用 2 空格缩进
+        default: 遇到无法序列化的对象时调用，返回可序列化的替代值（如 str）
+
+    Returns:
+        JSON 字符串
+
+    Raises:
+        TypeError: 对象不可序列化
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串。
+
+    输出与 dumps(obj).encode("utf-8") 一致；orjson 直接产出字节串，省去一次解码与编码。
+
+    Args:
+        obj: 待序列化的对象
+
+    Returns:
+        JSON 字节串
+
+    Raises:
+        TypeError: 对象不可序列化
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -3,22 +3,52 @@
 提供简单的日志封装，基于标准 logging 模块。
 """
 
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from functools import cache
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+# 后台写日志的监听线程；根日志器只挂 QueueHandler，调用方不再等待文件/控制台 I/O
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """停止后台日志线程（写完队列中剩余的记录）并关闭其处理器。"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(
     log_dir: Optional[str] = None,
     retention_days: int = 30,
+    force: bool = False,
 ) -> None:
     """配置日志系统。
 
+    日志记录先写入内存队列，由后台线程写到文件与控制台，
+    业务线程记录日志时不会因文件 I/O 与处理器锁阻塞。
+    重复调用时保留已有配置，不重新打开日志文件；需要重新配置时传入 force=True。
+
     Args:
         log_dir: 日志文件目录，默认使用项目 logs 目录
         retention_days: 日志保留天数（默认 30 天）
+        force: 已配置过时是否仍重新配置
     """
+    global _listener
+    if _listener is not None and not force:
+        return
+
     if log_dir is None:
         project_root = Path(__file__).parent.parent.parent
         log_dir = project_root / "logs"
@@ -39,8 +69,11 @@ def setup_logging(
     logger = logging.getLogger()
     logger.setLevel(log_level)
 
-    # 清除现有处理器
+    # 关闭并清除现有处理器，停止上次配置的后台线程
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
+    _stop_listener()
 
     # 文件处理器（按时间轮转，每天零点切割）
     log_file = log_path / "api.log"
@@ -53,21 +86,28 @@ def setup_logging(
         utc=True,  # 使用 UTC 时间，确保轮转时间一致
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     # 控制台处理器（可选，便于调试）
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+
+    # 文件与控制台处理器由后台线程驱动
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
 
     # 避免日志向上传播到根日志器产生重复输出
     logger.propagate = False
 
 
 
+@cache
 def get_logger(name: str) -> logging.Logger:
     """获取日志器实例。
 
+    日志器在进程内是单例，按名称缓存后不再经过 logging 模块的全局锁。
+
     Args:
         name: 日志器名称，通常使用 __name__
 
@@ -1,26 +1,22 @@
 """JavaScript 脚本包装工具"""
 
-import json
+from functools import lru_cache
 from typing import Optional, Tuple
 
 from sqlalchemy import DateTime
 
 
-def wrap_javascript_code(code: str, params: dict, metadata: dict = None, inherit_from: Optional[str] = None) -> Tuple[dict, str]:
-    """将工具代码包装为可执行的 JavaScript 脚本。
+def build_script_context(params: dict, metadata: dict = None, inherit_from: Optional[str] = None) -> dict:
+    """构建脚本执行时绑定的 context 字典。
 
     Args:
-        code: 工具的原始 JavaScript 代码
         params: 执行参数，会放入 context.args 中
         metadata: 会话元数据，会放入 context.metadata 中
         inherit_from: 继承自的工具名称
 
     Returns:
-        tuple: (context_dict, wrapped_script)
-            - context_dict: 包含 args, metadata, inherit_from 的字典，可作为 JS 绑定参数
-            - wrapped_script: 包装后的 JavaScript 脚本（不含 context 声明）
+        包含 args, metadata, inherit_from 的字典
     """
-    # 构建 context 字典
     context = {"args": params}
 
     # 添加 metadata
@@ -31,6 +27,22 @@ def wrap_javascript_code(code: str, params: dict, metadata: dict = None, inherit
     if inherit_from:
         context["inherit_from"] = inherit_from
 
+    return context
+
+
+@lru_cache(maxsize=512)
+def wrap_script(code: str, inherit_from: Optional[str] = None) -> str:
+    """将工具代码包装为可执行脚本。
+
+    脚本只取决于代码和继承关系，与调用参数无关，结果按 (code, inherit_from) 缓存。
+
+    Args:
+        code: 工具的原始 JavaScript 代码
+        inherit_from: 继承自的工具名称
+
+    Returns:
+        包装后的 JavaScript 脚本（不含 context 声明）
+    """
     # 构建 callSuper 函数（如果存在 inherit_from）
     call_super_func = ""
     if inherit_from:
@@ -43,16 +55,30 @@ function callSuper() {
     # 检查 code 是否包含 function execute
     if "function execute" in code:
         # 包含 execute 函数，包装执行
-        wrapped_script = f"""
+        return f"""
 {call_super_func}
 {code}
 return execute(context)
 """
-    else:
-        # 不包含 function execute，直接使用 code 作为脚本
-        wrapped_script = f"""
+    # 不包含 function execute，直接使用 code 作为脚本
+    return f"""
 {call_super_func}
 {code}
 """
 
-    return context, wrapped_script
+
+def wrap_javascript_code(code: str, params: dict, metadata: dict = None, inherit_from: Optional[str] = None) -> Tuple[dict, str]:
+    """将工具代码包装为可执行的 JavaScript 脚本。
+
+    Args:
+        code: 工具的原始 JavaScript 代码
+        params: 执行参数，会放入 context.args 中
+        metadata: 会话元数据，会放入 context.metadata 中
+        inherit_from: 继承自的工具名称
+
+    Returns:
+        tuple: (context_dict, wrapped_script)
+            - context_dict: 包含 args, metadata, inherit_from 的字典，可作为 JS 绑定参数
+            - wrapped_script: 包装后的 JavaScript 脚本（不含 context 声明）
+    """
+    return build_script_context(params, metadata, inherit_from), wrap_script(code, inherit_from)
@@ -4,6 +4,7 @@
 用于在异步任务中安全地将数据推送到流式响应队列。
 
 主要组件:
+- StreamPipe: 单生产者/单消费者的轻量消息管道
 - MyStreamWriter: 线程安全的流写入器
 - send_queue: 向流写入事件
 - create_queue_task: 创建异步任务并返回队列
@@ -11,10 +12,13 @@
 """
 
 import asyncio
-import json
+import threading
+from collections import deque
 from contextvars import ContextVar
+from functools import lru_cache
 from typing import Any, Callable, Awaitable, TypeVar, Optional
 
+from src.utils import fast_json
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,38 +27,80 @@ logger = get_logger(__name__)
 R = TypeVar("R")
 
 # 任务上下文，使用 ContextVar 跨协程传递
-# 使用 default=dict 而非 default={}，避免可变默认对象导致的上下文污染
-task_context: ContextVar[dict[str, Any]] = ContextVar('task_context', default=dict)
+# 默认值为 None 而非 {}，避免可变默认对象导致的上下文污染；未设置时调用方直接跳过
+task_context: ContextVar[Optional[dict[str, Any]]] = ContextVar('task_context', default=None)
+
+
+@lru_cache(maxsize=64)
+def _event_prefix(event: str) -> bytes:
+    """SSE 帧的事件头字节串（事件名取值有限，按名称缓存）。"""
+    return f"event: {event}\ndata: ".encode("utf-8")
 
 
 def send_queue(msg: Any, event: str) -> None:
     """向流写入事件数据。
 
+    写入的是编码好的 SSE 帧字节串，StreamingResponse 直接发送，无需再编码。
+
     Args:
         msg: 要发送的消息数据
         event: 事件名称，如 "content", "done", "error" 等
     """
+    context = task_context.get()
+    writer = context.get("stream_writer") if context else None
+    if writer is None:
+        return
     try:
-        context = task_context.get()
-        logger.warning(f"context:::: {context}")
-        if not context:
-            return
-        writer = context.get("stream_writer")
-        if writer is None:
-            return
-        # 字符串直接发送，否则 JSON 序列化（ensure_ascii=False 保留中文）
-        data = msg if isinstance(msg, str) else json.dumps(msg, ensure_ascii=False)
-        writer.write(f"event: {event}\ndata: {data}\n\n")
+        # 字符串直接发送，否则 JSON 序列化（保留中文）
+        data = msg.encode("utf-8") if isinstance(msg, str) else fast_json.dumps_bytes(msg)
+        writer.write(b"".join((_event_prefix(event), data, b"\n\n")))
     except Exception as e:
         logger.warning(f"发送队列消息失败: {str(e)}")
 
 
+class StreamPipe:
+    """单消费者的轻量消息管道，替代 asyncio.Queue。
+
+    流式响应只有一个消费者，无需 asyncio.Queue 的等待者队列与容量控制；
+    使用 deque 缓存消息，Event 唤醒消费者。put_nowait 与 get 都只能在事件循环线程中调用
+    （其他线程经 MyStreamWriter 写入）。与 asyncio.Queue 相同，以 None 表示结束。
+    """
+
+    __slots__ = ("_buffer", "_event")
+
+    def __init__(self) -> None:
+        """初始化管道。"""
+        self._buffer: deque = deque()
+        self._event = asyncio.Event()
+
+    def put_nowait(self, item: Any) -> None:
+        """写入一条消息并唤醒消费者。
+
+        Args:
+            item: 消息，None 表示传输结束
+        """
+        self._buffer.append(item)
+        self._event.set()
+
+    async def get(self) -> Any:
+        """读取下一条消息，没有消息时等待。
+
+        Returns:
+            消息，None 表示传输结束
+        """
+        buffer = self._buffer
+        while not buffer:
+            self._event.clear()
+            await self._event.wait()
+        return buffer.popleft()
+
+
 def create_queue_task(
     func: Callable[..., Awaitable[R]],
     *args,
     context_data: Optional[dict[str, Any]] = None,
     **kwargs
-) -> asyncio.Queue:
+) -> StreamPipe:
     """创建一个异步任务并返回队列。
 
     用于在异步任务中执行长时间运行的操作，并通过队列
@@ -67,7 +113,10 @@ def create_queue_task(
         **kwargs: 传递给 func 的关键字参数
 
     Returns:
-        asyncio.Queue 对象，可用于获取任务执行过程中的数据
+        StreamPipe 对象，可用于获取任务执行过程中的数据
+
+    Raises:
+        RuntimeError: 不在运行中的事件循环内调用
 
     Example:
         ```python
@@ -90,13 +139,9 @@ def create_queue_task(
         # 在任务中可以通过 task_context.get()["conversation_id"] 获取
         ```
     """
-    queue = asyncio.Queue()
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.get_event_loop()
-
+    queue = StreamPipe()
+    # 需在运行中的事件循环内调用（随后直接 create_task）
+    loop = asyncio.get_running_loop()
     writer = MyStreamWriter(queue, loop)
 
     async def callback(stream_writer: MyStreamWriter) -> None:
@@ -104,9 +149,13 @@ def create_queue_task(
 
         使用显式 set/reset 确保每个任务有独立的上下文，避免上下文污染。
         """
+        from src.modules.datasource import begin_session_scope, remove_session
+
         # 显式创建新上下文并设置，确保任务间隔离
         context: dict[str, Any] = {}
         token = task_context.set(context)
+        # 任务可能比发起它的请求存活更久，使用独立的数据库 Session，结束时释放
+        session_token = begin_session_scope()
         try:
             context["stream_writer"] = stream_writer
             # 合并额外的上下文数据（如 conversation_id）
@@ -119,6 +168,7 @@ def create_queue_task(
         finally:
             task_context.reset(token)
             stream_writer.close()  # 确保最后关闭流
+            remove_session(session_token)
 
     # 当前事件循环中启动协程
     asyncio.create_task(callback(writer))
@@ -129,21 +179,29 @@ class MyStreamWriter:
     """线程安全的流写入器。
 
     用于在异步任务中安全地写入数据到队列，支持线程安全操作。
+    连续写入先缓存在待发送列表中，每批只向事件循环提交一次回调，
+    减少跨线程唤醒次数；消息顺序保持不变。
 
     Attributes:
-        queue: asyncio 队列实例
+        queue: 消息管道实例
         loop: 事件循环引用
     """
 
-    def __init__(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop) -> None:
+    __slots__ = ("queue", "loop", "_pending", "_scheduled", "_lock")
+
+    def __init__(self, queue: StreamPipe, loop: asyncio.AbstractEventLoop) -> None:
         """初始化流写入器。
 
         Args:
-            queue: asyncio 队列实例
+            queue: 消息管道实例
             loop: 事件循环引用
         """
         self.queue = queue
         self.loop = loop
+        # 待推入队列的消息；_scheduled 表示已提交尚未执行的 _drain 回调
+        self._pending: list = []
+        self._scheduled = False
+        self._lock = threading.Lock()
 
     def write(self, msg: Any) -> None:
         """同步方法：供深层嵌套的逻辑调用。
@@ -153,20 +211,47 @@ class MyStreamWriter:
         Args:
             msg: 要写入队列的消息
         """
-        logger.info(msg)
-        self.loop.call_soon_threadsafe(self.queue.put_nowait, msg)
+        # 每个流式片段都会经过这里，只在调试级别记录
+        logger.debug(msg)
+        self._push(msg)
 
     def close(self) -> None:
         """标记传输结束。
 
         向队列写入 None 信号，表示数据传输完成。
         """
-        self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+        self._push(None)
+
+    def _push(self, item: Any) -> None:
+        """将消息加入待发送列表，尚无待执行的回调时才提交到事件循环。"""
+        with self._lock:
+            self._pending.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self.loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # 事件循环已关闭，复位标记以免后续写入永远不再提交
+            with self._lock:
+                self._scheduled = False
+            raise
+
+    def _drain(self) -> None:
+        """在事件循环线程中将待发送的消息按顺序推入队列。"""
+        with self._lock:
+            items = self._pending
+            self._pending = []
+            self._scheduled = False
+        put = self.queue.put_nowait
+        for item in items:
+            put(item)
 
 
 __all__ = [
     'send_queue',
     'create_queue_task',
+    'StreamPipe',
     'MyStreamWriter',
     'task_context',
 ]
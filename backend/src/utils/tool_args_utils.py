@@ -3,49 +3,118 @@
 提供工具参数默认值填充等功能。
 """
 
-from typing import Any, Dict
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
+# schema 中未声明 default 的占位值（None 本身可能是合法的默认值）
+_NO_DEFAULT = object()
+
+# 默认值填充计划：(对象级默认值 dict 或 None, ((字段名, 默认值或 _NO_DEFAULT, 子计划或 None), ...))
+_DefaultsPlan = Tuple[Optional[dict], Tuple[Tuple[str, Any, Optional["_DefaultsPlan"]], ...]]
+
+# schema 不变时填充计划也不变，按 schema 对象缓存；条目持有 schema 引用，id 不会被复用
+_PLAN_CACHE: Dict[int, Tuple[Dict[str, Any], _DefaultsPlan]] = {}
+_PLAN_CACHE_SIZE = 256
+_PLAN_CACHE_LOCK = threading.Lock()
+
+# 已注册工具的参数 schema 不会变化，按工具实例缓存（工具被移除后自动失效）
+_SCHEMA_CACHE: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
 
-def fill_object_defaults(obj_schema: Dict[str, Any], obj_value: Any) -> Any:
-    """递归填充对象中缺失的默认值。
+
+def get_tool_parameters(tool: Any) -> Dict[str, Any]:
+    """获取工具的参数 schema（按工具实例缓存）。
+
+    同一工具始终返回同一 schema 对象，填充默认值时可直接命中填充计划缓存。
 
     Args:
-        obj_schema: 对象的 JSON Schema（包含 properties 定义）
-        obj_value: 对象的实际值
+        tool: 工具实例（BaseTool）
 
     Returns:
-        填充默认值后的对象
+        工具参数的 JSON Schema
     """
-    if not isinstance(obj_value, dict):
-        return obj_value
+    schema = _SCHEMA_CACHE.get(tool)
+    if schema is None:
+        schema = _SCHEMA_CACHE[tool] = tool.get_parameters()
+    return schema
+
+
+def _compile_plan(obj_schema: Dict[str, Any]) -> _DefaultsPlan:
+    """将对象 schema 预处理为默认值填充计划。"""
+    default = obj_schema.get("default")
+    base = default if isinstance(default, dict) else None
+    entries = []
+    for prop_name, prop_schema in obj_schema.get("properties", {}).items():
+        # 只有声明了 properties 或 default 的字段才需要递归填充
+        child = None
+        if "properties" in prop_schema or "default" in prop_schema:
+            child = _compile_plan(prop_schema)
+        entries.append((prop_name, prop_schema.get("default", _NO_DEFAULT), child))
+    return base, tuple(entries)
+
+
+def _get_plan(obj_schema: Dict[str, Any]) -> _DefaultsPlan:
+    """获取 schema 的填充计划（带缓存）。"""
+    cached = _PLAN_CACHE.get(id(obj_schema))
+    if cached is not None and cached[0] is obj_schema:
+        return cached[1]
+    plan = _compile_plan(obj_schema)
+    with _PLAN_CACHE_LOCK:
+        if len(_PLAN_CACHE) >= _PLAN_CACHE_SIZE:
+            # 淘汰最早加入的条目
+            del _PLAN_CACHE[next(iter(_PLAN_CACHE))]
+        _PLAN_CACHE[id(obj_schema)] = (obj_schema, plan)
+    return plan
+
+
+def _fill_entries(entries: Tuple, result: Dict[str, Any]) -> Dict[str, Any]:
+    """按填充计划就地填充 result 中缺失的默认值。"""
+    for prop_name, default, child in entries:
+        if prop_name not in result:
+            # 字段不存在，使用默认值
+            if default is not _NO_DEFAULT:
+                result[prop_name] = default
+        elif child is not None:
+            # 字段存在且是对象，递归填充
+            value = result[prop_name]
+            if isinstance(value, dict):
+                result[prop_name] = _apply_plan(child, value)
+    return result
+
 
+def _apply_plan(plan: _DefaultsPlan, obj_value: dict) -> dict:
+    """按填充计划填充对象，返回新 dict。"""
+    base, entries = plan
     # 如果 schema 有 default 对象，先用默认值作为基础，再用传入值覆盖
-    if "default" in obj_schema and isinstance(obj_schema["default"], dict):
-        result = dict(obj_schema["default"])
+    if base is not None:
+        result = dict(base)
         result.update(obj_value)
     else:
         result = dict(obj_value)
+    return _fill_entries(entries, result)
 
-    properties = obj_schema.get("properties", {})
-    if not properties:
-        return result
 
-    for prop_name, prop_schema in properties.items():
-        if prop_name not in result:
-            # 字段不存在，使用默认值
-            if "default" in prop_schema:
-                result[prop_name] = prop_schema["default"]
-        elif isinstance(result[prop_name], dict):
-            # 字段存在且是对象，递归填充
-            if "properties" in prop_schema or "default" in prop_schema:
-                result[prop_name] = fill_object_defaults(prop_schema, result[prop_name])
+def fill_object_defaults(obj_schema: Dict[str, Any], obj_value: Any) -> Any:
+    """递归填充对象中缺失的默认值。
 
-    return result
+    Args:
+        obj_schema: 对象的 JSON Schema（包含 properties 定义）
+        obj_value: 对象的实际值
+
+    Returns:
+        填充默认值后的对象
+    """
+    if not isinstance(obj_value, dict):
+        return obj_value
+    return _apply_plan(_get_plan(obj_schema), obj_value)
 
 
 def fill_default_args(tool_schema: Dict[str, Any], tool_args: Dict[str, Any]) -> Dict[str, Any]:
     """使用工具参数的默认值填充未赋值的参数。
 
+    schema 只在首次使用时解析为填充计划，之后按 schema 对象复用；
+    配合 get_tool_parameters 可使同一工具的每次调用都命中缓存。
+
     Args:
         tool_schema: 工具的 JSON Schema 定义
         tool_args: LLM 返回的工具参数
@@ -82,25 +151,12 @@ def fill_default_args(tool_schema: Dict[str, Any], tool_args: Dict[str, Any]) ->
         >>> fill_default_args(schema, args)
         {"options": {"a": 5, "b": 10}}
     """
-
     if not tool_schema:
         return tool_args
 
-    properties = tool_schema.get("properties", {})
-    if not properties:
+    # 顶层参数不使用 schema 级的 default 对象
+    _, entries = _get_plan(tool_schema)
+    if not entries:
         return tool_args
 
-
-    result = dict(tool_args)
-
-    for param_name, param_schema in properties.items():
-        if param_name not in result:
-            # 参数完全不存在，使用默认值
-            if "default" in param_schema:
-                result[param_name] = param_schema["default"]
-        elif isinstance(result[param_name], dict):
-            # 参数存在且是对象，根据 schema 递归填充
-            if "properties" in param_schema or "default" in param_schema:
-                result[param_name] = fill_object_defaults(param_schema, result[param_name])
-
-    return result
+    return _fill_entries(entries, dict(tool_args))
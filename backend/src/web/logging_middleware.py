@@ -16,6 +16,7 @@ from starlette.types import ASGIApp
 
 from src.utils.logger import get_logger
 from src.modules.base import ApiException, ValidException
+from src.modules.datasource import begin_session_scope, remove_session
 
 
 # 业务错误码
@@ -63,6 +64,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # 获取客户端信息
         client_ip = self._get_client_ip(request)
 
+        # 本次请求使用独立的数据库 Session（随 contextvars 传给下游处理器）
+        session_token = begin_session_scope()
+
         # 处理请求
         try:
             response = await call_next(request)
@@ -142,6 +146,10 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             )
             raise
 
+        finally:
+            # 释放本次请求使用的数据库 Session
+            remove_session(session_token)
+
     def _get_client_ip(self, request: Request) -> str:
         """获取客户端真实 IP。"""
         forwarded = request.headers.get("x-forwarded-for")
@@ -0,0 +1,70 @@
+"""数据库 Session 作用域测试。"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.modules.datasource import database
+from src.modules.datasource.database import begin_session_scope, remove_session
+
+
+@pytest.fixture
+def session_local(tmp_path, monkeypatch):
+    """替换全局 Session 注册表为临时库上的请求作用域注册表"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'scope.db'}")
+    registry = scoped_session(sessionmaker(bind=engine), scopefunc=database._current_scope)
+    monkeypatch.setattr(database, "_SessionLocal", registry)
+    yield registry
+    registry.remove()
+    engine.dispose()
+
+
+class TestSessionScope:
+    """请求作用域 Session 测试。"""
+
+    def test_scope_reuses_session(self, session_local):
+        """同一作用域内复用同一 Session，结束后释放。"""
+        token = begin_session_scope()
+        first = session_local()
+        assert session_local() is first
+        remove_session(token)
+
+        # 作用域对应的 Session 已从注册表移除
+        assert session_local.registry.registry == {}
+
+    def test_concurrent_tasks_use_separate_sessions(self, session_local):
+        """同一事件循环线程上的并发任务各自使用独立的 Session。"""
+        async def handle(results):
+            token = begin_session_scope()
+            try:
+                session = session_local()
+                await asyncio.sleep(0)
+                # 让出执行权后仍取到本任务的 Session
+                results.append((session, session_local()))
+            finally:
+                remove_session(token)
+
+        async def run():
+            results = []
+            await asyncio.gather(handle(results), handle(results))
+            return results
+
+        (a, a_again), (b, b_again) = asyncio.run(run())
+        assert a is a_again and b is b_again
+        assert a is not b
+
+    def test_remove_session_keeps_thread_session(self, session_local):
+        """结束请求作用域不影响线程默认作用域的 Session。"""
+        outer = session_local()
+        token = begin_session_scope()
+        assert session_local() is not outer
+        remove_session(token)
+        assert session_local() is outer
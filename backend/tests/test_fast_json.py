@@ -0,0 +1,43 @@
+"""JSON 加速模块测试。"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.utils import fast_json
+
+SAMPLE = {"name": "工具", "items": [1, 2.5, None, True], "nested": {"a": {"b": []}}, 3: "k"}
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """强制走标准库 json 的回退实现"""
+    monkeypatch.setattr(fast_json, "orjson", None)
+
+
+class TestFallbackMatchesOrjson:
+    """未安装 orjson 时输出与 orjson 一致。"""
+
+    def test_dumps_compact(self, fallback):
+        """紧凑输出不含多余空格。"""
+        orjson = pytest.importorskip("orjson")
+        expected = orjson.dumps(SAMPLE, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        assert fast_json.dumps(SAMPLE) == expected
+
+    def test_dumps_indent(self, fallback):
+        """缩进输出与 orjson 的 2 空格缩进一致。"""
+        orjson = pytest.importorskip("orjson")
+        expected = orjson.dumps(
+            SAMPLE, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        ).decode("utf-8")
+        assert fast_json.dumps(SAMPLE, indent=True) == expected
+
+    def test_dumps_bytes(self, fallback):
+        """字节串输出与 orjson 一致（SSE 帧的字节形态不随是否安装 orjson 变化）。"""
+        orjson = pytest.importorskip("orjson")
+        assert fast_json.dumps_bytes(SAMPLE) == orjson.dumps(SAMPLE, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,48 @@
+"""HTTP 工具测试。"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.tools.builtins import http_tool
+from src.tools.builtins.http_tool import HttpTool
+
+
+class TestSharedAsyncClient:
+    """进程级共享异步客户端测试。"""
+
+    def test_reused_within_loop(self):
+        """同一事件循环内复用同一客户端。"""
+        async def run():
+            tool = HttpTool()
+            first = tool._get_async_client()
+            second = tool._get_async_client()
+            await tool.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second
+
+    def test_aclose_rebuilds_client(self):
+        """aclose 关闭当前循环的客户端，下次调用时重建。"""
+        async def run():
+            tool = HttpTool()
+            first = tool._get_async_client()
+            await tool.aclose()
+            loop = asyncio.get_running_loop()
+            assert loop not in http_tool._SHARED_ACLIENTS
+            second = tool._get_async_client()
+            await tool.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first.is_closed
+        assert second is not first
+
+    def test_aclose_without_client(self):
+        """当前循环没有客户端时 aclose 不报错。"""
+        asyncio.run(HttpTool().aclose())
@@ -0,0 +1,177 @@
+"""MCP 批量调用测试。"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.core.client import LLMClient
+from src.tools.mcp.adapter import MCPToolAdapter, invoke_mcp_batch
+from src.tools.mcp.client import MCPClient, MCPClientConfig
+
+SCHEMA = {"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]}
+
+
+def _text_result(text):
+    """构造只含一个文本块的 MCP 调用结果"""
+    return SimpleNamespace(content=[{"type": "text", "text": text}], isError=False)
+
+
+class FakeClient:
+    """记录调用的假 MCP 客户端"""
+
+    def __init__(self, name, fail_batch=False):
+        self.name = name
+        self.fail_batch = fail_batch
+        self.batches = []
+        self.singles = []
+
+    def call_tools_batch_sync(self, calls):
+        self.batches.append(calls)
+        if self.fail_batch:
+            raise ConnectionError("server gone")
+        # q 为 "bad" 的调用返回异常，验证失败原位返回
+        return [
+            ValueError("boom") if args["q"] == "bad" else _text_result(f"{self.name}:{remote}:{args['q']}")
+            for remote, args in calls
+        ]
+
+    def call_tool_sync(self, name, arguments):
+        self.singles.append((name, arguments))
+        return _text_result(f"{self.name}:{name}:{arguments['q']}")
+
+
+def _adapter(client, name):
+    return MCPToolAdapter(client, f"{client.name}_{name}", name, schema=SCHEMA)
+
+
+def _text(result):
+    return json.loads(result["result"])["data"]["text"]
+
+
+def _error(result):
+    return json.loads(result["error"])["error"]
+
+
+class TestInvokeMcpBatch:
+    """invoke_mcp_batch 测试。"""
+
+    def test_results_follow_call_order_across_clients(self):
+        """按客户端分组发送，结果仍按调用顺序返回；单个调用走 call_tool_sync。"""
+        a, b = FakeClient("a"), FakeClient("b")
+        calls = [
+            (_adapter(a, "x"), {"q": "1"}),
+            (_adapter(b, "y"), {"q": "2"}),
+            (_adapter(a, "z"), {"q": "3"}),
+        ]
+
+        results = invoke_mcp_batch(calls)
+
+        assert [_text(r) for r in results] == ["a:x:1", "b:y:2", "a:z:3"]
+        assert a.batches == [[("x", {"q": "1"}), ("z", {"q": "3"})]]
+        assert b.batches == [] and b.singles == [("y", {"q": "2"})]
+
+    def test_mixed_validation_and_call_errors(self):
+        """参数校验失败的调用不发送，调用异常原位转为错误结果。"""
+        a = FakeClient("a")
+        calls = [
+            (_adapter(a, "x"), {}),
+            (_adapter(a, "y"), {"q": "ok"}),
+            (_adapter(a, "z"), {"q": "bad"}),
+            (_adapter(a, "w"), {"q": "fine"}),
+        ]
+
+        results = invoke_mcp_batch(calls)
+
+        assert _error(results[0])["type"] == "param_error"
+        assert _text(results[1]) == "a:y:ok"
+        assert _error(results[2])["message"] == "boom"
+        assert _text(results[3]) == "a:w:fine"
+        assert [remote for remote, _ in a.batches[0]] == ["y", "z", "w"]
+
+    def test_batch_failure_marks_every_call(self):
+        """整批调用失败时组内每个调用都返回网络错误。"""
+        a = FakeClient("a", fail_batch=True)
+        results = invoke_mcp_batch([(_adapter(a, "x"), {"q": "1"}), (_adapter(a, "y"), {"q": "2"})])
+
+        assert [_error(r)["type"] for r in results] == ["network_error", "network_error"]
+
+
+class TestCallToolsBatchReconnect:
+    """MCPClient.call_tools_batch 断线重连测试。"""
+
+    def test_retries_only_closed_calls(self):
+        """会话关闭的调用重连后重发一次，已完成的调用不重复发送。"""
+        class Session:
+            def __init__(self, broken):
+                self.broken = broken
+                self.sent = []
+
+            async def call_tool(self, name, arguments):
+                self.sent.append(name)
+                if self.broken and name == "b":
+                    raise anyio.ClosedResourceError()
+                return name
+
+        sessions = [Session(broken=True), Session(broken=False)]
+        first, second = sessions
+        client = MCPClient(MCPClientConfig("stdio"))
+
+        async def connect():
+            return sessions[0]
+
+        async def close():
+            sessions.pop(0)
+
+        client.connect = connect
+        client.close = close
+
+        results = asyncio.run(client.call_tools_batch([("a", {}), ("b", {}), ("c", {})]))
+
+        assert results == ["a", "b", "c"]
+        assert first.sent == ["a", "b", "c"]
+        assert second.sent == ["b"]
+
+
+class TestRunMcpBatch:
+    """LLMClient._run_mcp_batch 测试。"""
+
+    @pytest.fixture
+    def llm_client(self):
+        # 只测试批量执行逻辑，不需要完整初始化
+        return object.__new__(LLMClient)
+
+    def test_formats_mcp_results_by_index(self, llm_client):
+        """只批量执行 MCP 调用，结果按原调用序号返回。"""
+        a = FakeClient("a")
+        tools = {"a_x": _adapter(a, "x"), "a_y": _adapter(a, "y")}
+        registry = SimpleNamespace(get=tools.get)
+        prepared = [
+            (None, "a_x", {"q": "1"}),
+            (None, "builtin", {}),
+            (None, "a_y", {"q": "2"}),
+        ]
+
+        results = llm_client._run_mcp_batch(registry, prepared)
+
+        assert sorted(results) == [0, 2]
+        assert _text(json.loads(results[0])) == "a:x:1"
+        assert _text(json.loads(results[2])) == "a:y:2"
+        # 缩进输出，与逐个调用时的格式一致
+        assert results[0].startswith("{\n  ")
+
+    def test_skips_single_mcp_call(self, llm_client):
+        """少于两个 MCP 调用时不走批量路径。"""
+        a = FakeClient("a")
+        registry = SimpleNamespace(get={"a_x": _adapter(a, "x")}.get)
+
+        assert llm_client._run_mcp_batch(registry, [(None, "a_x", {"q": "1"})]) == {}
+        assert a.batches == []
@@ -0,0 +1,92 @@
+"""MCP 配置加载测试。"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.tools.mcp import config
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """清空解析缓存并记录实际解析次数"""
+    monkeypatch.setattr(config, "_FILE_CACHE", {})
+    monkeypatch.setattr(config, "_ENV_CACHE", None)
+    monkeypatch.delenv("MCP_SERVERS", raising=False)
+    calls = []
+    json5_loads = config.json5.loads
+    json_loads = config.fast_json.loads
+
+    def counting_json5(text):
+        calls.append("file")
+        return json5_loads(text)
+
+    def counting_json(text):
+        calls.append("env")
+        return json_loads(text)
+
+    monkeypatch.setattr(config.json5, "loads", counting_json5)
+    monkeypatch.setattr(config.fast_json, "loads", counting_json)
+    return calls
+
+
+def _write_config(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFileCache:
+    """配置文件解析缓存测试。"""
+
+    def test_reused_until_mtime_changes(self, tmp_path, parse_calls):
+        """修改时间不变时复用解析结果，变化后重新解析。"""
+        path = tmp_path / "mcp_servers.json"
+        _write_config(path, '{"mcpServers": {"a": {"command": "x"}}}', 1_000_000_000)
+
+        assert config.load_mcp_servers(str(tmp_path)) == {"a": {"command": "x"}}
+        assert config.load_mcp_servers(str(tmp_path)) == {"a": {"command": "x"}}
+        assert parse_calls == ["file"]
+
+        _write_config(path, '{"mcpServers": {"b": {"command": "y"}}}', 2_000_000_000)
+        assert config.load_mcp_servers(str(tmp_path)) == {"b": {"command": "y"}}
+        assert parse_calls == ["file", "file"]
+
+    def test_env_vars_expanded_on_every_load(self, tmp_path, parse_calls, monkeypatch):
+        """缓存的是替换前的数据，环境变量变化后立即生效。"""
+        _write_config(tmp_path / "mcp.json", '{"a": {"command": "${MCP_TEST_CMD}"}}', 1_000_000_000)
+
+        monkeypatch.setenv("MCP_TEST_CMD", "first")
+        assert config.load_mcp_servers(str(tmp_path))["a"]["command"] == "first"
+        monkeypatch.setenv("MCP_TEST_CMD", "second")
+        assert config.load_mcp_servers(str(tmp_path))["a"]["command"] == "second"
+        assert parse_calls == ["file"]
+
+    def test_cached_data_not_mutated(self, tmp_path, parse_calls):
+        """修改返回结果不影响缓存。"""
+        _write_config(tmp_path / "mcp.json", '{"a": {"args": ["1"]}}', 1_000_000_000)
+
+        config.load_mcp_servers(str(tmp_path))["a"]["args"].append("2")
+        assert config.load_mcp_servers(str(tmp_path)) == {"a": {"args": ["1"]}}
+
+
+class TestEnvCache:
+    """MCP_SERVERS 环境变量解析缓存测试。"""
+
+    def test_reused_until_value_changes(self, tmp_path, parse_calls, monkeypatch):
+        """环境变量值不变时复用解析结果，且优先于配置文件。"""
+        _write_config(tmp_path / "mcp.json", '{"file": {}}', 1_000_000_000)
+        monkeypatch.setenv("MCP_SERVERS", '{"mcpServers": {"a": {"url": "http://a"}}}')
+
+        assert config.load_mcp_servers(str(tmp_path)) == {"a": {"url": "http://a"}}
+        assert config.load_mcp_servers(str(tmp_path)) == {"a": {"url": "http://a"}}
+        assert parse_calls == ["env"]
+
+        monkeypatch.setenv("MCP_SERVERS", '{"b": {"url": "http://b"}}')
+        assert config.load_mcp_servers(str(tmp_path)) == {"b": {"url": "http://b"}}
+        assert parse_calls == ["env", "env"]
@@ -0,0 +1,77 @@
+"""MCP 客户端配置构建测试。"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.tools.mcp import loader
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """每个测试前后清空进程级缓存"""
+    loader._build_client_config_cached.cache_clear()
+    loader._ensure_uv_dirs.cache_clear()
+    yield
+    loader._build_client_config_cached.cache_clear()
+    loader._ensure_uv_dirs.cache_clear()
+
+
+class TestClientConfigCache:
+    """_build_client_config 缓存测试。"""
+
+    def test_identical_spec_reuses_config(self, tmp_path):
+        """相同配置复用同一结果，键顺序不影响命中；不同配置分别构建。"""
+        root = str(tmp_path)
+        first = loader._build_client_config(root, {"command": "node", "args": ["a"], "env": {"K": "1", "J": "2"}})
+        second = loader._build_client_config(root, {"env": {"J": "2", "K": "1"}, "args": ["a"], "command": "node"})
+        other = loader._build_client_config(root, {"command": "node", "args": ["b"]})
+
+        assert first is second
+        assert first.args == ["a"] and first.env == {"K": "1", "J": "2"}
+        assert other is not first and other.args == ["b"]
+
+    def test_unhashable_spec_skips_cache(self, tmp_path):
+        """含嵌套对象的配置不进入缓存，但仍正常构建。"""
+        spec = {"command": "node", "args": ["a"], "extra": {"nested": {"x": 1}}}
+        first = loader._build_client_config(str(tmp_path), spec)
+        second = loader._build_client_config(str(tmp_path), spec)
+
+        assert first is not second
+        assert first.command == "node"
+        assert loader._build_client_config_cached.cache_info().currsize == 0
+
+    def test_invalid_spec_not_cached(self, tmp_path):
+        """配置错误时每次都抛出 ValueError。"""
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                loader._build_client_config(str(tmp_path), {"transport": "http"})
+
+
+class TestUvDirs:
+    """uv/npm 缓存目录测试。"""
+
+    def test_dirs_created_once(self, tmp_path, monkeypatch):
+        """目录每个项目根只创建一次，uvx 配置使用其路径且保留用户设置。"""
+        mkdir_calls = []
+        mkdir = Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            mkdir_calls.append(self)
+            return mkdir(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+        root = str(tmp_path)
+        first = loader._build_client_config(root, {"command": "uvx", "args": ["a"]})
+        second = loader._build_client_config(root, {"command": "uvx", "args": ["b"], "env": {"UV_CACHE_DIR": "/custom"}})
+
+        assert len(mkdir_calls) == 3
+        assert first.env["UV_CACHE_DIR"] == str(tmp_path / ".uv_cache")
+        assert first.env["NPM_CONFIG_CACHE"] == str(tmp_path / ".npm_cache")
+        assert second.env["UV_CACHE_DIR"] == "/custom"
+        assert (tmp_path / ".uv_tools").is_dir()
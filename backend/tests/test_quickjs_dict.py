@@ -43,6 +43,18 @@ class TestDictProxy:
         skills = proxy.get("skills")
         assert skills == ["Python", "JS"]
 
+    def test_list_items_wrapped_on_access(self):
+        """测试列表元素按需包装。"""
+        data = {"users": [{"name": "Alice"}, {"name": "Bob"}]}
+        proxy = DictProxy(data)
+
+        users = proxy.get("users")
+        assert len(users) == 2
+        assert isinstance(users[1], DictProxy)
+        assert users[1].get("name") == "Bob"
+        assert users[1] is users[1]
+        assert users.to_list() is data["users"]
+
     def test_keys_and_has(self):
         """测试键操作。"""
         data = {"name": "Alice", "age": 30}
@@ -95,6 +107,31 @@ class TestDictProxyManager:
         assert proxy is not None
         assert proxy.obj_id == "test"
 
+    def test_register_existing_proxy(self):
+        """测试登记已有代理实例。"""
+        manager = DictProxyManager()
+
+        data = {"key": "value"}
+        proxy = DictProxy(data, "child")
+
+        assert manager.register(proxy) == "child"
+        assert manager.register(proxy) == "child"
+        assert manager.get("child") is proxy
+        assert manager.get_by_dict(data) is proxy
+
+    def test_register_many(self):
+        """测试批量登记代理实例。"""
+        manager = DictProxyManager()
+
+        first = DictProxy({"a": 1}, "first")
+        second = DictProxy({"b": 2}, "second")
+        manager.register(first)
+
+        manager.register_many([first, second, DictProxy({"c": 3}, "first")])
+        assert manager.get("first") is first
+        assert manager.get("second") is second
+        assert manager.get_by_dict(second.to_dict()) is second
+
     def test_release(self):
         """测试释放代理。"""
         manager = DictProxyManager()
@@ -105,6 +142,18 @@ class TestDictProxyManager:
         assert manager.release(obj_id) is True
         assert manager.get(obj_id) is None
 
+    def test_unnamed_ids_unique_after_release(self):
+        """测试释放后新建的未命名代理不会复用仍存活的 ID。"""
+        manager = DictProxyManager()
+
+        first = manager.create({"a": 1})
+        second = manager.create({"b": 2})
+        manager.release(first)
+
+        third = manager.create({"c": 3})
+        assert third not in (first, second)
+        assert manager.get(second).to_dict() == {"b": 2}
+
     def test_clear(self):
         """测试清空所有代理。"""
         manager = DictProxyManager()
@@ -261,6 +310,41 @@ class TestQuickJSToolDict:
         result = tool.invoke(code=code, context=context)
         assert result["result"] == "my_parent_tool"
 
+    def test_invoke_with_readonly_context(self):
+        """测试只读 context 直接复制到 JS，修改不写回。"""
+        tool = QuickJSTool()
+
+        context = {"x": 1, "items": [1, 2, 3]}
+
+        result = tool.invoke(code="context.x = 5; return context.x + context.items.length",
+                             context=context, readonly_context=True)
+        assert result["result"] == 8
+        assert context["x"] == 1
+
+    def test_invoke_context_object_assignment(self):
+        """测试通过 context 写入 JS 对象，读回与 Python 端均为普通数据。"""
+        tool = QuickJSTool()
+
+        context = {"nested": {}}
+
+        result = tool.invoke(code="context.nested.newobj = {x: 1}; return context.nested.newobj.x",
+                             context=context)
+        assert result["result"] == 1
+        assert context["nested"]["newobj"] == {"x": 1}
+
+        result = tool.invoke(code="return JSON.stringify(context.nested)", context=context)
+        assert result["result"] == '{"newobj":{"x":1}}'
+
+    def test_invoke_context_array_assignment(self):
+        """测试通过 context 写入 JS 数组。"""
+        tool = QuickJSTool()
+
+        context = {"name": "test"}
+
+        result = tool.invoke(code="context.arr = [1, 2]; return context.arr.length", context=context)
+        assert result["result"] == 2
+        assert context["arr"] == [1, 2]
+
     def test_invoke_context_auto_release(self):
         """测试 context 会在执行结束后自动释放。"""
         tool = QuickJSTool()
@@ -0,0 +1,123 @@
+"""线程池模式 QuickJS 工具测试。"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.tools.quickjs.quickjs_tool_thread import QuickJSTool
+
+
+@pytest.fixture
+def tool():
+    """线程池模式 QuickJS 工具"""
+    return QuickJSTool()
+
+
+class TestProxyMarkers:
+    """_dictGet 容器标记测试。"""
+
+    def test_nested_dict_proxy(self, tool):
+        """嵌套 dict 经 proxy 标记返回代理，写入同步回 Python。"""
+        context = {"user": {"name": "Alice"}}
+        result = tool.invoke(code="context.user.name = 'Bob'; return context.user.name", context=context)
+        assert result["result"] == "Bob"
+        assert context["user"]["name"] == "Bob"
+
+    def test_plain_list(self, tool):
+        """不含 dict 的列表经 list 标记直接解析。"""
+        context = {"items": [1, "a", [2, 3]]}
+        result = tool.invoke(code="return context.items", context=context)
+        assert result["result"] == [1, "a", [2, 3]]
+
+    def test_list_with_dicts(self, tool):
+        """含 dict 的列表经 plist 标记解析，元素为可写回的代理。"""
+        context = {"users": [{"name": "Alice"}, 1]}
+        result = tool.invoke(
+            code="var u = context.users; u[0].name = 'Bob'; return [u.length, u[0].name, u[1]]",
+            context=context,
+        )
+        assert result["result"] == [2, "Bob", 1]
+        assert context["users"][0]["name"] == "Bob"
+
+    def test_string_starting_with_marker_text(self, tool):
+        """以标记文本开头的普通字符串原样返回。"""
+        context = {"text": "proxy:abc", "json": "[1, 2]"}
+        result = tool.invoke(code="return [context.text, context.json]", context=context)
+        assert result["result"] == ["proxy:abc", "[1, 2]"]
+
+    def test_keys_with_separator(self, tool):
+        """键中含分隔符时回退为 JSON 返回键列表。"""
+        context = {"a\x1fb": 1, "c": 2}
+        result = tool.invoke(code="return Object.keys(context)", context=context)
+        assert result["result"] == ["a\x1fb", "c"]
+
+
+class TestSnapshot:
+    """$snapshot 与写回方式测试。"""
+
+    @pytest.mark.parametrize("writeback", [True, False])
+    def test_snapshot(self, tool, writeback):
+        """代理与只读快照都提供 $snapshot，且不出现在键列表中。"""
+        context = {"a": 1, "n": {"b": [1, {"c": 2}]}}
+        result = tool.invoke(
+            code="return [context.$snapshot().a, context.n.$snapshot().b[1].c, "
+                 "Object.keys(context), JSON.stringify(context)]",
+            context=context,
+            writeback=writeback,
+        )
+        assert result["result"] == [1, 2, ["a", "n"], '{"a":1,"n":{"b":[1,{"c":2}]}}']
+
+    def test_writeback_through_alias(self, tool):
+        """经别名或 Object.assign 的写入也会写回。"""
+        context = {"a": 1}
+        tool.invoke(code="var c = context; c.a = 5; Object.assign(context, {b: 2}); return 1", context=context)
+        assert context == {"a": 5, "b": 2}
+
+    def test_readonly_does_not_write_back(self, tool):
+        """writeback=False 时修改不写回。"""
+        context = {"a": 1}
+        result = tool.invoke(code="context.a = 5; return context.a", context=context, writeback=False)
+        assert result["result"] == 5
+        assert context == {"a": 1}
+
+    def test_ainvoke_writeback(self, tool):
+        """异步执行同样写回。"""
+        context = {"a": 1}
+        asyncio.run(tool.ainvoke(code="context.a = 3; return 1", context=context))
+        assert context["a"] == 3
+
+
+class TestContextLifecycle:
+    """Context 回收与全局变量同步测试。"""
+
+    def test_context_recycled_after_max_uses(self):
+        """执行次数达到上限后丢弃 Context，脚本留下的全局变量随之消失。"""
+        class SmallTool(QuickJSTool):
+            MAX_WORKERS = 1
+            CONTEXT_MAX_USES = 2
+
+        tool = SmallTool()
+        tool.invoke(code="globalThis.marker = 1; return 1")
+        assert tool.invoke(code="return typeof marker")["result"] == "number"
+        assert tool.invoke(code="return typeof marker")["result"] == "undefined"
+
+    def test_context_global_released_without_context(self, tool):
+        """不带 context 的执行不再看到上次的 context。"""
+        tool.invoke(code="return context.a", context={"a": 1})
+        assert tool.invoke(code="return typeof context")["result"] == "undefined"
+
+    def test_exposed_dict_visible_on_worker(self, tool):
+        """expose_dict 的变量安装到执行线程的 Context，释放后移除。"""
+        data = {"name": "Alice"}
+        tool.expose_dict(data, "userData")
+        tool.invoke(code="userData.name = 'Bob'; return 1")
+        assert data["name"] == "Bob"
+
+        tool.release_dict("userData")
+        assert tool.invoke(code="return typeof userData")["result"] == "undefined"
@@ -0,0 +1,101 @@
+"""流式写入工具测试。"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.utils.stream_writer_util import MyStreamWriter, StreamPipe
+
+
+class TestStreamPipe:
+    """StreamPipe 测试。"""
+
+    def test_get_in_put_order(self):
+        """按写入顺序读取，None 表示结束。"""
+        async def run():
+            pipe = StreamPipe()
+            for item in ("a", "b", None):
+                pipe.put_nowait(item)
+            return [await pipe.get() for _ in range(3)]
+
+        assert asyncio.run(run()) == ["a", "b", None]
+
+    def test_get_waits_for_put(self):
+        """管道为空时 get 等待，写入后被唤醒。"""
+        async def run():
+            pipe = StreamPipe()
+            getter = asyncio.ensure_future(pipe.get())
+            await asyncio.sleep(0)
+            assert not getter.done()
+            pipe.put_nowait("x")
+            return await asyncio.wait_for(getter, 1)
+
+        assert asyncio.run(run()) == "x"
+
+
+class TestMyStreamWriter:
+    """MyStreamWriter 批量提交测试。"""
+
+    def test_writes_from_thread_batched(self):
+        """其他线程的连续写入只提交一次回调，消息按顺序到达。"""
+        async def run():
+            loop = asyncio.get_running_loop()
+            pipe = StreamPipe()
+            writer = MyStreamWriter(pipe, loop)
+            scheduled = []
+            call_soon = loop.call_soon_threadsafe
+
+            def counting_call_soon(callback, *args):
+                scheduled.append(callback)
+                return call_soon(callback, *args)
+
+            loop.call_soon_threadsafe = counting_call_soon
+
+            def produce():
+                for i in range(100):
+                    writer.write(i)
+                writer.close()
+
+            # 写入线程结束前事件循环不运行回调，整批合并为一次提交
+            thread = threading.Thread(target=produce)
+            thread.start()
+            thread.join()
+            received = []
+            while (item := await pipe.get()) is not None:
+                received.append(item)
+            return received, scheduled
+
+        received, scheduled = asyncio.run(run())
+        assert received == list(range(100))
+        assert len(scheduled) == 1
+
+    def test_write_after_drain_schedules_again(self):
+        """回调执行后再写入会重新提交。"""
+        async def run():
+            pipe = StreamPipe()
+            writer = MyStreamWriter(pipe, asyncio.get_running_loop())
+            writer.write("a")
+            first = await pipe.get()
+            writer.write("b")
+            writer.close()
+            return [first, await pipe.get(), await pipe.get()]
+
+        assert asyncio.run(run()) == ["a", "b", None]
+
+    def test_closed_loop_resets_schedule(self):
+        """事件循环已关闭时抛出 RuntimeError，且不会残留已提交标记。"""
+        loop = asyncio.new_event_loop()
+        writer = MyStreamWriter(StreamPipe(), loop)
+        loop.close()
+        # 第二次写入同样尝试提交，说明标记已复位
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                writer.write("x")
+        assert writer._scheduled is False
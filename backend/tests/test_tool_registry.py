@@ -0,0 +1,110 @@
+"""工具注册表测试。"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.tools.base import BaseTool
+from src.tools.registry import ToolRegistry
+
+
+class StubTool(BaseTool):
+    """无参数的测试工具"""
+
+    def get_parameters(self):
+        return {}
+
+    def invoke(self, **kwargs):
+        return 1
+
+
+class TestDeferredLoaders:
+    """add_loader 延迟加载测试。"""
+
+    def test_loader_runs_once_on_first_lookup(self):
+        """加载函数在首次查找时执行，且只执行一次。"""
+        registry = ToolRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            registry.register(StubTool("lazy", "延迟注册"))
+
+        registry.add_loader(loader)
+        assert calls == []
+
+        assert registry.list_all() == ["lazy"]
+        assert registry.get("lazy") is not None
+        assert calls == [1]
+
+    def test_has_name_does_not_run_loaders(self):
+        """has_name 不触发加载函数。"""
+        registry = ToolRegistry()
+        calls = []
+        registry.add_loader(lambda: calls.append(1))
+
+        assert registry.has_name("lazy") is False
+        assert calls == []
+
+    def test_concurrent_lookups_wait_for_loader(self):
+        """加载函数执行期间的并发查找等待其完成，不会提前返回空结果。"""
+        registry = ToolRegistry()
+        started = threading.Event()
+        release = threading.Event()
+
+        def loader():
+            started.set()
+            release.wait(5)
+            registry.register(StubTool("slow", "慢加载"))
+
+        registry.add_loader(loader)
+        results = []
+        first = threading.Thread(target=lambda: results.append(registry.get("slow")))
+        first.start()
+        started.wait(5)
+        others = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(4)]
+        for t in others:
+            t.start()
+        release.set()
+        for t in [first, *others]:
+            t.join(5)
+
+        assert len(results) == 5
+        assert all(tool is not None for tool in results)
+
+    def test_reentrant_lookup_in_loader(self):
+        """加载函数内再次查找工具不会死锁或递归执行自身。"""
+        registry = ToolRegistry()
+        seen = []
+
+        def loader():
+            seen.append(registry.get("inner"))
+            registry.register(StubTool("inner", "内部"))
+
+        registry.add_loader(loader)
+
+        assert registry.get("inner") is not None
+        assert seen == [None]
+
+    def test_failing_loader_raises_once(self):
+        """执行失败的加载函数只抛出一次，之后不再重试，后续加载函数照常执行。"""
+        registry = ToolRegistry()
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("boom")
+
+        registry.add_loader(broken)
+        registry.add_loader(lambda: registry.register(StubTool("after", "之后")))
+
+        with pytest.raises(ValueError):
+            registry.get("after")
+        assert registry.get("after") is not None
+        assert calls == [1]
@@ -0,0 +1,104 @@
+"""工具服务层测试。"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from src.modules.datasource.database import Base
+from src.modules.tools.dao import ToolDao
+from src.modules.tools.service import ToolService
+from src.tools.registry import get_registry, remove_tool
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """基于临时 SQLite 文件的线程作用域 Session"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tools.db'}")
+    Base.metadata.create_all(engine)
+    factory = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    yield factory
+    factory.remove()
+    engine.dispose()
+
+
+@pytest.fixture
+def service(session_factory):
+    """工具服务"""
+    return ToolService(ToolDao(session_factory))
+
+
+@pytest.fixture
+def tool_names():
+    """测试中注册的工具名，结束后从全局注册表移除"""
+    names = []
+    yield names
+    for name in names:
+        remove_tool(name)
+
+
+class TestToolService:
+    """ToolService 测试。"""
+
+    def test_dynamic_tool_survives_session_removal(self, service, session_factory, tool_names):
+        """导入后 Session 被释放，已注册的动态工具仍可调用。"""
+        tool_names.append("svc_test_add")
+        service.import_tools([{
+            "name": "svc_test_add",
+            "description": "相加",
+            "parameters": [
+                {"name": "a", "description": "a", "type": "number", "required": True},
+                {"name": "b", "description": "b", "type": "number", "default": 2},
+            ],
+            "code": "return context.args.a + context.args.b;",
+        }])
+
+        # 模拟请求结束：实体过期并与 Session 分离
+        session_factory.remove()
+
+        tool = get_registry().get("svc_test_add")
+        assert tool is not None
+        assert tool.get_parameters()["required"] == ["a"]
+        assert tool.invoke(a=1, b=2) == 3
+
+    def test_import_failure_leaves_registry_unchanged(self, service, tool_names):
+        """批量导入中途失败时整批回滚，已处理的工具也不会注册。"""
+        tool_names.extend(["svc_test_first", "svc_test_broken"])
+        with pytest.raises(KeyError):
+            service.import_tools([
+                {"name": "svc_test_first", "description": "第一个", "code": "return 1;"},
+                # 参数缺少 type，构建实体时抛出
+                {"name": "svc_test_broken", "description": "损坏", "parameters": [{"name": "a"}]},
+            ])
+
+        assert get_registry().get("svc_test_first") is None
+        assert service.get_list() == []
+
+
+class TestToolDao:
+    """ToolDao 测试。"""
+
+    def test_get_all_dicts_matches_to_dict(self, session_factory):
+        """按列查询的结果与实体 to_dict 一致。"""
+        from datetime import datetime
+
+        from src.modules.tools.models import Tool, ToolParameter
+
+        dao = ToolDao(session_factory)
+        with dao.transaction():
+            dao.create(Tool(
+                name="dao_b", description="b", is_active=False,
+                parameters=[ToolParameter("x", "x", "string", True, "1", ["1", "2"], True)],
+                inherit_from="dao_a", code="return 1;",
+                created_at=datetime(2024, 1, 2, 3, 4, 5), updated_at=datetime(2024, 2, 3, 4, 5, 6),
+            ))
+            dao.create(Tool(name="dao_a", description="a", parameters=[], code=""))
+
+        assert dao.get_all_dicts() == [t.to_dict() for t in dao.get_all()]
+        assert dao.get_active_dicts() == [t.to_dict() for t in dao.get_active()]